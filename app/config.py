@@ -46,6 +46,7 @@ class Settings(BaseSettings):
     # Local Backend Settings (Stage 4)
     local_model_cache_dir: Optional[str] = None  # Defaults to ~/.cache/huggingface
     local_model: str = "stabilityai/sd-turbo"     # Default local model
+    local_require_gpu: bool = False  # Refuse to enable the local backend without CUDA
 
     # Production Settings (Stage 6)
     enable_rate_limiting: bool = True
@@ -54,6 +55,17 @@ class Settings(BaseSettings):
     enable_health_checks: bool = True
     enable_metrics: bool = True
     production_mode: bool = False  # Enables strict production behaviors
+    max_inflight_requests: int = 4  # Concurrent generations allowed to run
+    max_queued_requests: int = 16  # Requests (running + waiting) before rejecting
+    enable_semantic_cache: bool = False  # Reuse images for near-identical seeded prompts
+    semantic_cache_threshold: float = 0.95  # Minimum prompt cosine similarity for a hit
+    semantic_cache_size: int = 128  # Maximum number of cached images
+    semantic_cache_latent_threshold: float = 0.8  # Minimum similarity for reusing latents
+    redis_url: Optional[str] = None  # Shared image cache across workers (requires redis)
+    redis_cache_ttl: int = 86400  # Seconds cached images are kept in Redis
+    enable_latency_routing: bool = True  # Try the fastest backend first, not always the primary
+    hedge_delay_ms: int = 0  # Send a backup request to the next backend after this delay (0 disables)
+    batch_window_ms: int = 0  # Window for batching concurrent local generations (0 disables)
 
     # Testing
     run_integration_tests: bool = False
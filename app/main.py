@@ -7,20 +7,21 @@ from PIL import Image
 import gradio as gr
 
 from app.config import settings
-from src.core.models import GenerationRequest, GeneratedImage
+from src.core.models import GenerationRequest, GeneratedImage, build_request
 from src.core.backend_factory import BackendFactory
 from src.core.image_generator import ImageGenerator
+from src.core.redis_cache import RedisImageCache
+from src.core.semantic_cache import SemanticCache
 from src.utils.image_utils import create_downloadable_image, ImageFormat
 from src.utils.history_manager import ImageHistoryManager
+from src.utils.admission import AdmissionController, adaptive_num_steps
+from src.utils.recent_results import RecentResultCache
 from src.utils.prompt_enhancer import (
     get_prompt_enhancer,
     PromptStyle,
     PromptQuality,
     PromptLibrary
 )
-from src.utils.face_restoration import get_face_restoration
-from src.utils.video_generator import get_video_generator
-from src.utils.face_animator import get_face_animator
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +43,24 @@ history_manager = ImageHistoryManager(max_history=50)
 # Global prompt enhancer
 prompt_enhancer = get_prompt_enhancer()
 
+# Bounds how many generations run concurrently and how many may wait; the
+# queue depth also drives load-adaptive steps
+admission = AdmissionController(
+    max_inflight=settings.max_inflight_requests,
+    max_queued=settings.max_queued_requests
+)
+
+SERVER_BUSY_MESSAGE = "⏳ Server busy — please retry in a moment"
+
+# Very short-lived cache of recent generate_image results, so accidental repeat
+# submissions (double clicks) share one generation instead of re-generating
+RECENT_RESULT_TTL = 2.0
+RECENT_RESULT_MAX_SIZE = 32
+recent_results: "RecentResultCache[Tuple[Optional[Image.Image], str]]" = RecentResultCache(
+    ttl=RECENT_RESULT_TTL,
+    max_size=RECENT_RESULT_MAX_SIZE
+)
+
 
 def create_generator() -> ImageGenerator:
     """Create and initialize the image generator with backends.
@@ -71,7 +90,8 @@ def create_generator() -> ImageGenerator:
         elif settings.default_backend == "local":
             primary = BackendFactory.create_backend(
                 "local",
-                model=settings.local_model
+                model=settings.local_model,
+                plugin_config={"require_gpu": settings.local_require_gpu}
             )
         else:
             primary = BackendFactory.create_backend(
@@ -104,13 +124,48 @@ def create_generator() -> ImageGenerator:
                     fallbacks.append(
                         BackendFactory.create_backend(
                             "local",
-                            model=settings.local_model
+                            model=settings.local_model,
+                            plugin_config={"require_gpu": settings.local_require_gpu}
                         )
                     )
             except Exception as e:
                 logger.warning(f"Failed to create fallback backend: {e}")
 
-        gen = ImageGenerator(primary, fallbacks)
+        # Start warming the primary backend in the background
+        primary.warm_up()
+
+        semantic_cache = None
+        if settings.enable_semantic_cache:
+            semantic_cache = SemanticCache(
+                threshold=settings.semantic_cache_threshold,
+                max_entries=settings.semantic_cache_size,
+                latent_threshold=settings.semantic_cache_latent_threshold
+            )
+
+        image_cache = None
+        if settings.redis_url:
+            try:
+                image_cache = RedisImageCache.from_url(
+                    settings.redis_url,
+                    ttl_seconds=settings.redis_cache_ttl
+                )
+            except ImportError as e:
+                logger.warning(f"Redis image cache disabled: {e}")
+
+        # Only the local backend runs several prompts in one call
+        batch_window_ms = None
+        if settings.batch_window_ms > 0 and settings.default_backend == "local":
+            batch_window_ms = settings.batch_window_ms
+
+        gen = ImageGenerator(
+            primary,
+            fallbacks,
+            semantic_cache=semantic_cache,
+            batch_window_ms=batch_window_ms,
+            route_by_latency=settings.enable_latency_routing,
+            hedge_delay_ms=settings.hedge_delay_ms or None,
+            image_cache=image_cache
+        )
         logger.info(f"Initialized generator: {gen.get_backend_names()}")
         return gen
 
@@ -174,66 +229,75 @@ def generate_batch_images(
     if generator is None:
         return [], "❌ Error: Generator not initialized"
 
-    images = []
     import random
 
-    for i in range(batch_size):
-        try:
-            progress((i, batch_size), desc=f"Generating image {i+1}/{batch_size}...")
-
-            # Generate random seed for variation
-            seed = random.randint(0, 2**32 - 1)
-
-            # Create generation request
-            request = GenerationRequest(
-                prompt=prompt.strip(),
-                negative_prompt=negative_prompt.strip() if negative_prompt else None,
-                guidance_scale=guidance_scale,
-                num_inference_steps=num_steps,
-                width=width,
-                height=height,
-                seed=seed
-            )
+    # Random seeds give variation; compatible requests share one backend call
+    requests = [
+        GenerationRequest(
+            prompt=prompt.strip(),
+            negative_prompt=negative_prompt.strip() if negative_prompt else None,
+            guidance_scale=guidance_scale,
+            num_inference_steps=num_steps,
+            width=width,
+            height=height,
+            seed=random.randint(0, 2**32 - 1)
+        )
+        for _ in range(batch_size)
+    ]
 
-            # Determine whether to use fallback
-            use_fallback = (backend_choice == "auto")
-
-            # Generate image
-            if backend_choice != "auto":
-                original_primary = generator.primary_backend
-                try:
-                    if backend_choice == "huggingface" and settings.huggingface_token:
-                        temp_backend = BackendFactory.create_backend("huggingface", settings.huggingface_token, model=settings.huggingface_model)
-                        generator.primary_backend = temp_backend
-                        use_fallback = False
-                    elif backend_choice == "replicate" and settings.replicate_token:
-                        temp_backend = BackendFactory.create_backend("replicate", settings.replicate_token, model=settings.replicate_model)
-                        generator.primary_backend = temp_backend
-                        use_fallback = False
-                    elif backend_choice == "local":
-                        temp_backend = BackendFactory.create_backend("local", model=settings.local_model)
-                        generator.primary_backend = temp_backend
-                        use_fallback = False
-
-                    result = generator.generate_image(request, use_fallback=use_fallback)
-                finally:
-                    generator.primary_backend = original_primary
-            else:
-                result = generator.generate_image(request, use_fallback=True)
+    # Determine whether to use fallback
+    use_fallback = (backend_choice == "auto")
+
+    def report_progress(completed: int, total: int) -> None:
+        if completed < total:
+            progress((completed, total), desc=f"Generating image {completed + 1}/{total}...")
+
+    images = []
+    try:
+        progress((0, batch_size), desc=f"Generating image 1/{batch_size}...")
+
+        if backend_choice != "auto":
+            original_primary = generator.primary_backend
+            try:
+                if backend_choice == "huggingface" and settings.huggingface_token:
+                    temp_backend = BackendFactory.create_backend("huggingface", settings.huggingface_token, model=settings.huggingface_model)
+                    generator.primary_backend = temp_backend
+                    use_fallback = False
+                elif backend_choice == "replicate" and settings.replicate_token:
+                    temp_backend = BackendFactory.create_backend("replicate", settings.replicate_token, model=settings.replicate_model)
+                    generator.primary_backend = temp_backend
+                    use_fallback = False
+                elif backend_choice == "local":
+                    temp_backend = BackendFactory.create_backend(
+                        "local",
+                        model=settings.local_model,
+                        plugin_config={"require_gpu": settings.local_require_gpu}
+                    )
+                    generator.primary_backend = temp_backend
+                    use_fallback = False
+
+                results = generator.generate_images(
+                    requests, use_fallback=use_fallback, progress_callback=report_progress
+                )
+            finally:
+                generator.primary_backend = original_primary
+        else:
+            results = generator.generate_images(
+                requests, use_fallback=True, progress_callback=report_progress
+            )
 
+        # Failed requests are None; keep the images that succeeded
+        for result in filter(None, results):
             # Add to history
             history_manager.add(result)
 
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(result.image_data))
-            images.append(image)
+            # Convert to PIL Image (reuses the backend's decoded image if any)
+            images.append(result.to_pil())
 
-            logger.info(f"Generated batch image {i+1}/{batch_size}")
+        logger.info(f"Generated batch of {len(images)}/{batch_size} images")
 
-        except Exception as e:
-            logger.error(f"Failed to generate batch image {i+1}: {e}")
-            # Continue with remaining images
-            continue
+    except Exception as e:
+        logger.error(f"Failed to generate batch images: {e}")
 
     if not images:
         return [], "❌ All batch generations failed"
@@ -327,7 +391,8 @@ def generate_image_to_image(
                 elif backend_choice == "local":
                     temp_backend = BackendFactory.create_backend(
                         "local",
-                        model=settings.local_model
+                        model=settings.local_model,
+                        plugin_config={"require_gpu": settings.local_require_gpu}
                     )
                     generator.primary_backend = temp_backend
                     use_fallback = False
@@ -347,8 +412,8 @@ def generate_image_to_image(
         # Add to history
         history_manager.add(result)
 
-        # Convert bytes to PIL Image
-        output_image = Image.open(io.BytesIO(result.image_data))
+        # Convert bytes to PIL Image (reuses the backend's decoded image if any)
+        output_image = result.to_pil()
 
         # Create info message
         info_message = (
@@ -412,7 +477,8 @@ def enhance_faces(
         image.save(img_byte_arr, format='PNG')
         image_bytes = img_byte_arr.getvalue()
 
-        # Get face restoration instance
+        # Get face restoration instance (imported lazily to keep startup fast)
+        from src.utils.face_restoration import get_face_restoration
         face_restorer = get_face_restoration(settings.replicate_token)
 
         # Enhance faces
@@ -489,7 +555,8 @@ def generate_video(
         image.save(img_byte_arr, format='PNG')
         image_bytes = img_byte_arr.getvalue()
 
-        # Get video generator instance
+        # Get video generator instance (imported lazily to keep startup fast)
+        from src.utils.video_generator import get_video_generator
         video_gen = get_video_generator(settings.replicate_token)
 
         # Generate video
@@ -576,7 +643,8 @@ def animate_portrait(
         image.save(img_byte_arr, format='PNG')
         image_bytes = img_byte_arr.getvalue()
 
-        # Get face animator instance
+        # Get face animator instance (imported lazily to keep startup fast)
+        from src.utils.face_animator import get_face_animator
         face_anim = get_face_animator(settings.replicate_token)
 
         # Animate face
@@ -656,15 +724,71 @@ def generate_image(
     if generator is None:
         return None, "❌ Error: Generator not initialized. Check your API tokens."
 
+    # Normalized inputs, so repeated submissions (e.g. double clicks) match
+    recent_key = (
+        " ".join(prompt.split()),
+        " ".join(negative_prompt.split()) if negative_prompt else "",
+        backend_choice,
+        guidance_scale,
+        num_steps,
+        width,
+        height,
+    )
+    # Identical submissions still running or just finished share one result;
+    # failures are not kept for later submissions
+    return recent_results.get_or_run(
+        recent_key,
+        lambda: _run_generation(
+            prompt, backend_choice, negative_prompt, guidance_scale, num_steps, width, height
+        ),
+        cacheable=lambda result: result[0] is not None
+    )
+
+
+def _run_generation(
+    prompt: str,
+    backend_choice: str,
+    negative_prompt: str,
+    guidance_scale: float,
+    num_steps: int,
+    width: int,
+    height: int
+) -> Tuple[Optional[Image.Image], str]:
+    """Generate an image for generate_image once the inputs are validated.
+
+    Args:
+        prompt: Text description of the desired image
+        backend_choice: Which backend to use ("auto", "huggingface", "replicate")
+        negative_prompt: What to avoid in the image
+        guidance_scale: How closely to follow the prompt (1.0-20.0)
+        num_steps: Number of denoising steps (1-16)
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        Tuple of (PIL Image object or None, status message)
+    """
+    # Fail fast instead of letting the backlog grow without bound
+    queue_depth = admission.enter()
+    if queue_depth is None:
+        return None, SERVER_BUSY_MESSAGE
+
     try:
         logger.info(f"Generating image with prompt: {prompt[:50]}...")
 
+        # Reduce steps under load to keep tail latency bounded
+        steps_used = adaptive_num_steps(num_steps, queue_depth)
+        if steps_used != num_steps:
+            logger.info(
+                f"Queue depth {queue_depth}: reducing steps from {num_steps} to {steps_used}"
+            )
+
         # Create generation request
-        request = GenerationRequest(
+        request = build_request(
             prompt=prompt.strip(),
             negative_prompt=negative_prompt.strip() if negative_prompt else None,
             guidance_scale=guidance_scale,
-            num_inference_steps=num_steps,
+            num_inference_steps=steps_used,
             width=width,
             height=height
         )
@@ -698,7 +822,8 @@ def generate_image(
                 elif backend_choice == "local":
                     temp_backend = BackendFactory.create_backend(
                         "local",
-                        model=settings.local_model
+                        model=settings.local_model,
+                        plugin_config={"require_gpu": settings.local_require_gpu}
                     )
                     generator.primary_backend = temp_backend
                     use_fallback = False
@@ -719,16 +844,20 @@ def generate_image(
         # Add to history
         history_manager.add(result)
 
-        # Convert bytes to PIL Image
-        image = Image.open(io.BytesIO(result.image_data))
+        # Convert bytes to PIL Image (reuses the backend's decoded image if any)
+        image = result.to_pil()
 
         # Create info message
+        steps_info = f"{steps_used}"
+        if steps_used != num_steps:
+            steps_info += f" (reduced from {num_steps} due to server load)"
+
         info_message = (
             f"✅ Image generated successfully!\n"
             f"Backend: {result.backend}\n"
             f"Model: {result.metadata.get('model', 'N/A')}\n"
             f"Size: {width}x{height}\n"
-            f"Steps: {num_steps}\n"
+            f"Steps: {steps_info}\n"
             f"Guidance Scale: {guidance_scale}"
         )
 
@@ -754,6 +883,9 @@ def generate_image(
         logger.exception(error_msg)
         return None, error_msg
 
+    finally:
+        admission.leave()
+
 
 def get_history_gallery():
     """Get history formatted for gallery display.
@@ -1603,7 +1735,10 @@ def create_ui():
                 width_slider,
                 height_slider
             ],
-            outputs=[output_image, output_info]
+            outputs=[output_image, output_info],
+            # Admission is bounded by the AdmissionController, which rejects
+            # requests beyond max_queued_requests instead of queueing them here
+            concurrency_limit=None
         )
 
         # Update download button after generation
@@ -1981,5 +2116,7 @@ if __name__ == "__main__":
     demo.launch(
         server_name="0.0.0.0",
         server_port=7861,
-        share=False
+        share=False,
+        # Enough worker threads for every admitted request plus rejections
+        max_threads=max(40, settings.max_queued_requests + 8)
     )
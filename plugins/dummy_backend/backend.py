@@ -1,17 +1,23 @@
 """Dummy backend that generates simple colored images for testing."""
 
-import io
 import random
 import logging
 from typing import Optional
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 
 from src.core.base_backend import BaseBackend
 from src.core.models import GenerationRequest, GeneratedImage
+from src.utils.image_utils import encode_png
 
 logger = logging.getLogger(__name__)
 
+# Load the label font once at import time instead of parsing the TTF per request
+try:
+    _FONT = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
+except Exception:
+    _FONT = ImageFont.load_default()
+
 
 class DummyBackend(BaseBackend):
     """A dummy backend that generates simple colored rectangles.
@@ -60,7 +66,12 @@ class DummyBackend(BaseBackend):
 
         Returns:
             GeneratedImage with a solid-color image
+
+        Raises:
+            ValueError: If a format other than PNG is requested
         """
+        self._require_png_output(request)
+
         logger.info(f"Generating dummy image for prompt: {request.prompt[:50]}...")
 
         # Generate a color based on the prompt hash
@@ -78,27 +89,18 @@ class DummyBackend(BaseBackend):
 
         # Add some text to the image
         try:
-            from PIL import ImageDraw, ImageFont
             draw = ImageDraw.Draw(image)
 
-            # Try to use a default font
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
-            except Exception:
-                font = ImageFont.load_default()
-
             # Draw prompt on image
             text = f"Dummy: {request.prompt[:30]}"
-            draw.text((10, 10), text, fill=(255, 255, 255))
-            draw.text((10, 40), f"Color: RGB{color}", fill=(255, 255, 255))
+            draw.text((10, 10), text, fill=(255, 255, 255), font=_FONT)
+            draw.text((10, 40), f"Color: RGB{color}", fill=(255, 255, 255), font=_FONT)
 
         except Exception as e:
             logger.warning(f"Could not add text to image: {e}")
 
         # Convert to bytes
-        img_bytes = io.BytesIO()
-        image.save(img_bytes, format='PNG')
-        image_data = img_bytes.getvalue()
+        image_data = encode_png(image)
 
         # Create response
         generated_image = GeneratedImage(
@@ -113,7 +115,8 @@ class DummyBackend(BaseBackend):
                 "height": request.height,
                 "guidance_scale": request.guidance_scale,
                 "num_inference_steps": request.num_inference_steps,
-            }
+            },
+            pil_image=image
         )
 
         logger.info(f"Generated dummy image ({len(image_data)} bytes)")
@@ -1,13 +1,18 @@
 """HuggingFace Inference API backend implementation."""
 
+import io
 import logging
-from datetime import datetime
-from typing import Optional
-from huggingface_hub import InferenceClient, model_info
+import threading
+import time
+from typing import Optional, Tuple
+from huggingface_hub import HfApi, InferenceClient
 from huggingface_hub.utils import HfHubHTTPError
+from PIL import Image
 
 from src.core.base_backend import BaseBackend
+from src.core.batcher import RequestBatcher
 from src.core.models import GenerationRequest, GeneratedImage
+from src.utils.image_utils import save_png_tempfile
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +27,33 @@ class HuggingFaceBackend(BaseBackend):
         api_key: HuggingFace API token
         model: The model ID to use for generation
         client: HuggingFace InferenceClient instance
+        hf_api: HfApi instance reused for health checks
+        batcher: Optional dynamic batcher coalescing concurrent requests
     """
 
     DEFAULT_MODEL = "black-forest-labs/FLUX.1-schnell"
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    # Maximum number of concurrent requests collected per batch when batching
+    BATCH_MAX_SIZE = 8
+
+    # Seconds a health check result is reused before probing the Hub again
+    HEALTH_CHECK_TTL = 30.0
+
+    def __init__(
+        self,
+        api_key: str,
+        model: Optional[str] = None,
+        batch_window_ms: Optional[int] = None
+    ):
         """Initialize the HuggingFace backend.
 
         Args:
             api_key: HuggingFace API token
             model: Optional model ID (defaults to Stable Diffusion 2.1)
+            batch_window_ms: If set, concurrent requests are collected for up
+                to this many milliseconds so identical seeded requests share
+                one API call. Disabled by default, since the API has no batch
+                endpoint and every request would pay the wait.
 
         Raises:
             ValueError: If API key is empty
@@ -43,12 +65,24 @@ class HuggingFaceBackend(BaseBackend):
 
         self.model = model or self.DEFAULT_MODEL
         self.client = InferenceClient(token=api_key)
+        self.hf_api = HfApi(token=api_key)
+        self._health_cache: Optional[Tuple[float, bool]] = None
+        self.batcher: Optional[RequestBatcher] = None
+        if batch_window_ms is not None:
+            self.batcher = RequestBatcher(
+                self._generate_single,
+                max_batch_size=self.BATCH_MAX_SIZE,
+                max_wait_ms=batch_window_ms
+            )
         logger.info(f"Initialized HuggingFace backend with model: {self.model}")
 
     def generate_image(self, request: GenerationRequest) -> GeneratedImage:
         """Generate an image using HuggingFace Inference API.
 
-        Supports both text-to-image and image-to-image generation.
+        Supports both text-to-image and image-to-image generation. When
+        batching is enabled, concurrent calls are routed through the dynamic
+        batcher, so identical seeded requests arriving within the batching
+        window share a single API call.
 
         Args:
             request: The generation request with prompt and parameters
@@ -57,32 +91,48 @@ class HuggingFaceBackend(BaseBackend):
             GeneratedImage with the generated image data
 
         Raises:
+            ValueError: If a format other than PNG is requested
             RuntimeError: If image generation fails
             ConnectionError: If unable to connect to HuggingFace API
         """
-        try:
-            import io
-            from PIL import Image
+        self._require_png_output(request)
+        if self.batcher is None:
+            return self._generate_single(request)
+        return self.batcher.submit(request)
+
+    def _generate_single(self, request: GenerationRequest) -> GeneratedImage:
+        """Generate one image with a direct HuggingFace API call.
 
+        Args:
+            request: The generation request with prompt and parameters
+
+        Returns:
+            GeneratedImage with the generated image data
+
+        Raises:
+            RuntimeError: If image generation fails
+            ConnectionError: If unable to connect to HuggingFace API
+        """
+        try:
             # Determine if this is image-to-image or text-to-image
             is_img2img = request.init_image is not None
 
             if is_img2img:
                 logger.info(f"Generating image-to-image with prompt: {request.prompt[:50]}...")
 
-                # Convert init_image bytes to PIL Image
-                init_image_pil = Image.open(io.BytesIO(request.init_image))
-
-                # Call HuggingFace image-to-image API
-                image = self.client.image_to_image(
-                    image=init_image_pil,
-                    prompt=request.prompt,
-                    negative_prompt=request.negative_prompt,
-                    model=self.model,
-                    guidance_scale=request.guidance_scale,
-                    num_inference_steps=request.num_inference_steps,
-                    strength=request.strength,
-                )
+                # Convert init_image bytes to PIL Image and call HuggingFace
+                # image-to-image API while the source buffer is still open
+                with io.BytesIO(request.init_image) as init_buffer, \
+                        Image.open(init_buffer) as init_image_pil:
+                    image = self.client.image_to_image(
+                        image=init_image_pil,
+                        prompt=request.prompt,
+                        negative_prompt=request.negative_prompt,
+                        model=self.model,
+                        guidance_scale=request.guidance_scale,
+                        num_inference_steps=request.num_inference_steps,
+                        strength=request.strength,
+                    )
             else:
                 logger.info(f"Generating text-to-image with prompt: {request.prompt[:50]}...")
 
@@ -97,10 +147,8 @@ class HuggingFaceBackend(BaseBackend):
                     height=request.height,
                 )
 
-            # Convert PIL Image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            image_data = img_byte_arr.getvalue()
+            # Stream the PNG to a temp file rather than holding the bytes
+            image_path = save_png_tempfile(image)
 
             # Create response
             metadata = {
@@ -120,14 +168,17 @@ class HuggingFaceBackend(BaseBackend):
                 metadata["height"] = request.height
 
             result = GeneratedImage(
-                image_data=image_data,
+                image_data=b"",
                 prompt=request.prompt,
                 backend=self.name,
-                timestamp=datetime.now(),
-                metadata=metadata
+                metadata=metadata,
+                pil_image=image,  # Lets the UI show the image without a PNG decode
+                image_path=image_path
             )
+            # Delete the file once nothing references the result (or a copy)
+            result.delete_image_path_when_unused()
 
-            logger.info(f"Successfully generated image ({len(image_data)} bytes)")
+            logger.info(f"Successfully generated image ({image_path.stat().st_size} bytes)")
             return result
 
         except HfHubHTTPError as e:
@@ -147,21 +198,56 @@ class HuggingFaceBackend(BaseBackend):
             logger.error(f"Unexpected error during image generation: {e}")
             raise RuntimeError(f"Failed to generate image: {e}") from e
 
+    def warm_up(self) -> None:
+        """Send a tiny background generation to wake the inference provider.
+
+        Serverless providers can take tens of seconds to cold-start a model,
+        so this is fired at startup to keep that delay off the first user.
+        """
+        threading.Thread(target=self._warm_up, name="hf-warmup", daemon=True).start()
+
+    def _warm_up(self) -> None:
+        """Run the warm-up request, ignoring its result and any failure."""
+        try:
+            logger.info(f"Warming up HuggingFace model {self.model}...")
+            self.client.text_to_image(
+                prompt="warmup",
+                model=self.model,
+                width=256,
+                height=256,
+                num_inference_steps=1,
+            )
+            logger.info("HuggingFace warm-up completed")
+        except Exception as e:
+            logger.debug(f"HuggingFace warm-up failed (ignored): {e}")
+
     def health_check(self) -> bool:
         """Check if the HuggingFace API is accessible.
 
+        Results are cached for HEALTH_CHECK_TTL seconds so frequent probes
+        (UI refreshes, monitoring) do not each pay a Hub round-trip.
+
         Returns:
             True if the backend is healthy, False otherwise
         """
+        now = time.monotonic()
+        if self._health_cache is not None:
+            checked_at, healthy = self._health_cache
+            if now - checked_at < self.HEALTH_CHECK_TTL:
+                return healthy
+
         try:
             # Try to get model info as a lightweight health check
             logger.debug("Performing health check...")
-            model_info(self.model, token=self.api_key)
+            self.hf_api.model_info(self.model)
             logger.debug("Health check passed")
-            return True
+            healthy = True
         except Exception as e:
             logger.warning(f"Health check failed: {e}")
-            return False
+            healthy = False
+
+        self._health_cache = (now, healthy)
+        return healthy
 
     @property
     def name(self) -> str:
@@ -194,4 +280,5 @@ class HuggingFaceBackend(BaseBackend):
             model_id: HuggingFace model ID
         """
         self.model = model_id
+        self._health_cache = None  # Health depends on the model
         logger.info(f"Switched to model: {model_id}")
@@ -1,7 +1,7 @@
 """Replicate API backend implementation."""
 
 import logging
-from datetime import datetime
+import time
 from typing import Optional
 import replicate
 from replicate.exceptions import ReplicateError
@@ -11,10 +11,17 @@ from PIL import Image
 
 from src.core.base_backend import BaseBackend
 from src.core.models import GenerationRequest, GeneratedImage
+from src.utils.download import download_bytes
+from src.utils.image_utils import ImageFormat, encode_image, image_upload, sniff_mime_type
 
 logger = logging.getLogger(__name__)
 
 
+# (connect, read) timeouts in seconds for image downloads, so a stalled CDN
+# connection cannot hang a worker for the full request timeout
+DOWNLOAD_TIMEOUT = (5, 30)
+
+
 class ReplicateBackend(BaseBackend):
     """Backend implementation using Replicate API.
 
@@ -30,6 +37,9 @@ class ReplicateBackend(BaseBackend):
     # FLUX.1-schnell is fast and high-quality
     DEFAULT_MODEL = "black-forest-labs/flux-schnell"
 
+    # Seconds a successful health check is reused before probing the API again
+    HEALTH_CHECK_TTL = 60.0
+
     def __init__(self, api_key: str, model: Optional[str] = None):
         """Initialize the Replicate backend.
 
@@ -46,9 +56,17 @@ class ReplicateBackend(BaseBackend):
             raise ValueError("Replicate API key is required")
 
         self.model = model or self.DEFAULT_MODEL
+        self._update_model_flags()
         self.client = replicate.Client(api_token=api_key)
+        self._last_healthy_at: Optional[float] = None
         logger.info(f"Initialized Replicate backend with model: {self.model}")
 
+    def _update_model_flags(self) -> None:
+        """Precompute the model family checks used on every generation."""
+        model_lower = self.model.lower()
+        self._is_flux = "flux" in model_lower
+        self._is_sdxl = "sdxl" in model_lower or "stability-ai" in model_lower
+
     def generate_image(self, request: GenerationRequest) -> GeneratedImage:
         """Generate an image using Replicate API.
 
@@ -61,9 +79,12 @@ class ReplicateBackend(BaseBackend):
             GeneratedImage with the generated image data
 
         Raises:
+            ValueError: If a format other than PNG is requested
             RuntimeError: If image generation fails
             ConnectionError: If unable to connect to Replicate API
         """
+        self._require_png_output(request)
+
         try:
             # Determine if this is image-to-image or text-to-image
             is_img2img = request.init_image is not None
@@ -79,13 +100,13 @@ class ReplicateBackend(BaseBackend):
             }
 
             # Disable safety checker for SDXL to avoid false NSFW flags
-            if "sdxl" in self.model.lower() or "stability-ai" in self.model.lower():
+            if self._is_sdxl:
                 input_params["disable_safety_checker"] = True
 
             # Adjust inference steps based on model
             # FLUX models: max 16 steps (optimized for 4)
             # SDXL/SD models: typically 20-50 steps
-            if "flux" in self.model.lower():
+            if self._is_flux:
                 input_params["num_inference_steps"] = min(request.num_inference_steps, 16)
             else:
                 input_params["num_inference_steps"] = request.num_inference_steps
@@ -94,44 +115,42 @@ class ReplicateBackend(BaseBackend):
             if is_img2img:
                 # Resize image if too large to avoid OOM errors
                 # SDXL can handle up to 1024x1024 reliably
-                import base64
-                pil_image = Image.open(io.BytesIO(request.init_image))
+                image_bytes = request.init_image
+                mime_type = sniff_mime_type(image_bytes)
+                pil_image = Image.open(io.BytesIO(image_bytes))
 
                 # Resize if image is too large (max 1024 on longest side)
                 max_size = 1024
                 if max(pil_image.size) > max_size:
                     # Calculate new size maintaining aspect ratio
-                    ratio = max_size / max(pil_image.size)
-                    new_size = tuple(int(dim * ratio) for dim in pil_image.size)
+                    original_size = pil_image.size
+                    ratio = max_size / max(original_size)
+                    new_size = tuple(int(dim * ratio) for dim in original_size)
                     pil_image = pil_image.resize(new_size, Image.Resampling.LANCZOS)
-                    logger.info(f"Resized image from {Image.open(io.BytesIO(request.init_image)).size} to {new_size}")
-
-                # Convert back to bytes
-                img_byte_arr = io.BytesIO()
-                # Detect format from original image
-                if request.init_image.startswith(b'\x89PNG'):
-                    pil_image.save(img_byte_arr, format='PNG')
-                    mime_type = 'image/png'
-                elif request.init_image.startswith(b'\xff\xd8'):
-                    pil_image.save(img_byte_arr, format='JPEG', quality=95)
-                    mime_type = 'image/jpeg'
-                else:
-                    pil_image.save(img_byte_arr, format='PNG')
-                    mime_type = 'image/png'
-
-                resized_image_bytes = img_byte_arr.getvalue()
-                image_base64 = base64.b64encode(resized_image_bytes).decode('utf-8')
-
-                input_params["image"] = f"data:{mime_type};base64,{image_base64}"
+                    logger.info(f"Resized image from {original_size} to {new_size}")
+
+                    # Re-encode in the original format (PNG if unknown)
+                    if mime_type == "image/jpeg":
+                        image_bytes = encode_image(pil_image, ImageFormat.JPEG)
+                    else:
+                        image_bytes = encode_image(pil_image, ImageFormat.PNG)
+                elif mime_type not in ("image/png", "image/jpeg", "image/webp"):
+                    # GIF or unknown upload format, send it as PNG
+                    image_bytes = encode_image(pil_image, ImageFormat.PNG)
+
+                # Small enough images are sent as uploaded, without re-encoding.
+                # The client uploads file inputs through the Files API, which
+                # keeps the prediction JSON small
+                input_params["image"] = image_upload(image_bytes, "init_image")
 
                 # Add width/height to constrain output size for SDXL
-                if "sdxl" in self.model.lower() or "stability-ai" in self.model.lower():
+                if self._is_sdxl:
                     input_params["width"] = pil_image.size[0]
                     input_params["height"] = pil_image.size[1]
 
                 # Different models use different parameter names for strength
                 # SDXL uses "prompt_strength", some models use "strength"
-                if "sdxl" in self.model.lower() or "stability-ai" in self.model.lower():
+                if self._is_sdxl:
                     input_params["prompt_strength"] = request.strength
                 else:
                     input_params["strength"] = request.strength
@@ -160,10 +179,8 @@ class ReplicateBackend(BaseBackend):
             else:
                 image_url = output
 
-            # Download the image
-            response = requests.get(str(image_url), timeout=30)
-            response.raise_for_status()
-            image_data = response.content
+            # Download the image; the memoryview avoids copying the buffer
+            image_data = memoryview(download_bytes(str(image_url), timeout=DOWNLOAD_TIMEOUT))
 
             # Create response
             metadata = {
@@ -186,7 +203,6 @@ class ReplicateBackend(BaseBackend):
                 image_data=image_data,
                 prompt=request.prompt,
                 backend=self.name,
-                timestamp=datetime.now(),
                 metadata=metadata
             )
 
@@ -219,19 +235,28 @@ class ReplicateBackend(BaseBackend):
     def health_check(self) -> bool:
         """Check if the Replicate API is accessible.
 
+        A successful check is reused for HEALTH_CHECK_TTL seconds so frequent
+        liveness probes do not each cost an API round-trip. Failures are not
+        cached, so recovery is noticed on the next probe.
+
         Returns:
             True if the backend is healthy, False otherwise
         """
+        now = time.monotonic()
+        if self._last_healthy_at is not None and now - self._last_healthy_at < self.HEALTH_CHECK_TTL:
+            return True
+
         try:
             logger.debug("Performing health check...")
-            # Try to list models as a lightweight health check
-            # This verifies API key and connectivity
-            models_iter = self.client.models.list()
-            next(iter(models_iter))  # Just get the first model
+            # Fetching the token's own account is the cheapest authenticated
+            # call and verifies both API key and connectivity
+            self.client.accounts.current()
             logger.debug("Health check passed")
+            self._last_healthy_at = now
             return True
         except Exception as e:
             logger.warning(f"Health check failed: {e}")
+            self._last_healthy_at = None
             return False
 
     @property
@@ -264,4 +289,5 @@ class ReplicateBackend(BaseBackend):
             model_id: Replicate model identifier
         """
         self.model = model_id
+        self._update_model_flags()
         logger.info(f"Switched to model: {model_id}")
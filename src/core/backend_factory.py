@@ -1,7 +1,8 @@
 """Factory for creating backend instances using plugin system."""
 
 import logging
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional
 
 from src.core.base_backend import BaseBackend
 from src.core.plugin_manager import PluginManager
@@ -21,21 +22,29 @@ class BackendFactory:
     """
 
     _plugin_manager: Optional[PluginManager] = None
+    _init_lock = threading.Lock()
 
     @classmethod
     def _get_plugin_manager(cls) -> PluginManager:
         """Get or initialize the plugin manager.
 
+        Initialization is guarded by a lock so concurrent first calls register
+        plugins only once. The manager is published only after it is fully set
+        up, so later calls read it without locking.
+
         Returns:
             Initialized PluginManager instance
         """
         if cls._plugin_manager is None:
-            cls._plugin_manager = PluginManager.get_instance()
-            # Register built-in backend plugins
-            register_builtin_plugins(cls._plugin_manager)
-            # Discover external plugins
-            cls._plugin_manager.discover_plugins()
-            logger.info("Backend plugin system initialized")
+            with cls._init_lock:
+                if cls._plugin_manager is None:
+                    plugin_manager = PluginManager.get_instance()
+                    # Register built-in backend plugins
+                    register_builtin_plugins(plugin_manager)
+                    # Discover external plugins
+                    plugin_manager.discover_plugins()
+                    cls._plugin_manager = plugin_manager
+                    logger.info("Backend plugin system initialized")
 
         return cls._plugin_manager
 
@@ -44,7 +53,8 @@ class BackendFactory:
         cls,
         backend_type: str,
         api_key: Optional[str] = None,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        plugin_config: Optional[Dict[str, Any]] = None
     ) -> BaseBackend:
         """Create a backend instance using the plugin system.
 
@@ -52,6 +62,8 @@ class BackendFactory:
             backend_type: The type of backend (e.g., "huggingface", "replicate", "local", or custom plugin name)
             api_key: API key for cloud backend services (not required for backends that don't need it)
             model: Optional model identifier
+            plugin_config: Optional plugin configuration, applied when the
+                plugin is first loaded
 
         Returns:
             An instance of the requested backend
@@ -65,8 +77,9 @@ class BackendFactory:
         plugin_manager = cls._get_plugin_manager()
 
         # Check if backend plugin is available
-        if not backend_type_lower in plugin_manager.list_available_plugins():
-            supported = ", ".join(plugin_manager.list_available_plugins())
+        available = plugin_manager.available_plugins()
+        if backend_type_lower not in available:
+            supported = ", ".join(sorted(available))
             raise ValueError(
                 f"Unsupported backend type: '{backend_type}'. "
                 f"Supported backends: {supported}"
@@ -74,7 +87,9 @@ class BackendFactory:
 
         # Load the plugin if not already loaded
         if not plugin_manager.is_plugin_loaded(backend_type_lower):
-            success = plugin_manager.load_plugin(backend_type_lower, auto_enable=True)
+            success = plugin_manager.load_plugin(
+                backend_type_lower, config=plugin_config, auto_enable=True
+            )
             if not success:
                 raise RuntimeError(f"Failed to load plugin: {backend_type_lower}")
 
@@ -82,6 +97,8 @@ class BackendFactory:
         plugin = plugin_manager.get_plugin(backend_type_lower)
         if not isinstance(plugin, BackendPlugin):
             raise RuntimeError(f"Plugin '{backend_type_lower}' is not a backend plugin")
+        if not plugin.enabled:
+            raise RuntimeError(f"Plugin '{backend_type_lower}' is not enabled")
 
         # Check if API key is required
         if plugin.metadata.requires_api_key and not api_key:
@@ -127,7 +144,7 @@ class BackendFactory:
             True if supported, False otherwise
         """
         plugin_manager = cls._get_plugin_manager()
-        return backend_type.lower() in plugin_manager.list_available_plugins()
+        return backend_type.lower() in plugin_manager.available_plugins()
 
     @classmethod
     def get_plugin_manager(cls) -> PluginManager:
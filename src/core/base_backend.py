@@ -1,7 +1,7 @@
 """Abstract base class for image generation backends."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, List, Optional
 from .models import GenerationRequest, GeneratedImage
 
 
@@ -47,6 +47,25 @@ class BaseBackend(ABC):
         """
         pass
 
+    def generate_images(self, requests: List[GenerationRequest]) -> List[GeneratedImage]:
+        """Generate an image for each of several requests.
+
+        The default implementation calls generate_image once per request.
+        Backends that can run several prompts in one call should override it.
+
+        Args:
+            requests: The generation requests
+
+        Returns:
+            Generated images, in the same order as requests
+
+        Raises:
+            ValueError: If the request parameters are invalid
+            RuntimeError: If the generation fails
+            ConnectionError: If unable to connect to the backend service
+        """
+        return [self.generate_image(request) for request in requests]
+
     @abstractmethod
     def health_check(self) -> bool:
         """Check if the backend is available and working.
@@ -76,6 +95,61 @@ class BaseBackend(ABC):
         """
         pass
 
+    def resume_from_latents(
+        self,
+        request: GenerationRequest,
+        latents: Any,
+        start_step: int
+    ) -> GeneratedImage:
+        """Generate an image by continuing denoising from cached latents.
+
+        Backends that expose their diffusion loop can skip the first
+        start_step denoising steps by starting from latents captured while
+        generating a similar prompt. The default implementation ignores the
+        latents and generates the image from scratch.
+
+        Args:
+            request: The generation request
+            latents: Latents captured after start_step denoising steps
+            start_step: Number of denoising steps already applied to latents
+
+        Returns:
+            GeneratedImage containing the generated image and metadata
+
+        Raises:
+            ValueError: If the request parameters are invalid
+            RuntimeError: If the generation fails
+            ConnectionError: If unable to connect to the backend service
+        """
+        return self.generate_image(request)
+
+    def _require_png_output(self, request: GenerationRequest) -> None:
+        """Reject requests for an output format other than PNG.
+
+        Called by backends that do not encode the image themselves, so a
+        JPEG or WEBP request fails instead of silently returning PNG.
+
+        Args:
+            request: The generation request
+
+        Raises:
+            ValueError: If request.output_format is not PNG
+        """
+        if request.output_format != "PNG":
+            raise ValueError(
+                f"{self.name} backend does not support output_format "
+                f"{request.output_format}; only the Local backend encodes JPEG and WEBP"
+            )
+
+    def warm_up(self) -> None:
+        """Prepare the backend so the first real request is fast.
+
+        Called once at application startup. Implementations should return
+        immediately and do any slow work in the background. The default
+        implementation does nothing.
+        """
+        return None
+
     def __repr__(self) -> str:
         """String representation of the backend."""
         return f"{self.__class__.__name__}(name='{self.name}')"
@@ -0,0 +1,213 @@
+"""Dynamic request batching for image generation backends."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional
+
+from src.core.models import GenerationRequest, GeneratedImage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    """A request waiting in the batch queue together with its result future."""
+    request: GenerationRequest
+    future: Future = field(default_factory=Future)
+
+
+class RequestBatcher:
+    """Collects concurrent generation requests into short-lived batches.
+
+    Callers block in submit() while a background worker gathers requests for
+    up to max_wait_ms (or until max_batch_size is reached). Identical seeded
+    requests within a batch are coalesced into a single backend call, and the
+    remaining distinct requests are dispatched concurrently on a pool of up
+    to max_batch_size threads. Unseeded requests are never coalesced, since
+    each caller expects its own random image. This amortizes per-call
+    overhead for providers that are not batch-native. Batch-native backends
+    can pass batch_handler to receive all distinct requests in one call.
+
+    The worker thread and its pool are started on demand and shut down after
+    IDLE_TIMEOUT_SECONDS without traffic, so short-lived backends do not
+    leave threads behind.
+
+    Example:
+        batcher = RequestBatcher(backend._generate_single, max_batch_size=8)
+        image = batcher.submit(request)
+    """
+
+    IDLE_TIMEOUT_SECONDS = 60.0
+
+    def __init__(
+        self,
+        handler: Callable[[GenerationRequest], GeneratedImage],
+        max_batch_size: int = 8,
+        max_wait_ms: int = 30,
+        batch_handler: Optional[
+            Callable[[List[GenerationRequest]], List[GeneratedImage]]
+        ] = None
+    ):
+        """Initialize the batcher.
+
+        Args:
+            handler: Function that generates a single image for a request
+            max_batch_size: Maximum number of requests collected per batch
+            max_wait_ms: Maximum time to wait for a batch to fill, in milliseconds
+            batch_handler: Optional function that generates images for several
+                requests in one call, used when a batch has more than one
+                distinct request
+
+        Raises:
+            ValueError: If max_batch_size or max_wait_ms is invalid
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative")
+
+        self.handler = handler
+        self.batch_handler = batch_handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, request: GenerationRequest) -> GeneratedImage:
+        """Queue a request and block until its batch has been processed.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Generated image for the request
+
+        Raises:
+            Exception: Any exception raised by the handler for this request
+        """
+        pending = _PendingRequest(request)
+
+        # Enqueue and (re)start the worker atomically so an idle worker that is
+        # shutting down can never strand a freshly queued request
+        with self._lock:
+            self._queue.put(pending)
+            if self._worker is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_batch_size,
+                    thread_name_prefix="request-batcher-call"
+                )
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="request-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+        return pending.future.result()
+
+    def _collect_batch(self, first: _PendingRequest) -> List[_PendingRequest]:
+        """Gather requests that arrive within the batching window.
+
+        Args:
+            first: The request that opened this batch
+
+        Returns:
+            List of pending requests forming the next batch
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: collect and dispatch batches until idle."""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.IDLE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        # Calls still running finish on their own threads
+                        self._executor.shutdown(wait=False)
+                        self._executor = None
+                        return
+                continue
+
+            self._dispatch(self._collect_batch(first))
+            # Drop the reference so the last result is not kept alive while idle
+            del first
+
+    def _dispatch(self, batch: List[_PendingRequest]) -> None:
+        """Coalesce identical requests and run each distinct one concurrently.
+
+        Args:
+            batch: Pending requests collected for this batch
+        """
+        groups: Dict[Hashable, List[_PendingRequest]] = {}
+        for pending in batch:
+            request = pending.request
+            # Unseeded requests each get their own call (and random image)
+            key = request.cache_key if request.seed is not None else id(pending)
+            groups.setdefault(key, []).append(pending)
+
+        logger.debug(
+            "Dispatching batch of %d request(s) as %d call(s)", len(batch), len(groups)
+        )
+
+        if self.batch_handler is not None and len(groups) > 1:
+            self._executor.submit(self._run_batch, list(groups.values()))
+            return
+
+        for members in groups.values():
+            self._executor.submit(self._run_group, members)
+
+    def _run_batch(self, groups: List[List[_PendingRequest]]) -> None:
+        """Run the batch handler once for all distinct requests in a batch.
+
+        Args:
+            groups: Pending requests grouped by identical request
+        """
+        try:
+            results = self.batch_handler([members[0].request for members in groups])
+        except Exception as e:
+            for members in groups:
+                for pending in members:
+                    pending.future.set_exception(e)
+            return
+
+        for members, result in zip(groups, results):
+            for pending in members:
+                pending.future.set_result(result)
+
+    def _run_group(self, members: List[_PendingRequest]) -> None:
+        """Run the handler once and fan the outcome out to every waiter.
+
+        Args:
+            members: Pending requests that share an identical request
+        """
+        try:
+            result = self.handler(members[0].request)
+        except Exception as e:
+            for pending in members:
+                pending.future.set_exception(e)
+            return
+
+        for pending in members:
+            pending.future.set_result(result)
@@ -1,13 +1,15 @@
-"""Built-in backend plugins for HuggingFace, Replicate, and Local backends."""
+"""Built-in backend plugins for HuggingFace, Replicate, and Local backends.
+
+Backend classes are imported inside get_backend_class, so a backend's
+dependencies (e.g. torch for the local backend) load only when it is used.
+"""
 
 import logging
-from typing import Type
+from types import MappingProxyType
+from typing import Mapping, Type
 
 from src.core.plugin import BackendPlugin, PluginMetadata, PluginType
 from src.core.base_backend import BaseBackend
-from src.backends.huggingface import HuggingFaceBackend
-from src.backends.replicate import ReplicateBackend
-from src.backends.local import LocalBackend
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +41,7 @@ class HuggingFacePlugin(BackendPlugin):
 
     def get_backend_class(self) -> Type[BaseBackend]:
         """Get the backend class."""
+        from src.backends.huggingface import HuggingFaceBackend
         return HuggingFaceBackend
 
 
@@ -69,6 +72,7 @@ class ReplicatePlugin(BackendPlugin):
 
     def get_backend_class(self) -> Type[BaseBackend]:
         """Get the backend class."""
+        from src.backends.replicate import ReplicateBackend
         return ReplicateBackend
 
 
@@ -89,7 +93,23 @@ class LocalPlugin(BackendPlugin):
         )
 
     def initialize(self) -> bool:
-        """Initialize the plugin."""
+        """Initialize the plugin.
+
+        With the require_gpu config option set, the plugin refuses to enable
+        on hosts without a CUDA device, so the backend fails at creation
+        instead of running on CPU. Otherwise torch is not imported until the
+        backend is used.
+
+        Returns:
+            False if a GPU is required but none is available, True otherwise
+        """
+        if self.config.get("require_gpu"):
+            from src.backends.local import detect_accelerator
+
+            if detect_accelerator() == "cpu":
+                logger.warning("Local plugin requires a GPU but no CUDA device was found")
+                return False
+
         logger.info("Local plugin initialized")
         return True
 
@@ -99,17 +119,22 @@ class LocalPlugin(BackendPlugin):
 
     def get_backend_class(self) -> Type[BaseBackend]:
         """Get the backend class."""
+        from src.backends.local import LocalBackend
         return LocalBackend
 
 
+# Read-only registry of built-in plugin classes by name
+BUILTIN_PLUGINS: Mapping[str, Type[BackendPlugin]] = MappingProxyType({
+    "huggingface": HuggingFacePlugin,
+    "replicate": ReplicatePlugin,
+    "local": LocalPlugin,
+})
+
+
 def register_builtin_plugins(plugin_manager) -> None:
     """Register all built-in plugins with the plugin manager.
 
     Args:
         plugin_manager: PluginManager instance to register plugins with
     """
-    plugin_manager.register_builtin_plugin("huggingface", HuggingFacePlugin)
-    plugin_manager.register_builtin_plugin("replicate", ReplicatePlugin)
-    plugin_manager.register_builtin_plugin("local", LocalPlugin)
-
-    logger.info("Registered 3 built-in backend plugins")
+    plugin_manager.register_builtin_plugins(BUILTIN_PLUGINS)
@@ -1,52 +1,174 @@
 """Image generation orchestrator with fallback support."""
 
+import itertools
 import logging
-from typing import Optional, List
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import random
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TypeVar
 
 from src.core.base_backend import BaseBackend
+from src.core.batcher import RequestBatcher
 from src.core.models import GenerationRequest, GeneratedImage
+from src.core.redis_cache import RedisImageCache
+from src.core.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@dataclass
+class _BackendStats:
+    """Latency and failure history used to route requests to a backend."""
+    latency_ewma: Optional[float] = None
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+
 
 class ImageGenerator:
     """Orchestrator for image generation with fallback support.
 
     This class manages multiple backends and provides automatic fallback
     if the primary backend fails. It also implements retry logic for
-    transient failures.
+    transient failures, routes requests to the backend with the lowest
+    observed latency, and temporarily skips backends that keep failing.
 
     Attributes:
         primary_backend: The primary backend to use
         fallback_backends: List of fallback backends to try if primary fails
+        semantic_cache: Optional cache serving images for equivalent prompts
+        image_cache: Optional Redis cache shared with other worker processes
     """
 
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 10.0
+
+    # Weight of the newest sample in each backend's latency average
+    LATENCY_EWMA_ALPHA = 0.2
+    # With latency routing, every Nth request goes first to a backend that
+    # is not the fastest, so its latency estimate keeps up with recoveries
+    LATENCY_PROBE_INTERVAL = 20
+    # Consecutive failures before a backend is skipped, and for how long
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_COOLDOWN_SECONDS = 30.0
+
     def __init__(
         self,
         primary_backend: BaseBackend,
-        fallback_backends: Optional[List[BaseBackend]] = None
+        fallback_backends: Optional[List[BaseBackend]] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        batch_window_ms: Optional[int] = None,
+        route_by_latency: bool = True,
+        hedge_delay_ms: Optional[int] = None,
+        image_cache: Optional[RedisImageCache] = None
     ):
         """Initialize the image generator.
 
         Args:
             primary_backend: The primary backend to use for generation
             fallback_backends: Optional list of fallback backends
+            semantic_cache: Optional cache consulted before any backend is called
+            batch_window_ms: If set, concurrent generate_image calls arriving
+                within this window are sent to the primary backend's
+                generate_images as one batch. Only useful for batch-native
+                backends such as the local backend.
+            route_by_latency: Whether to try the backend with the lowest
+                observed latency first instead of always starting with the
+                primary
+            hedge_delay_ms: If set, backends are raced: a backup request is
+                sent to the next backend whenever no attempt has responded
+                within this many milliseconds (or immediately after a
+                failure), trading extra backend calls for lower tail latency
+            image_cache: Optional Redis cache consulted after the semantic
+                cache and shared with other worker processes
         """
         self.primary_backend = primary_backend
         self.fallback_backends = fallback_backends or []
+        self.semantic_cache = semantic_cache
+        self.image_cache = image_cache
+        self.route_by_latency = route_by_latency
+        self.hedge_delay_ms = hedge_delay_ms
+
+        self._backend_stats: Dict[str, _BackendStats] = {}
+        self._stats_lock = threading.Lock()
+        self._route_counter = itertools.count(1)
+
+        self._batched_backend = None
+        self._batcher = None
+        if batch_window_ms is not None:
+            self._batched_backend = primary_backend
+            self._batcher = RequestBatcher(
+                primary_backend.generate_image,
+                max_wait_ms=batch_window_ms,
+                batch_handler=primary_backend.generate_images
+            )
 
         logger.info(
-            f"Initialized ImageGenerator with primary: {primary_backend.name}, "
-            f"fallbacks: {[b.name for b in self.fallback_backends]}"
+            "Initialized ImageGenerator with primary: %s, "
+            "fallbacks: %s",
+            self._primary_name, self._fallback_names
         )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(RuntimeError),
-        reraise=True
-    )
+    @property
+    def primary_backend(self) -> BaseBackend:
+        """The backend tried first."""
+        return self._primary_backend
+
+    @primary_backend.setter
+    def primary_backend(self, backend: BaseBackend) -> None:
+        # Backend names are abstract properties; resolve them once here rather
+        # than on every log line (callers swap in temporary backends per request)
+        self._primary_backend = backend
+        self._primary_name = backend.name
+
+    @property
+    def fallback_backends(self) -> List[BaseBackend]:
+        """Backends tried, in order, when the primary fails."""
+        return self._fallback_backends
+
+    @fallback_backends.setter
+    def fallback_backends(self, backends: List[BaseBackend]) -> None:
+        self._fallback_backends = backends
+        self._fallback_names = [b.name for b in backends]
+
+    def _call_with_retry(self, func: Callable[..., T], *args) -> T:
+        """Call a function, retrying transient failures with jittered backoff.
+
+        RuntimeErrors are retried up to RETRY_ATTEMPTS times in total, waiting
+        2s, 4s, ... (capped at RETRY_MAX_DELAY) plus up to 1s of random jitter
+        so concurrent callers do not retry in lockstep. Other exceptions,
+        such as authentication errors, are raised immediately.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+
+        Returns:
+            The function's return value
+
+        Raises:
+            RuntimeError: If every attempt fails
+        """
+        for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+            try:
+                return func(*args)
+            except RuntimeError as e:
+                if attempt == self.RETRY_ATTEMPTS:
+                    raise
+                delay = min(
+                    self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                ) + random.random()
+                logger.warning(
+                    "Attempt %s/%s failed: %s. "
+                    "Retrying in %.1fs",
+                    attempt, self.RETRY_ATTEMPTS, e, delay
+                )
+                time.sleep(delay)
+
     def _generate_with_retry(
         self,
         backend: BaseBackend,
@@ -65,18 +187,23 @@ class ImageGenerator:
             RuntimeError: If generation fails after retries
             ConnectionError: If authentication fails (no retry)
         """
-        return backend.generate_image(request)
+        if self._batcher is not None and backend is self._batched_backend:
+            return self._call_with_retry(self._batcher.submit, request)
+        return self._call_with_retry(backend.generate_image, request)
 
     def generate_image(
         self,
         request: GenerationRequest,
         use_fallback: bool = True
     ) -> GeneratedImage:
-        """Generate an image with automatic fallback.
+        """Generate an image, serving equivalent cached prompts when possible.
 
-        Attempts to generate an image using the primary backend.
-        If it fails and use_fallback is True, tries each fallback
-        backend in order until one succeeds.
+        If a semantic cache is configured and holds an image for a
+        sufficiently similar prompt with identical settings, that image is
+        returned without calling any backend. A less similar cached prompt
+        whose intermediate latents were kept by the primary backend lets it
+        skip part of the denoising loop. Otherwise the image is generated
+        with automatic fallback. New images are stored in the cache.
 
         Args:
             request: The generation request
@@ -89,70 +216,466 @@ class ImageGenerator:
             RuntimeError: If all backends fail
             ConnectionError: If authentication fails on primary backend
         """
-        # Try primary backend
-        try:
-            logger.info(f"Attempting generation with primary backend: {self.primary_backend.name}")
-            result = self._generate_with_retry(self.primary_backend, request)
-            logger.info(f"Successfully generated image with {self.primary_backend.name}")
-            return result
+        cached = self._lookup_caches(request)
+        if cached is not None:
+            return cached
+
+        result = None
+        if self.semantic_cache is not None:
+            result = self._resume_from_cache(request)
+
+        if result is None:
+            result = self._generate_with_fallback(request, use_fallback)
+
+        self._store_in_caches(request, result)
+        return result
+
+    def _lookup_caches(self, request: GenerationRequest) -> Optional[GeneratedImage]:
+        """Look a request up in the in-process cache, then the shared one.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Cached image, or None if no cache holds one
+        """
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.lookup(request)
+            if cached is not None:
+                return cached
+        if self.image_cache is not None:
+            return self.image_cache.get(request)
+        return None
+
+    def _store_in_caches(self, request: GenerationRequest, result: GeneratedImage) -> None:
+        """Store a freshly generated image in every configured cache.
+
+        Args:
+            request: The request that produced the image
+            result: The generated image
+        """
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(request, result)
+        if self.image_cache is not None:
+            self.image_cache.set(request, result)
+
+    def generate_images(
+        self,
+        requests: List[GenerationRequest],
+        use_fallback: bool = True,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[Optional[GeneratedImage]]:
+        """Generate several images, batching them on batch-native backends.
+
+        Requests served by a cache skip the backend. If the primary backend
+        runs several prompts in one call (it overrides
+        BaseBackend.generate_images, like the local backend), the rest are
+        sent to it as one batch. Otherwise, or if that batch fails, each
+        request is generated on its own with retries and automatic
+        fallback, so a failure only costs that one request and paid
+        backends never regenerate images that already succeeded.
+
+        Args:
+            requests: The generation requests
+            use_fallback: Whether to use fallback backends on failure
+            progress_callback: Optional function called with
+                (completed, total) after each request finishes
 
+        Returns:
+            Generated images, in the same order as requests, with None for
+            requests that failed on every backend
+
+        Raises:
+            ConnectionError: If authentication fails on primary backend
+        """
+        total = len(requests)
+        results: List[Optional[GeneratedImage]] = [None] * total
+        pending = []
+        for index, request in enumerate(requests):
+            results[index] = self._lookup_caches(request)
+            if results[index] is None:
+                pending.append(index)
+
+        completed = total - len(pending)
+        if progress_callback is not None and completed:
+            progress_callback(completed, total)
+
+        if len(pending) > 1 and self._is_batch_native(self.primary_backend):
+            batch = [requests[index] for index in pending]
+            generated = self._generate_batch(batch)
+            if generated is not None:
+                for index, request, result in zip(pending, batch, generated):
+                    results[index] = result
+                    self._store_in_caches(request, result)
+                if progress_callback is not None:
+                    progress_callback(total, total)
+                return results
+
+        for index in pending:
+            request = requests[index]
+            try:
+                results[index] = self._generate_with_fallback(request, use_fallback)
+                self._store_in_caches(request, results[index])
+            except ConnectionError:
+                raise
+            except Exception as e:
+                logger.error("Image %s/%s of batch failed: %s", index + 1, total, e)
+
+            completed += 1
+            if progress_callback is not None:
+                progress_callback(completed, total)
+
+        return results
+
+    @staticmethod
+    def _is_batch_native(backend: BaseBackend) -> bool:
+        """Check whether a backend runs several requests in one call.
+
+        Args:
+            backend: The backend
+
+        Returns:
+            True if the backend overrides BaseBackend.generate_images
+        """
+        return getattr(type(backend), "generate_images", None) is not BaseBackend.generate_images
+
+    def _generate_batch(self, batch: List[GenerationRequest]) -> Optional[List[GeneratedImage]]:
+        """Generate a batch in one primary backend call, without retries.
+
+        Args:
+            batch: The generation requests
+
+        Returns:
+            Generated images in request order, or None if the batch failed
+            and its requests should be generated individually
+
+        Raises:
+            ConnectionError: If authentication fails on primary backend
+        """
+        logger.info(
+            "Generating batch of %s image(s) with %s", len(batch), self._primary_name
+        )
+        try:
+            return self.primary_backend.generate_images(batch)
         except ConnectionError as e:
-            # Authentication errors shouldn't trigger fallback
-            logger.error(f"Authentication error with {self.primary_backend.name}: {e}")
+            logger.error("Authentication error with %s: %s", self._primary_name, e)
             raise
-
         except Exception as e:
             logger.warning(
-                f"Primary backend {self.primary_backend.name} failed: {e}"
+                "Batched generation with %s failed: %s. "
+                "Generating images individually",
+                self._primary_name, e
             )
+            return None
 
-            if not use_fallback or not self.fallback_backends:
-                logger.error("No fallback backends available")
-                raise RuntimeError(
-                    f"Image generation failed with {self.primary_backend.name}: {e}"
-                ) from e
+    def _resume_from_cache(self, request: GenerationRequest) -> Optional[GeneratedImage]:
+        """Generate an image from cached latents of a similar prompt.
 
-            # Try fallback backends
-            for i, fallback in enumerate(self.fallback_backends, 1):
-                try:
+        Args:
+            request: The generation request
+
+        Returns:
+            Generated image, or None if no usable latents are cached or the
+            primary backend failed to resume from them
+        """
+        match = self.semantic_cache.lookup_latents(request)
+        if match is None or match.backend != self._primary_name:
+            return None
+
+        try:
+            return self.primary_backend.resume_from_latents(
+                request, match.latents, match.start_step
+            )
+        except Exception as e:
+            logger.warning("Resuming from cached latents failed, generating from scratch: %s", e)
+            return None
+
+    def _stats_for(self, backend: BaseBackend) -> _BackendStats:
+        """Get the routing statistics for a backend, creating them if needed.
+
+        Args:
+            backend: The backend
+
+        Returns:
+            Statistics shared by all backends with this name
+        """
+        with self._stats_lock:
+            return self._backend_stats.setdefault(backend.name, _BackendStats())
+
+    def _route(self, backends: List[BaseBackend]) -> List[BaseBackend]:
+        """Order backends for an attempt, skipping those with an open circuit.
+
+        With latency routing enabled, backends are tried fastest first by
+        their latency EWMA once the first (primary) backend has been
+        measured; until then the configured order is kept, so a primary
+        that failed before ever succeeding is retried first rather than
+        losing to whichever fallback served those requests. Unmeasured
+        backends go behind measured ones. Every LATENCY_PROBE_INTERVAL
+        requests, one of the slower backends (in turn) is tried first
+        instead, so a backend that was slow or failing is re-measured
+        after it recovers.
+
+        Args:
+            backends: Candidate backends in configured order
+
+        Returns:
+            Backends to try, in order. If every circuit is open, all
+            backends are returned rather than failing without trying.
+        """
+        stats = [self._stats_for(backend) for backend in backends]
+        order = list(range(len(backends)))
+        if self.route_by_latency and stats[0].latency_ewma is not None:
+            order.sort(key=lambda i: (
+                stats[i].latency_ewma is None,
+                stats[i].latency_ewma or 0.0,
+            ))
+            count = next(self._route_counter)
+            if len(order) > 1 and count % self.LATENCY_PROBE_INTERVAL == 0:
+                probe = count // self.LATENCY_PROBE_INTERVAL % (len(order) - 1) + 1
+                order.insert(0, order.pop(probe))
+
+        now = time.monotonic()
+        available = [
+            backends[i] for i in order if not self._is_circuit_open(stats[i], now)
+        ]
+        return available or [backends[i] for i in order]
+
+    def _is_circuit_open(self, stats: _BackendStats, now: float) -> bool:
+        """Check whether a backend is being skipped after repeated failures.
+
+        Once CIRCUIT_COOLDOWN_SECONDS have passed the circuit is half-open:
+        the backend gets one trial request, which closes the circuit on
+        success or reopens it on failure.
+
+        Args:
+            stats: The backend's statistics
+            now: Current time.monotonic() value
+
+        Returns:
+            True if the backend should be skipped
+        """
+        return (
+            stats.opened_at is not None
+            and now - stats.opened_at < self.CIRCUIT_COOLDOWN_SECONDS
+        )
+
+    def _record_success(self, backend: BaseBackend, elapsed: float) -> None:
+        """Update a backend's latency EWMA and close its circuit.
+
+        Args:
+            backend: The backend that succeeded
+            elapsed: Wall-clock duration of the generation, in seconds
+        """
+        stats = self._stats_for(backend)
+        with self._stats_lock:
+            if stats.latency_ewma is None:
+                stats.latency_ewma = elapsed
+            else:
+                stats.latency_ewma += self.LATENCY_EWMA_ALPHA * (elapsed - stats.latency_ewma)
+            stats.consecutive_failures = 0
+            stats.opened_at = None
+
+    def _record_failure(self, backend: BaseBackend) -> None:
+        """Count a failure and open the backend's circuit if it keeps failing.
+
+        Args:
+            backend: The backend that failed
+        """
+        stats = self._stats_for(backend)
+        with self._stats_lock:
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.CIRCUIT_FAILURE_THRESHOLD:
+                if stats.opened_at is None:
+                    logger.warning(
+                        "Opening circuit for %s after "
+                        "%s consecutive failures",
+                        backend.name, stats.consecutive_failures
+                    )
+                stats.opened_at = time.monotonic()
+
+    def _attempt(self, backend: BaseBackend, request: GenerationRequest) -> GeneratedImage:
+        """Generate an image with one backend, recording its latency or failure.
+
+        Args:
+            backend: The backend to use
+            request: The generation request
+
+        Returns:
+            Generated image
+
+        Raises:
+            Exception: Whatever the backend raised after retries
+        """
+        logger.info("Attempting generation with %s", backend.name)
+        start = time.monotonic()
+        try:
+            result = self._generate_with_retry(backend, request)
+        except ConnectionError:
+            raise
+        except Exception:
+            self._record_failure(backend)
+            raise
+
+        self._record_success(backend, time.monotonic() - start)
+        logger.info("Successfully generated image with %s", backend.name)
+        return result
+
+    def _handle_failure(self, backend: BaseBackend, error: Exception) -> None:
+        """Log a failed attempt, re-raising authentication errors on the primary.
+
+        Args:
+            backend: The backend that failed
+            error: The exception it raised
+
+        Raises:
+            ConnectionError: If the primary backend failed to authenticate
+        """
+        if isinstance(error, ConnectionError):
+            # Authentication errors on the primary shouldn't trigger fallback
+            if backend is self.primary_backend:
+                logger.error("Authentication error with %s: %s", backend.name, error)
+                raise error
+            logger.warning("Authentication error with %s: %s", backend.name, error)
+        else:
+            logger.warning("Backend %s failed: %s", backend.name, error)
+
+    def _generate_staggered(
+        self,
+        backends: List[BaseBackend],
+        request: GenerationRequest
+    ) -> Optional[GeneratedImage]:
+        """Race backends in order, starting each one only when needed.
+
+        The first backend is started immediately. The next one is started
+        as soon as an attempt fails, or as a backup request once the running
+        attempts have gone hedge_delay_ms without a result. The first
+        success wins, so a slow or failing backend costs at most one hedge
+        delay instead of its full timeout. Slower calls cannot be
+        interrupted, so they run to completion in the background and their
+        results are discarded.
+
+        Args:
+            backends: Backends in the order they should be tried
+            request: The generation request
+
+        Returns:
+            Generated image, or None if every backend failed
+
+        Raises:
+            ConnectionError: If the primary backend failed to authenticate
+        """
+        executor = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix="hedge")
+        futures: Dict[Future, BaseBackend] = {}
+
+        def start_next() -> None:
+            if len(futures) < len(backends):
+                backend = backends[len(futures)]
+                futures[executor.submit(self._attempt, backend, request)] = backend
+
+        try:
+            start_next()
+            failed = set()
+            pending = set(futures)
+            while pending:
+                # Stop hedging once every backend has been started
+                timeout = self.hedge_delay_ms / 1000 if len(futures) < len(backends) else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
                     logger.info(
-                        f"Attempting fallback {i}/{len(self.fallback_backends)}: "
-                        f"{fallback.name}"
+                        "No response after %sms, hedging with %s",
+                        self.hedge_delay_ms, backends[len(futures)].name
                     )
-                    result = self._generate_with_retry(fallback, request)
-                    logger.info(f"Successfully generated image with fallback: {fallback.name}")
-                    return result
-
-                except Exception as fallback_error:
-                    logger.warning(f"Fallback backend {fallback.name} failed: {fallback_error}")
-                    continue
-
-            # All backends failed
-            error_msg = (
-                f"All backends failed. Primary: {self.primary_backend.name}, "
-                f"Fallbacks: {[b.name for b in self.fallback_backends]}"
-            )
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+                    start_next()
+                for future in done:
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        self._handle_failure(futures[future], e)
+                        failed.add(future)
+                        # Replace the failed attempt right away
+                        start_next()
+                pending = set(futures) - failed
+
+            return None
+        finally:
+            executor.shutdown(wait=False)
+
+    def _generate_with_fallback(
+        self,
+        request: GenerationRequest,
+        use_fallback: bool = True
+    ) -> GeneratedImage:
+        """Generate an image with automatic fallback.
+
+        Tries the primary backend and, if use_fallback is True, each
+        fallback backend until one succeeds. Backends are ordered by
+        observed latency and skipped while their circuit is open (see
+        _route). With hedging enabled, the backends are raced with
+        staggered starts instead of being tried one after another (see
+        _generate_staggered).
+
+        Args:
+            request: The generation request
+            use_fallback: Whether to use fallback backends on failure
+
+        Returns:
+            Generated image
+
+        Raises:
+            RuntimeError: If all backends fail
+            ConnectionError: If authentication fails on primary backend
+        """
+        backends = [self.primary_backend]
+        if use_fallback:
+            backends.extend(self.fallback_backends)
+
+        ordered = self._route(backends)
+        last_error: Optional[Exception] = None
+        if self.hedge_delay_ms is not None and len(ordered) > 1:
+            result = self._generate_staggered(ordered, request)
+            if result is not None:
+                return result
+        else:
+            for backend in ordered:
+                try:
+                    return self._attempt(backend, request)
+                except Exception as e:
+                    self._handle_failure(backend, e)
+                    last_error = e
+
+        if len(backends) == 1:
+            logger.error("No fallback backends available")
+            raise RuntimeError(
+                f"Image generation failed with {self._primary_name}: {last_error}"
+            ) from last_error
+
+        # All backends failed
+        error_msg = (
+            f"All backends failed. Primary: {self._primary_name}, "
+            f"Fallbacks: {self._fallback_names}"
+        )
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
 
     def health_check_all(self) -> dict[str, bool]:
         """Check health of all configured backends.
 
+        Backends are probed concurrently, so the total latency is that of the
+        slowest backend rather than the sum of all of them.
+
         Returns:
             Dictionary mapping backend names to health status
         """
-        results = {}
+        backends = [self.primary_backend, *self.fallback_backends]
+        names = [self._primary_name, *self._fallback_names]
+        logger.debug("Health checking backends: %s", names)
 
-        # Check primary
-        logger.debug(f"Health checking primary backend: {self.primary_backend.name}")
-        results[self.primary_backend.name] = self.primary_backend.health_check()
+        with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+            statuses = list(executor.map(lambda backend: backend.health_check(), backends))
 
-        # Check fallbacks
-        for fallback in self.fallback_backends:
-            logger.debug(f"Health checking fallback backend: {fallback.name}")
-            results[fallback.name] = fallback.health_check()
+        results = dict(zip(names, statuses))
 
-        logger.info(f"Health check results: {results}")
+        logger.info("Health check results: %s", results)
         return results
 
     def get_backend_names(self) -> dict[str, List[str]]:
@@ -162,6 +685,6 @@ class ImageGenerator:
             Dictionary with 'primary' and 'fallbacks' lists
         """
         return {
-            "primary": self.primary_backend.name,
-            "fallbacks": [b.name for b in self.fallback_backends]
+            "primary": self._primary_name,
+            "fallbacks": list(self._fallback_names)
         }
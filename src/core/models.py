@@ -1,8 +1,17 @@
 """Core data models for text-to-image generation."""
 
+import hashlib
+import io
+import os
+import struct
+import time
+import weakref
 from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Literal, Tuple, Union
+from PIL import Image
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, model_validator
 
 
 class GenerationRequest(BaseModel):
@@ -18,8 +27,30 @@ class GenerationRequest(BaseModel):
         height: Output image height in pixels
         init_image: Optional initial image for image-to-image generation (PNG/JPEG bytes)
         strength: Strength of transformation for image-to-image (0.0-1.0, higher = more change)
+        output_format: Encoding of the returned image_data (PNG, JPEG, or WEBP).
+            Only the Local backend encodes JPEG and WEBP; other backends
+            reject them.
+
+    Requests are immutable once validated, which makes them hashable and lets
+    cache_key be computed once per request.
     """
 
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
+            "example": {
+                "prompt": "A serene landscape with mountains and a lake at sunset",
+                "negative_prompt": "blurry, low quality, distorted",
+                "guidance_scale": 7.5,
+                "num_inference_steps": 50,
+                "seed": 42,
+                "width": 512,
+                "height": 512
+            }
+        }
+    )
+
     prompt: str = Field(
         ...,
         min_length=1,
@@ -69,35 +100,84 @@ class GenerationRequest(BaseModel):
         le=1.0,
         description="Transformation strength for image-to-image (0.0=no change, 1.0=full transformation)"
     )
+    output_format: Literal["PNG", "JPEG", "WEBP"] = Field(
+        default="PNG",
+        description=(
+            "Encoding of the returned image (WEBP is roughly half the size of PNG). "
+            "JPEG and WEBP are only supported by the Local backend"
+        )
+    )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "prompt": "A serene landscape with mountains and a lake at sunset",
-                "negative_prompt": "blurry, low quality, distorted",
-                "guidance_scale": 7.5,
-                "num_inference_steps": 50,
-                "seed": 42,
-                "width": 512,
-                "height": 512
-            }
-        }
+    @cached_property
+    def cache_key(self) -> Tuple:
+        """Hashable key identifying requests with identical parameters.
+
+        Returns:
+            Tuple of all request field values, in declaration order
+        """
+        return tuple(getattr(self, name) for name in type(self).model_fields)
+
+
+class _TemporaryFile:
+    """Deletes a file once the last reference to this object is dropped."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        weakref.finalize(self, _remove_file, str(path))
+
+
+def _remove_file(path: str) -> None:
+    """Delete a temporary file, ignoring files that are already gone."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 class GeneratedImage(BaseModel):
     """Response model for generated images.
 
     Attributes:
-        image_data: Raw image bytes
+        image_data: Encoded image as bytes, or a memoryview for backends that
+            avoid copying their encoder buffer. Backends that write the image
+            to image_path pass empty bytes; image_data then reads the file.
         prompt: The prompt used to generate the image
         backend: Name of the backend that generated the image
-        timestamp: When the image was generated
+        timestamp_ns: When the image was generated, in nanoseconds since the
+            epoch. The timestamp property exposes it as a local datetime, and
+            a timestamp datetime is still accepted when constructing.
         metadata: Additional information about the generation
+        pil_image: Optional decoded image kept by backends that already have one,
+            so consumers can skip decoding image_data
+        image_path: Optional PNG file holding the image, used instead of
+            image_data by backends that stream their output to disk
+        latents: Optional intermediate denoising latents keyed by the number
+            of completed steps, kept by local backends for latent reuse
     """
 
-    image_data: bytes = Field(
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        json_schema_extra={
+            "example": {
+                "image_data": b"<binary image data>",
+                "prompt": "A serene landscape with mountains and a lake at sunset",
+                "backend": "huggingface",
+                "timestamp_ns": 1764504000000000000,
+                "metadata": {
+                    "model": "stable-diffusion-v1-5",
+                    "guidance_scale": 7.5,
+                    "steps": 50
+                }
+            }
+        }
+    )
+
+    encoded_data: Union[bytes, memoryview] = Field(
         ...,
-        description="Raw image bytes"
+        alias="image_data",
+        exclude=True,
+        repr=False,
+        description="Encoded image bytes as passed in (empty if only image_path is set)"
     )
     prompt: str = Field(
         ...,
@@ -107,26 +187,198 @@ class GeneratedImage(BaseModel):
         ...,
         description="Name of the backend that generated the image"
     )
-    timestamp: datetime = Field(
-        default_factory=datetime.now,
-        description="When the image was generated"
+    timestamp_ns: int = Field(
+        default_factory=time.time_ns,
+        description="When the image was generated, in nanoseconds since the epoch"
     )
     metadata: Dict[str, Any] = Field(
         default_factory=dict,
         description="Additional information about the generation"
     )
+    pil_image: Optional[Image.Image] = Field(
+        default=None,
+        exclude=True,
+        repr=False,
+        description="Decoded image, if the backend already had one in memory"
+    )
+    image_path: Optional[Path] = Field(
+        default=None,
+        description="PNG file holding the image, if it was written to disk"
+    )
+    latents: Optional[Dict[int, Any]] = Field(
+        default=None,
+        exclude=True,
+        repr=False,
+        description="Intermediate latents keyed by completed denoising steps"
+    )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "image_data": b"<binary image data>",
-                "prompt": "A serene landscape with mountains and a lake at sunset",
-                "backend": "huggingface",
-                "timestamp": "2025-11-30T12:00:00",
-                "metadata": {
-                    "model": "stable-diffusion-v1-5",
-                    "guidance_scale": 7.5,
-                    "steps": 50
-                }
-            }
-        }
+    # Shared with model_copy() copies, so a temporary image_path is removed
+    # only once the last copy is gone (see delete_image_path_when_unused)
+    _image_path_owner: Optional["_TemporaryFile"] = PrivateAttr(default=None)
+    # image_path contents, read once on first access
+    _image_path_data: Optional[bytes] = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_timestamp(cls, data: Any) -> Any:
+        """Accept a timestamp datetime (or ISO string) in place of timestamp_ns."""
+        if isinstance(data, dict) and "timestamp" in data:
+            data = dict(data)
+            value = data.pop("timestamp")
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            # Split off microseconds so the round trip through timestamp is exact
+            seconds = int(value.replace(microsecond=0).timestamp())
+            data["timestamp_ns"] = seconds * 1_000_000_000 + value.microsecond * 1_000
+        return data
+
+    @computed_field(description="Encoded image bytes")
+    @property
+    def image_data(self) -> Union[bytes, memoryview]:
+        """Encoded image bytes, read from image_path if they are not in memory.
+
+        The file is read on first access only; later accesses (get_bytes,
+        model_dump, caches) reuse the bytes.
+        """
+        if not self.encoded_data and self.image_path is not None:
+            if self._image_path_data is None:
+                self._image_path_data = self.image_path.read_bytes()
+            return self._image_path_data
+        return self.encoded_data
+
+    def delete_image_path_when_unused(self) -> None:
+        """Delete image_path once this image and all copies of it are gone.
+
+        Used by backends that write their output to a temporary file.
+        """
+        if self.image_path is not None:
+            self._image_path_owner = _TemporaryFile(self.image_path)
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the image was generated, as a naive local datetime."""
+        seconds, nanos = divmod(self.timestamp_ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1_000)
+
+    def get_bytes(self) -> bytes:
+        """Get the encoded image bytes.
+
+        Consumers that hand the image to code outside this package should
+        use this rather than image_data, which may be a memoryview.
+
+        Returns:
+            image_data as bytes
+        """
+        data = self.image_data
+        if isinstance(data, memoryview):
+            return data.tobytes()
+        return data
+
+    def to_pil(self) -> Image.Image:
+        """Get the image as a PIL Image.
+
+        Returns the in-memory image when the backend provided one, and only
+        decodes image_data (or image_path) otherwise.
+
+        Returns:
+            PIL Image of the generated image
+        """
+        if self.pil_image is not None:
+            return self.pil_image
+        return Image.open(io.BytesIO(self.image_data))
+
+
+@lru_cache(maxsize=1024)
+def build_request(
+    prompt: str,
+    negative_prompt: Optional[str] = None,
+    guidance_scale: float = 7.5,
+    num_inference_steps: int = 4,
+    seed: Optional[int] = None,
+    width: int = 512,
+    height: int = 512,
+    output_format: str = "PNG"
+) -> GenerationRequest:
+    """Build a text-to-image request, reusing the validated instance for repeats.
+
+    Requests are immutable, so UIs that resubmit the same parameters can
+    share one validated GenerationRequest instead of validating again.
+    Prefer this over the GenerationRequest constructor for text-to-image.
+
+    Args:
+        prompt: The text prompt describing the desired image
+        negative_prompt: Optional text describing what to avoid in the image
+        guidance_scale: How closely to follow the prompt
+        num_inference_steps: Number of denoising steps
+        seed: Random seed for reproducibility (None = random)
+        width: Output image width in pixels
+        height: Output image height in pixels
+        output_format: Encoding of the returned image_data
+
+    Returns:
+        Validated generation request
+
+    Raises:
+        ValidationError: If any parameter is invalid
+    """
+    return GenerationRequest(
+        prompt=prompt,
+        negative_prompt=negative_prompt,
+        guidance_scale=guidance_scale,
+        num_inference_steps=num_inference_steps,
+        seed=seed,
+        width=width,
+        height=height,
+        output_format=output_format
+    )
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """Normalize a prompt for exact-match comparison.
+
+    Args:
+        text: Prompt text, or None
+
+    Returns:
+        Case-folded text with runs of whitespace collapsed to single spaces
+    """
+    return " ".join(text.casefold().split()) if text else ""
+
+
+def prompt_key(request: GenerationRequest) -> bytes:
+    """Hash a request into a compact exact-match cache key.
+
+    Prompts are normalized first (see normalize_prompt), so requests that
+    differ only in case or whitespace share a key. All other parameters are
+    hashed exactly.
+
+    Args:
+        request: The generation request
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(normalize_prompt(request.prompt).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_prompt(request.negative_prompt).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(request.output_format.encode("ascii"))
+    digest.update(struct.pack(
+        "<ddqqq",
+        request.guidance_scale,
+        request.strength,
+        request.num_inference_steps,
+        request.width,
+        request.height,
+    ))
+    # Seeds are unbounded ints: hash a None marker, or a length-prefixed
+    # two's-complement encoding, so every seed (including -1) is distinct
+    if request.seed is None:
+        digest.update(b"\0")
+    else:
+        seed = request.seed.to_bytes((request.seed.bit_length() + 8) // 8, "little", signed=True)
+        digest.update(b"\1" + struct.pack("<I", len(seed)) + seed)
+    if request.init_image is not None:
+        digest.update(request.init_image)
+    return digest.digest()
@@ -1,11 +1,45 @@
 """Base classes for plugin system."""
 
+import importlib
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Any, Dict
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Optional, Any, Dict, Tuple
 from enum import Enum
 
 
+@lru_cache(maxsize=128)
+def _is_installed(package: str) -> bool:
+    """Check whether a package can be imported, without importing it.
+
+    Args:
+        package: Importable package name
+
+    Returns:
+        True if the package is installed
+    """
+    if package in sys.modules:
+        return True  # Already imported
+    try:
+        return find_spec(package) is not None
+    except (ImportError, ValueError):
+        return False  # e.g. the parent of a dotted name is missing
+
+
+def invalidate_dependency_cache() -> None:
+    """Forget cached dependency checks.
+
+    Call after installing packages while the application is running, so
+    plugins whose dependencies were missing can be loaded without a
+    restart.
+    """
+    _is_installed.cache_clear()
+    # find_spec also relies on cached directory listings of sys.path entries
+    importlib.invalidate_caches()
+
+
 class PluginType(Enum):
     """Types of plugins supported by the application."""
     BACKEND = "backend"
@@ -13,7 +47,7 @@ class PluginType(Enum):
     EXTENSION = "extension"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PluginMetadata:
     """Metadata describing a plugin.
 
@@ -24,8 +58,10 @@ class PluginMetadata:
         author: Plugin author name
         description: Brief description of plugin functionality
         plugin_type: Type of plugin (backend, filter, extension)
-        dependencies: List of required Python packages
+        dependencies: Required Python packages (stored as a tuple)
         requires_api_key: Whether plugin requires an API key
+
+    Metadata is immutable and hashable, so it can be used as a dict key.
     """
     name: str
     display_name: str
@@ -33,13 +69,13 @@ class PluginMetadata:
     author: str
     description: str
     plugin_type: PluginType
-    dependencies: list[str] = None
+    dependencies: Tuple[str, ...] = ()
     requires_api_key: bool = False
 
     def __post_init__(self):
         """Validate metadata after initialization."""
-        if self.dependencies is None:
-            self.dependencies = []
+        # Accept any iterable (usually a list) but store a hashable tuple
+        object.__setattr__(self, "dependencies", tuple(self.dependencies or ()))
 
         # Validate name is lowercase with no spaces
         if not self.name.islower() or ' ' in self.name:
@@ -125,16 +161,16 @@ class BasePlugin(ABC):
     def validate_dependencies(self) -> tuple[bool, list[str]]:
         """Check if all required dependencies are installed.
 
+        Packages are located without being imported, so checking heavy
+        dependencies such as torch is cheap. Results are cached per package.
+
         Returns:
             Tuple of (all_installed, missing_packages)
         """
-        missing = []
-
-        for package in self.metadata.dependencies:
-            try:
-                __import__(package)
-            except ImportError:
-                missing.append(package)
+        missing = [
+            package for package in self.metadata.dependencies
+            if not _is_installed(package)
+        ]
 
         return (len(missing) == 0, missing)
 
@@ -3,14 +3,22 @@
 import logging
 import importlib
 import importlib.util
+import os
 from pathlib import Path
-from typing import Optional, Dict, List, Type
+from types import MappingProxyType, ModuleType
+from typing import Optional, Dict, FrozenSet, List, Mapping, Tuple, Type
 import sys
+import threading
+from collections import defaultdict
 
 from src.core.plugin import BasePlugin, BackendPlugin, PluginType, PluginMetadata
 
 logger = logging.getLogger(__name__)
 
+# Module name -> (path, mtime in ns) of the plugin file it was imported from.
+# Shared by all PluginManager instances, like sys.modules itself.
+_loaded_plugin_files: Dict[str, Tuple[str, int]] = {}
+
 
 class PluginManager:
     """Singleton manager for discovering, loading, and managing plugins.
@@ -28,7 +36,22 @@ class PluginManager:
         plugin = manager.get_plugin("myplugin")
     """
 
+    __slots__ = (
+        "plugins_dir",
+        "_plugins",
+        "_plugins_view",
+        "_plugins_by_type",
+        "_plugin_classes",
+        "_builtin_plugins",
+        "_available_plugins",
+        "_available_plugin_names",
+        "_discovery_cache",
+        "_deferred_plugins",
+    )
+
     _instance: Optional['PluginManager'] = None
+    # Serializes first-time construction in get_instance
+    _instance_lock = threading.Lock()
 
     def __init__(self, plugins_dir: Optional[Path] = None):
         """Initialize the plugin manager.
@@ -43,29 +66,50 @@ class PluginManager:
 
         self.plugins_dir = Path(plugins_dir)
         self._plugins: Dict[str, BasePlugin] = {}
+        # Read-only view handed out by get_all_plugins
+        self._plugins_view: Mapping[str, BasePlugin] = MappingProxyType(self._plugins)
+        # Loaded plugins indexed by type, in load order
+        self._plugins_by_type: Dict[PluginType, Dict[str, BasePlugin]] = defaultdict(dict)
         self._plugin_classes: Dict[str, Type[BasePlugin]] = {}
         self._builtin_plugins: Dict[str, Type[BasePlugin]] = {}
+        # Cached union of built-in and discovered plugin names
+        self._available_plugins: Optional[FrozenSet[str]] = None
+        # Sorted names of _available_plugins, rebuilt together with it
+        self._available_plugin_names: Tuple[str, ...] = ()
+        # __plugin__.py path -> mtime (ns) at which it was last discovered
+        self._discovery_cache: Dict[str, int] = {}
+        # Discovered plugin modules whose Plugin class is not resolved yet
+        self._deferred_plugins: Dict[str, ModuleType] = {}
 
-        logger.info(f"PluginManager initialized with plugins dir: {self.plugins_dir}")
+        logger.info("PluginManager initialized with plugins dir: %s", self.plugins_dir)
 
     @classmethod
     def get_instance(cls, plugins_dir: Optional[Path] = None) -> 'PluginManager':
         """Get the singleton instance of PluginManager.
 
+        Safe to call from several threads: only one instance is ever
+        constructed. Once it exists, calls return it without locking.
+
         Args:
             plugins_dir: Directory containing plugins (only used on first call)
 
         Returns:
             The singleton PluginManager instance
         """
-        if cls._instance is None:
-            cls._instance = cls(plugins_dir)
-        return cls._instance
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                # Another thread may have created it while we waited
+                if cls._instance is None:
+                    cls._instance = cls(plugins_dir)
+                instance = cls._instance
+        return instance
 
     @classmethod
     def reset_instance(cls) -> None:
         """Reset the singleton instance (useful for testing)."""
-        cls._instance = None
+        with cls._instance_lock:
+            cls._instance = None
 
     def register_builtin_plugin(
         self,
@@ -83,97 +127,201 @@ class PluginManager:
             plugin_class: Plugin class to register
         """
         if plugin_name in self._builtin_plugins:
-            logger.warning(f"Built-in plugin '{plugin_name}' already registered, overwriting")
+            logger.warning("Built-in plugin '%s' already registered, overwriting", plugin_name)
 
         self._builtin_plugins[plugin_name] = plugin_class
-        logger.info(f"Registered built-in plugin: {plugin_name}")
+        self._available_plugins = None
+        logger.info("Registered built-in plugin: %s", plugin_name)
+
+    def register_builtin_plugins(self, plugins: Mapping[str, Type[BasePlugin]]) -> None:
+        """Register several built-in plugin classes at once.
+
+        Equivalent to calling register_builtin_plugin for each entry, but
+        merges the mapping in one update.
+
+        Args:
+            plugins: Mapping of unique plugin names (lowercase) to plugin classes
+        """
+        for plugin_name in self._builtin_plugins.keys() & plugins.keys():
+            logger.warning("Built-in plugin '%s' already registered, overwriting", plugin_name)
+
+        self._builtin_plugins.update(plugins)
+        self._available_plugins = None
+        logger.info("Registered built-in plugins: %s", ', '.join(plugins))
 
     def discover_plugins(self) -> List[str]:
         """Discover available plugins in the plugins directory.
 
         Searches for Python packages in the plugins directory that contain
-        a __plugin__.py file defining a Plugin class.
+        a __plugin__.py file. Plugin files are not executed here: each one is
+        imported lazily, and its Plugin class is only resolved (running the
+        file) when load_plugin is called. Plugin files that have not changed
+        since they were last discovered are skipped.
 
         Returns:
             List of discovered plugin names
         """
         discovered = []
 
-        if not self.plugins_dir.exists():
-            logger.info(f"Plugins directory does not exist: {self.plugins_dir}")
+        # Open the directory directly rather than checking that it exists
+        # first, which would cost an extra stat on every discovery
+        try:
+            entries = os.scandir(self.plugins_dir)
+        except FileNotFoundError:
+            logger.info("Plugins directory does not exist: %s", self.plugins_dir)
             logger.info("Creating plugins directory...")
             self.plugins_dir.mkdir(parents=True, exist_ok=True)
             return discovered
 
-        # Search for plugin packages
-        for item in self.plugins_dir.iterdir():
-            if not item.is_dir():
-                continue
+        # Search for plugin packages. scandir reports entry types without a
+        # stat call per entry, and one stat of __plugin__.py gives both its
+        # existence and its mtime.
+        with entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+
+                plugin_name = entry.name
+                plugin_file = os.path.join(entry.path, "__plugin__.py")
+                try:
+                    mtime_ns = os.stat(plugin_file).st_mtime_ns
+                except OSError:
+                    logger.debug("Skipping %s: no __plugin__.py found", plugin_name)
+                    continue
+
+                if (self._discovery_cache.get(plugin_file) == mtime_ns
+                        and (plugin_name in self._plugin_classes
+                             or plugin_name in self._deferred_plugins)):
+                    discovered.append(plugin_name)
+                    continue
+
+                try:
+                    module = self._import_plugin_module(
+                        plugin_name, Path(plugin_file), mtime_ns
+                    )
+                except Exception as e:
+                    logger.error("Failed to discover plugin %s: %s", plugin_name, e)
+                    continue
+
+                if module is not None:
+                    self._deferred_plugins[plugin_name] = module
+                    self._plugin_classes.pop(plugin_name, None)
+                    self._discovery_cache[plugin_file] = mtime_ns
+                    self._available_plugins = None
+                    discovered.append(plugin_name)
+                    logger.info("Discovered plugin: %s", plugin_name)
 
-            # Look for __plugin__.py
-            plugin_file = item / "__plugin__.py"
-            if not plugin_file.exists():
-                logger.debug(f"Skipping {item.name}: no __plugin__.py found")
-                continue
+        logger.info("Discovered %s plugin(s): %s", len(discovered), ', '.join(discovered))
+        return discovered
 
-            try:
-                plugin_name = item.name
-                plugin_class = self._load_plugin_class(plugin_name, plugin_file)
+    def _import_plugin_module(
+        self,
+        plugin_name: str,
+        plugin_file: Path,
+        mtime_ns: int
+    ) -> Optional[ModuleType]:
+        """Import a plugin module without executing it.
 
-                if plugin_class is not None:
-                    self._plugin_classes[plugin_name] = plugin_class
-                    discovered.append(plugin_name)
-                    logger.info(f"Discovered plugin: {plugin_name}")
+        The module is created with importlib.util.LazyLoader, so its code only
+        runs on first attribute access. If the module is already in
+        sys.modules and was imported from the same, unmodified file, it is
+        reused.
 
-            except Exception as e:
-                logger.error(f"Failed to discover plugin {item.name}: {e}")
+        Args:
+            plugin_name: Name of the plugin
+            plugin_file: Path to __plugin__.py file
+            mtime_ns: Modification time of plugin_file
 
-        logger.info(f"Discovered {len(discovered)} plugin(s): {', '.join(discovered)}")
-        return discovered
+        Returns:
+            Plugin module, or None if no module spec could be created
+        """
+        module_name = f"plugins.{plugin_name}"
+        # Compare against the recorded source rather than module.__file__:
+        # any attribute access would execute a lazy module
+        module = sys.modules.get(module_name)
+        if (module is not None
+                and _loaded_plugin_files.get(module_name) == (str(plugin_file), mtime_ns)):
+            return module
+
+        spec = importlib.util.spec_from_file_location(module_name, plugin_file)
+        if spec is None or spec.loader is None:
+            logger.error("Failed to create module spec for %s", plugin_name)
+            return None
 
-    def _load_plugin_class(
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        _loaded_plugin_files[module_name] = (str(plugin_file), mtime_ns)
+        return module
+
+    def _resolve_plugin_class(
         self,
         plugin_name: str,
-        plugin_file: Path
+        module: ModuleType
     ) -> Optional[Type[BasePlugin]]:
-        """Load a plugin class from a file.
+        """Get the Plugin class of a plugin module, executing it if needed.
 
         Args:
             plugin_name: Name of the plugin
-            plugin_file: Path to __plugin__.py file
+            module: Plugin module returned by _import_plugin_module
 
         Returns:
             Plugin class if successful, None otherwise
         """
+        module_name = f"plugins.{plugin_name}"
         try:
-            # Load the module
-            spec = importlib.util.spec_from_file_location(
-                f"plugins.{plugin_name}",
-                plugin_file
-            )
-            if spec is None or spec.loader is None:
-                logger.error(f"Failed to create module spec for {plugin_name}")
-                return None
+            # First attribute access runs the module code
+            plugin_class = getattr(module, "Plugin", None)
+        except Exception as e:
+            # Don't leave a half-initialized module behind
+            if sys.modules.get(module_name) is module:
+                del sys.modules[module_name]
+            _loaded_plugin_files.pop(module_name, None)
+            logger.error("Failed to load plugin class for %s: %s", plugin_name, e)
+            return None
 
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[f"plugins.{plugin_name}"] = module
-            spec.loader.exec_module(module)
+        # Look for a class that inherits from BasePlugin
+        if plugin_class is None:
+            logger.error("Plugin %s does not define 'Plugin' class", plugin_name)
+            return None
 
-            # Look for a class that inherits from BasePlugin
-            plugin_class = getattr(module, "Plugin", None)
-            if plugin_class is None:
-                logger.error(f"Plugin {plugin_name} does not define 'Plugin' class")
-                return None
+        if not isinstance(plugin_class, type) or not issubclass(plugin_class, BasePlugin):
+            logger.error("Plugin %s 'Plugin' class does not inherit from BasePlugin", plugin_name)
+            return None
 
-            if not issubclass(plugin_class, BasePlugin):
-                logger.error(f"Plugin {plugin_name} 'Plugin' class does not inherit from BasePlugin")
-                return None
+        return plugin_class
 
-            return plugin_class
+    def _load_plugin_class(
+        self,
+        plugin_name: str,
+        plugin_file: Path,
+        mtime_ns: Optional[int] = None
+    ) -> Optional[Type[BasePlugin]]:
+        """Load a plugin class from a file.
+
+        If the plugin module is already in sys.modules and was imported from
+        the same, unmodified file, it is reused instead of executed again.
 
+        Args:
+            plugin_name: Name of the plugin
+            plugin_file: Path to __plugin__.py file
+            mtime_ns: Modification time of plugin_file, if already known
+
+        Returns:
+            Plugin class if successful, None otherwise
+        """
+        try:
+            if mtime_ns is None:
+                mtime_ns = plugin_file.stat().st_mtime_ns
+            module = self._import_plugin_module(plugin_name, plugin_file, mtime_ns)
         except Exception as e:
-            logger.error(f"Failed to load plugin class for {plugin_name}: {e}")
+            logger.error("Failed to load plugin class for %s: %s", plugin_name, e)
+            return None
+
+        if module is None:
             return None
+        return self._resolve_plugin_class(plugin_name, module)
 
     def load_plugin(
         self,
@@ -192,7 +340,7 @@ class PluginManager:
             True if plugin was loaded successfully, False otherwise
         """
         if plugin_name in self._plugins:
-            logger.info(f"Plugin '{plugin_name}' already loaded")
+            logger.info("Plugin '%s' already loaded", plugin_name)
             return True
 
         # Check built-in plugins first
@@ -200,8 +348,16 @@ class PluginManager:
             plugin_class = self._builtin_plugins[plugin_name]
         elif plugin_name in self._plugin_classes:
             plugin_class = self._plugin_classes[plugin_name]
+        elif plugin_name in self._deferred_plugins:
+            plugin_class = self._resolve_plugin_class(
+                plugin_name, self._deferred_plugins.pop(plugin_name)
+            )
+            if plugin_class is None:
+                self._available_plugins = None
+                return False
+            self._plugin_classes[plugin_name] = plugin_class
         else:
-            logger.error(f"Plugin '{plugin_name}' not found. Run discover_plugins() first.")
+            logger.error("Plugin '%s' not found. Run discover_plugins() first.", plugin_name)
             return False
 
         try:
@@ -212,25 +368,26 @@ class PluginManager:
             all_installed, missing = plugin.validate_dependencies()
             if not all_installed:
                 logger.error(
-                    f"Plugin '{plugin_name}' has missing dependencies: {', '.join(missing)}"
+                    "Plugin '%s' has missing dependencies: %s", plugin_name, ', '.join(missing)
                 )
                 return False
 
             # Store the plugin instance
             self._plugins[plugin_name] = plugin
-            logger.info(f"Loaded plugin: {plugin}")
+            self._plugins_by_type[plugin.metadata.plugin_type][plugin_name] = plugin
+            logger.info("Loaded plugin: %s", plugin)
 
             # Enable if requested
             if auto_enable:
                 success = plugin.enable()
                 if not success:
-                    logger.error(f"Failed to enable plugin '{plugin_name}'")
+                    logger.error("Failed to enable plugin '%s'", plugin_name)
                     return False
 
             return True
 
         except Exception as e:
-            logger.error(f"Failed to load plugin '{plugin_name}': {e}")
+            logger.error("Failed to load plugin '%s': %s", plugin_name, e)
             return False
 
     def unload_plugin(self, plugin_name: str) -> bool:
@@ -243,13 +400,14 @@ class PluginManager:
             True if plugin was unloaded successfully
         """
         if plugin_name not in self._plugins:
-            logger.warning(f"Plugin '{plugin_name}' not loaded")
+            logger.warning("Plugin '%s' not loaded", plugin_name)
             return False
 
         plugin = self._plugins[plugin_name]
         plugin.disable()
         del self._plugins[plugin_name]
-        logger.info(f"Unloaded plugin: {plugin_name}")
+        self._plugins_by_type[plugin.metadata.plugin_type].pop(plugin_name, None)
+        logger.info("Unloaded plugin: %s", plugin_name)
         return True
 
     def get_plugin(self, plugin_name: str) -> Optional[BasePlugin]:
@@ -272,18 +430,17 @@ class PluginManager:
         Returns:
             List of plugin instances matching the type
         """
-        return [
-            plugin for plugin in self._plugins.values()
-            if plugin.metadata.plugin_type == plugin_type
-        ]
+        plugins = self._plugins_by_type.get(plugin_type)
+        return list(plugins.values()) if plugins else []
 
-    def get_all_plugins(self) -> Dict[str, BasePlugin]:
+    def get_all_plugins(self) -> Mapping[str, BasePlugin]:
         """Get all loaded plugins.
 
         Returns:
-            Dictionary mapping plugin names to plugin instances
+            Read-only live view mapping plugin names to plugin instances
+            (copy it with dict() to keep a snapshot)
         """
-        return self._plugins.copy()
+        return self._plugins_view
 
     def get_backend_plugins(self) -> List[BackendPlugin]:
         """Get all loaded backend plugins.
@@ -317,14 +474,36 @@ class PluginManager:
         plugin = self.get_plugin(plugin_name)
         return plugin is not None and plugin.enabled
 
+    def available_plugins(self) -> FrozenSet[str]:
+        """Get the names of all available plugins (discovered + built-in).
+
+        The set is cached and rebuilt only after plugins are registered or
+        discovered, so membership checks are a single hash lookup.
+
+        Returns:
+            Frozen set of plugin names
+        """
+        if self._available_plugins is None:
+            self._available_plugins = (
+                frozenset(self._plugin_classes)
+                | frozenset(self._deferred_plugins)
+                | frozenset(self._builtin_plugins)
+            )
+            self._available_plugin_names = tuple(sorted(self._available_plugins))
+        return self._available_plugins
+
     def list_available_plugins(self) -> List[str]:
         """List all available plugins (discovered + built-in).
 
+        The sorted names are cached with available_plugins(), so this only
+        copies them into a new list.
+
         Returns:
-            List of plugin names
+            Sorted list of plugin names
         """
-        return list(set(self._plugin_classes.keys()) | set(self._builtin_plugins.keys()))
+        self.available_plugins()
+        return list(self._available_plugin_names)
 
     def __repr__(self) -> str:
         """String representation."""
-        return f"PluginManager(loaded={len(self._plugins)}, available={len(self.list_available_plugins())})"
+        return f"PluginManager(loaded={len(self._plugins)}, available={len(self.available_plugins())})"
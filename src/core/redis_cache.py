@@ -0,0 +1,154 @@
+"""Redis-backed image cache shared across worker processes."""
+
+import json
+import logging
+from typing import Optional
+
+from src.core.models import GenerationRequest, GeneratedImage, prompt_key
+
+logger = logging.getLogger(__name__)
+
+
+class RedisImageCache:
+    """Exact-match cache of generated images stored in Redis with a TTL.
+
+    Unlike SemanticCache, which lives in one process, entries are shared by
+    every worker connected to the same Redis server and survive restarts,
+    so a freshly started worker can serve repeated requests immediately.
+
+    Each image is stored as a Redis hash holding the encoded image and its
+    metadata (as JSON), keyed by the request's prompt_key. Only seeded
+    text-to-image requests are cached. Redis errors are logged and treated
+    as cache misses, so an unavailable server never fails a generation.
+
+    Example:
+        cache = RedisImageCache.from_url("redis://localhost:6379/0")
+        generator = ImageGenerator(backend, image_cache=cache)
+    """
+
+    KEY_PREFIX = "img:"
+
+    def __init__(self, client, ttl_seconds: int = 86400):
+        """Initialize the cache.
+
+        Args:
+            client: redis.Redis client (must not use decode_responses)
+            ttl_seconds: How long cached images are kept
+
+        Raises:
+            ValueError: If ttl_seconds is not positive
+        """
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be at least 1")
+
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: int = 86400) -> "RedisImageCache":
+        """Create a cache connected to a Redis server.
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+            ttl_seconds: How long cached images are kept
+
+        Returns:
+            Connected RedisImageCache
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "The Redis image cache requires the redis package. "
+                "Install with: pip install redis"
+            ) from e
+
+        return cls(redis.Redis.from_url(url), ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def is_cacheable(request: GenerationRequest) -> bool:
+        """Check whether a request may be served from or stored in the cache.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            True for seeded text-to-image requests
+        """
+        return request.seed is not None and request.init_image is None
+
+    @classmethod
+    def key_for(cls, request: GenerationRequest) -> str:
+        """Build the Redis key for a request.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Key of the form img:<hex prompt_key digest>
+        """
+        return cls.KEY_PREFIX + prompt_key(request).hex()
+
+    def get(self, request: GenerationRequest) -> Optional[GeneratedImage]:
+        """Return the cached image for a request, if any.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Cached image with cache_hit and source_prompt metadata, or None
+        """
+        if not self.is_cacheable(request):
+            return None
+
+        try:
+            fields = self.client.hgetall(self.key_for(request))
+        except Exception as e:
+            logger.warning(f"Redis image cache lookup failed: {e}")
+            return None
+
+        if not fields:
+            return None
+
+        source_prompt = fields[b"prompt"].decode("utf-8")
+        metadata = json.loads(fields[b"metadata"])
+        metadata.update({"cache_hit": True, "source_prompt": source_prompt})
+
+        logger.info(f"Redis image cache hit for prompt: {request.prompt[:50]}...")
+        # The fields were written by set() from a validated image, so skip
+        # validating them again
+        return GeneratedImage.model_construct(
+            image_data=fields[b"image_data"],
+            prompt=request.prompt,
+            backend=fields[b"backend"].decode("utf-8"),
+            timestamp_ns=int(fields[b"timestamp_ns"]),
+            metadata=metadata
+        )
+
+    def set(self, request: GenerationRequest, image: GeneratedImage) -> None:
+        """Store a generated image for later lookups.
+
+        Args:
+            request: The request that produced the image
+            image: The generated image
+        """
+        if not self.is_cacheable(request):
+            return
+
+        key = self.key_for(request)
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(key, mapping={
+                "image_data": image.get_bytes(),
+                "prompt": image.prompt,
+                "backend": image.backend,
+                "timestamp_ns": image.timestamp_ns,
+                "metadata": json.dumps(image.metadata, default=str),
+            })
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis image cache store failed: {e}")
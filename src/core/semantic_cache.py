@@ -0,0 +1,327 @@
+"""Approximate prompt-to-image cache based on prompt embedding similarity."""
+
+import logging
+import math
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from src.core.models import GenerationRequest, GeneratedImage, prompt_key
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# (minimum similarity, fraction of denoising steps reused from cached latents)
+_RESUME_FRACTIONS = ((0.93, 0.5), (0.90, 0.4), (0.87, 0.3), (0.84, 0.2), (0.80, 0.1))
+
+
+def hashed_embedding(text: str, dimensions: int = 512) -> List[float]:
+    """Embed text as a normalized bag of hashed word unigrams and bigrams.
+
+    This is a dependency-free stand-in for a sentence or CLIP text encoder:
+    prompts that differ only in case, punctuation or whitespace map to the
+    same vector, and prompts sharing most of their words score close to 1.
+
+    Args:
+        text: Text to embed
+        dimensions: Length of the returned vector
+
+    Returns:
+        Unit-length embedding vector (all zeros for text without tokens)
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    vector = [0.0] * dimensions
+    for feature in features:
+        vector[zlib.crc32(feature.encode("utf-8")) % dimensions] += 1.0
+
+    return _normalize(vector)
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    """Scale a vector to unit length.
+
+    Args:
+        vector: Vector to normalize
+
+    Returns:
+        Normalized copy of the vector (unchanged if it has zero length)
+    """
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return list(vector)
+    return [v / norm for v in vector]
+
+
+def select_resume_fraction(similarity: float) -> float:
+    """Map prompt similarity to the fraction of denoising steps to reuse.
+
+    More similar prompts share more of their coarse layout, so more of the
+    cached denoising trajectory can be reused before the prompts diverge.
+
+    Args:
+        similarity: Cosine similarity between the new and cached prompt
+
+    Returns:
+        Fraction of steps to skip, between 0.1 and 0.5 (0 if too dissimilar)
+    """
+    for minimum, fraction in _RESUME_FRACTIONS:
+        if similarity >= minimum:
+            return fraction
+    return 0.0
+
+
+@dataclass
+class LatentMatch:
+    """Cached latents that a similar request can resume denoising from."""
+    start_step: int
+    latents: Any
+    source_prompt: str
+    backend: str
+    similarity: float
+
+
+@dataclass
+class _CacheEntry:
+    """A cached generation together with its prompt embedding."""
+    settings_key: Tuple
+    prompt: str
+    embedding: List[float]
+    image: GeneratedImage
+
+
+class SemanticCache:
+    """Cache that serves generated images for semantically equivalent prompts.
+
+    Lookups first check for an exact match on the request's prompt_key
+    (normalized prompt plus all settings), which needs no embedding. Otherwise
+    they embed the request prompt and return the most similar cached
+    prompt whose cosine similarity reaches the threshold. Only requests with
+    identical generation parameters (seed, size, guidance, steps, negative
+    prompt and output format) are compared, so a hit is always shape- and
+    setting-compatible with the request. Unseeded and image-to-image
+    requests are never cached, since callers expect a fresh result for them.
+
+    Prompts that are similar but below the threshold can still reuse the
+    intermediate latents of a cached generation (see lookup_latents), which
+    lets backends that support it skip part of the denoising loop.
+
+    The cache is bounded and evicts the least recently used entry. It is
+    scanned linearly, which is cheap at the sizes used here.
+
+    Example:
+        cache = SemanticCache(threshold=0.95)
+        generator = ImageGenerator(backend, semantic_cache=cache)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 128,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        latent_threshold: float = 0.8
+    ):
+        """Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached images
+            embed_fn: Function mapping a prompt to an embedding vector.
+                Defaults to hashed_embedding.
+            latent_threshold: Minimum cosine similarity for reusing cached
+                intermediate latents
+
+        Raises:
+            ValueError: If threshold, latent_threshold or max_entries is invalid
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if not 0 < latent_threshold <= threshold:
+            raise ValueError("latent_threshold must be in (0, threshold]")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.threshold = threshold
+        self.latent_threshold = latent_threshold
+        self.max_entries = max_entries
+        self.embed_fn = embed_fn or hashed_embedding
+
+        self._entries: "OrderedDict[bytes, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached images."""
+        return len(self._entries)
+
+    @staticmethod
+    def is_cacheable(request: GenerationRequest) -> bool:
+        """Check whether a request may be served from or stored in the cache.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            True for seeded text-to-image requests
+        """
+        return request.seed is not None and request.init_image is None
+
+    @staticmethod
+    def _settings_key(request: GenerationRequest) -> Tuple:
+        """Key of every request field except the prompt.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Hashable tuple of the non-prompt request parameters
+        """
+        return tuple(
+            value for name, value in zip(type(request).model_fields, request.cache_key)
+            if name != "prompt"
+        )
+
+    def _best_match(
+        self,
+        request: GenerationRequest,
+        predicate: Optional[Callable[[_CacheEntry], bool]] = None
+    ) -> Optional[Tuple[bytes, _CacheEntry, float]]:
+        """Find the most similar cached entry with identical settings.
+
+        Args:
+            request: The generation request
+            predicate: Optional filter applied to candidate entries
+
+        Returns:
+            Tuple of (key, entry, similarity), or None if there is no candidate
+        """
+        settings_key = self._settings_key(request)
+        embedding = _normalize(self.embed_fn(request.prompt))
+
+        best = None
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry.settings_key != settings_key or (predicate and not predicate(entry)):
+                    continue
+                score = sum(a * b for a, b in zip(embedding, entry.embedding))
+                if best is None or score > best[2]:
+                    best = (key, entry, score)
+        return best
+
+    def lookup(self, request: GenerationRequest) -> Optional[GeneratedImage]:
+        """Return a cached image for an equivalent request, if any.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            Copy of the cached image with cache_hit, source_prompt and
+            similarity metadata, or None on a miss
+        """
+        if not self.is_cacheable(request):
+            return None
+
+        key = prompt_key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            score = 1.0
+        else:
+            match = self._best_match(request)
+            if match is None or match[2] < self.threshold:
+                return None
+
+            key, entry, score = match
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+
+        logger.info(
+            f"Semantic cache hit (similarity {score:.3f}) "
+            f"for prompt: {request.prompt[:50]}..."
+        )
+        return entry.image.model_copy(update={
+            "prompt": request.prompt,
+            "metadata": {
+                **entry.image.metadata,
+                "cache_hit": True,
+                "source_prompt": entry.prompt,
+                "similarity": round(score, 4),
+            },
+        })
+
+    def lookup_latents(self, request: GenerationRequest) -> Optional[LatentMatch]:
+        """Find cached intermediate latents a similar request can resume from.
+
+        The number of reused steps grows with prompt similarity (see
+        select_resume_fraction) and is rounded down to a step at which
+        latents were captured.
+
+        Args:
+            request: The generation request
+
+        Returns:
+            LatentMatch for the most similar entry with captured latents, or
+            None if no entry is similar enough
+        """
+        if not self.is_cacheable(request):
+            return None
+
+        match = self._best_match(request, lambda entry: bool(entry.image.latents))
+        if match is None or match[2] < self.latent_threshold:
+            return None
+
+        _, entry, score = match
+        max_step = int(request.num_inference_steps * select_resume_fraction(score))
+        steps = [step for step in entry.image.latents if 0 < step <= max_step]
+        if not steps:
+            return None
+
+        start_step = max(steps)
+        logger.info(
+            f"Reusing {start_step} cached denoising step(s) (similarity {score:.3f}) "
+            f"for prompt: {request.prompt[:50]}..."
+        )
+        return LatentMatch(
+            start_step=start_step,
+            latents=entry.image.latents[start_step],
+            source_prompt=entry.prompt,
+            backend=entry.image.backend,
+            similarity=score
+        )
+
+    def add(self, request: GenerationRequest, image: GeneratedImage) -> None:
+        """Store a generated image for later lookups.
+
+        Args:
+            request: The request that produced the image
+            image: The generated image
+        """
+        if not self.is_cacheable(request):
+            return
+
+        key = prompt_key(request)
+        entry = _CacheEntry(
+            settings_key=self._settings_key(request),
+            prompt=request.prompt,
+            embedding=_normalize(self.embed_fn(request.prompt)),
+            image=image
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached images."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,103 @@
+"""Admission control for concurrent generation requests."""
+
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """Bounds how many generations run at once and how many may wait.
+
+    Every admitted request counts towards the queue depth until it leaves,
+    whether it is running or waiting for one of the max_inflight slots.
+    Requests arriving while max_queued requests are already admitted are
+    rejected immediately, so the backlog cannot grow without bound.
+
+    The web framework must hand requests to the handler without its own
+    concurrency limit, otherwise requests wait in its queue instead and
+    the depth seen here never exceeds that limit.
+
+    Example:
+        admission = AdmissionController(max_inflight=4, max_queued=16)
+
+        queue_depth = admission.enter()
+        if queue_depth is None:
+            return "Server busy"
+        try:
+            ...  # generate
+        finally:
+            admission.leave()
+    """
+
+    def __init__(self, max_inflight: int = 4, max_queued: int = 16):
+        """Initialize the controller.
+
+        Args:
+            max_inflight: Maximum number of requests running at once
+            max_queued: Maximum number of admitted requests, running or waiting
+
+        Raises:
+            ValueError: If max_inflight is not positive or max_queued is
+                smaller than max_inflight
+        """
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be at least 1")
+        if max_queued < max_inflight:
+            raise ValueError("max_queued must be at least max_inflight")
+
+        self.max_inflight = max_inflight
+        self.max_queued = max_queued
+
+        self._depth = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_inflight)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of admitted requests, running or waiting."""
+        return self._depth
+
+    def enter(self) -> Optional[int]:
+        """Admit a request and block until it may run.
+
+        Returns:
+            Queue depth including this request, or None if the request was
+            rejected because max_queued requests are already admitted. Every
+            admitted request must call leave() when it finishes.
+        """
+        with self._lock:
+            if self._depth >= self.max_queued:
+                logger.warning(f"Rejecting request: {self._depth} requests already queued")
+                return None
+            self._depth += 1
+            depth = self._depth
+
+        self._slots.acquire()
+        return depth
+
+    def leave(self) -> None:
+        """Release the slot of a request admitted by enter()."""
+        self._slots.release()
+        with self._lock:
+            self._depth -= 1
+
+
+def adaptive_num_steps(requested_steps: int, queue_depth: int) -> int:
+    """Lower the inference step count when the server is busy.
+
+    Args:
+        requested_steps: Steps selected by the user
+        queue_depth: Number of admitted requests, including this one (see
+            AdmissionController.enter)
+
+    Returns:
+        The requested steps when idle, at most 8 with 2-4 requests queued,
+        and at most 4 with 5 or more
+    """
+    if queue_depth <= 1:
+        return requested_steps
+    if queue_depth <= 4:
+        return min(requested_steps, 8)
+    return min(requested_steps, 4)
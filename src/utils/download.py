@@ -0,0 +1,71 @@
+"""Streaming HTTP downloads for generated media."""
+
+import logging
+from typing import Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks read from the socket while downloading
+CHUNK_SIZE = 1 << 16
+
+
+def _create_session() -> requests.Session:
+    """Create the HTTP session used for media downloads.
+
+    Returns:
+        Session with a keep-alive connection pool that retries failed
+        connections and transient gateway errors
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by all callers so repeated downloads from Replicate's CDN reuse
+# open connections instead of repeating the TCP and TLS handshakes
+_REQUESTS_SESSION = _create_session()
+
+
+def download_bytes(url: str, timeout: Union[float, Tuple[float, float]] = 60) -> bytearray:
+    """Download a file into a single buffer.
+
+    The body is streamed into a buffer preallocated from Content-Length,
+    rather than read with response.content, which joins all received
+    chunks into a second full-size copy of the file.
+
+    Args:
+        url: URL to download
+        timeout: Request timeout in seconds, or a (connect, read) tuple
+
+    Returns:
+        Downloaded file contents
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or
+            returns an error status
+    """
+    with _REQUESTS_SESSION.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+
+        expected = int(response.headers.get("Content-Length") or 0)
+        buffer = bytearray(expected)
+        offset = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            # Grows the buffer if the body is longer than Content-Length
+            buffer[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+
+    # Trim if the body was shorter than Content-Length
+    del buffer[offset:]
+    logger.debug("Downloaded %s bytes from %s", offset, url)
+    return buffer
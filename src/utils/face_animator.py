@@ -1,17 +1,24 @@
-"""Face animation utility using LivePortrait via Replicate API."""
+"""Face animation utility using SadTalker via Replicate API."""
 
+import functools
+import hashlib
 import logging
-import base64
-from typing import Optional
+import struct
+import threading
+from concurrent.futures import Future
+from typing import Dict
 import replicate
 from replicate.exceptions import ReplicateError
 import requests
 
+from src.utils.download import download_bytes
+from src.utils.image_utils import image_upload
+
 logger = logging.getLogger(__name__)
 
 
 class FaceAnimator:
-    """Face-aware animation using LivePortrait via Replicate.
+    """Face-aware animation using SadTalker via Replicate.
 
     This utility animates portrait images with natural facial expressions,
     head movements, blinking, and realistic motion specifically for faces.
@@ -21,6 +28,8 @@ class FaceAnimator:
         client: Replicate client instance
     """
 
+    __slots__ = ("api_key", "client", "_inflight", "_inflight_lock")
+
     # SadTalker model on Replicate for face animation
     SADTALKER_MODEL = "cjwbw/sadtalker:3aa3dac9353cc4d6bd62a35e0f07966220b3e3d401ca4e04c6f3cb5f029f20ee"
 
@@ -38,6 +47,9 @@ class FaceAnimator:
 
         self.api_key = api_key
         self.client = replicate.Client(api_token=api_key)
+        # Request key -> result of the identical animation currently running
+        self._inflight: Dict[bytes, Future] = {}
+        self._inflight_lock = threading.Lock()
         logger.info("Initialized FaceAnimator with SadTalker model")
 
     def animate_face(
@@ -47,12 +59,16 @@ class FaceAnimator:
         head_rotation_scale: float = 1.0,
         blink: bool = True,
         video_length: int = 3
-    ) -> bytes:
+    ) -> bytearray:
         """Animate a portrait with natural facial expressions and movements.
 
         This method takes a portrait image and generates a video with realistic
         facial animation including expressions, head movements, and blinking.
 
+        Identical calls that overlap share a single Replicate prediction:
+        callers arriving while it runs wait for it and receive a copy of its
+        result (or its error).
+
         Args:
             image_data: Input portrait image as bytes (PNG or JPEG)
             expression_scale: Expression intensity (0-2, default 1.0)
@@ -67,7 +83,7 @@ class FaceAnimator:
             video_length: Video duration in seconds (1-10, default 3)
 
         Returns:
-            Animated video as bytes (MP4 format)
+            Animated video (MP4 format), in a mutable buffer to avoid a copy
 
         Raises:
             ValueError: If parameters are out of range
@@ -86,24 +102,65 @@ class FaceAnimator:
         if video_length < 1 or video_length > 10:
             raise ValueError("Video length must be between 1 and 10 seconds")
 
+        key = hashlib.blake2b(image_data, digest_size=16).digest() + struct.pack(
+            "<dd?i", expression_scale, head_rotation_scale, blink, video_length
+        )
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+
+        if not is_leader:
+            logger.info("Waiting for identical face animation already in progress")
+            return bytearray(future.result())
+
+        try:
+            video_data = self._animate(
+                image_data, expression_scale, head_rotation_scale, blink, video_length
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(video_data)
+            return video_data
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _animate(
+        self,
+        image_data: bytes,
+        expression_scale: float,
+        head_rotation_scale: float,
+        blink: bool,
+        video_length: int
+    ) -> bytearray:
+        """Run the SadTalker prediction and download the resulting video.
+
+        Args:
+            image_data: Input portrait image as bytes
+            expression_scale: Expression intensity (0-2)
+            head_rotation_scale: Head movement amount (0-2)
+            blink: Enable natural blinking
+            video_length: Video duration in seconds
+
+        Returns:
+            Animated video (MP4 format)
+
+        Raises:
+            ConnectionError: If unable to connect to Replicate API
+            RuntimeError: If animation fails
+        """
         try:
             logger.info(
                 f"Animating face: expression={expression_scale}, "
                 f"rotation={head_rotation_scale}, blink={blink}, length={video_length}s"
             )
 
-            # Convert to base64 data URI
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
-
-            # Detect image format
-            if image_data.startswith(b'\x89PNG'):
-                mime_type = 'image/png'
-            elif image_data.startswith(b'\xff\xd8'):
-                mime_type = 'image/jpeg'
-            else:
-                mime_type = 'image/png'  # default
-
-            data_uri = f"data:{mime_type};base64,{image_base64}"
+            # Uploaded by the Replicate client instead of inlined as base64
+            portrait = image_upload(image_data, "portrait")
 
             # Map our parameters to SadTalker parameters
             # pose_style: 0-45, map head_rotation_scale (0-2) to pose range
@@ -117,7 +174,7 @@ class FaceAnimator:
             output = self.client.run(
                 self.SADTALKER_MODEL,
                 input={
-                    "source_image": data_uri,
+                    "source_image": portrait,
                     "expression_scale": expression_scale,
                     "pose_style": pose_style,
                     "still": still_mode,
@@ -129,9 +186,7 @@ class FaceAnimator:
             video_url = str(output)
             logger.debug(f"Downloading animated video from {video_url}")
 
-            response = requests.get(video_url, timeout=60)
-            response.raise_for_status()
-            video_data = response.content
+            video_data = download_bytes(video_url, timeout=60)
 
             logger.info(f"Successfully animated face ({len(video_data)} bytes)")
             return video_data
@@ -168,12 +223,12 @@ class FaceAnimator:
             raise RuntimeError(f"Face animation failed: {e}") from e
 
 
-# Global singleton instance
-_face_animator_instance: Optional[FaceAnimator] = None
-
-
+@functools.cache
 def get_face_animator(api_key: str) -> FaceAnimator:
-    """Get or create the global FaceAnimator instance.
+    """Get or create the shared FaceAnimator for an API key.
+
+    One instance is kept per API key, so a changed key gets a new
+    animator instead of silently reusing the old one.
 
     Args:
         api_key: Replicate API token
@@ -181,18 +236,12 @@ def get_face_animator(api_key: str) -> FaceAnimator:
     Returns:
         FaceAnimator instance
     """
-    global _face_animator_instance
-
-    if _face_animator_instance is None:
-        _face_animator_instance = FaceAnimator(api_key)
-
-    return _face_animator_instance
+    return FaceAnimator(api_key)
 
 
 def reset_face_animator() -> None:
-    """Reset the global FaceAnimator instance.
+    """Discard all shared FaceAnimator instances.
 
-    Useful for testing or when API key changes.
+    Useful for testing.
     """
-    global _face_animator_instance
-    _face_animator_instance = None
+    get_face_animator.cache_clear()
@@ -1,9 +1,11 @@
 """Health check and monitoring utilities for production deployment."""
 
+import functools
 import logging
+import threading
 import time
 import psutil
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -36,6 +38,35 @@ class HealthCheckResult:
         }
 
 
+# Uptime only grows, so repeated scrapes within the same second are the only
+# hits; a few entries cover several checkers sharing the process
+@functools.lru_cache(maxsize=8)
+def _format_uptime_seconds(seconds: int) -> str:
+    """Format a whole number of seconds as e.g. "2d 3h 4m 5s".
+
+    Args:
+        seconds: Uptime in whole seconds
+
+    Returns:
+        Formatted uptime string
+    """
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, secs = divmod(seconds, 60)
+
+    parts = []
+    if days > 0:
+        parts.append(f"{days}d")
+    if hours > 0:
+        parts.append(f"{hours}h")
+    if minutes > 0:
+        parts.append(f"{minutes}m")
+    if secs > 0 or not parts:
+        parts.append(f"{secs}s")
+
+    return " ".join(parts)
+
+
 class HealthChecker:
     """Health checker for monitoring application status.
 
@@ -52,6 +83,9 @@ class HealthChecker:
             print("Application is healthy")
     """
 
+    # How long a sample of CPU, memory and disk usage is reused
+    SAMPLE_TTL_SECONDS = 1.0
+
     def __init__(self):
         """Initialize the health checker."""
         self.start_time = time.time()
@@ -59,11 +93,47 @@ class HealthChecker:
         self.error_count = 0
         self.last_check_time = None
 
+        self._sample: Optional[Tuple[float, Any, Any]] = None
+        self._sample_time = 0.0
+        self._sample_lock = threading.Lock()
+
+        try:
+            # Start the CPU measurement window: later non-blocking calls
+            # report usage since the previous call
+            psutil.cpu_percent(interval=None)
+        except Exception as e:
+            logger.debug(f"Could not prime CPU usage sampling: {e}")
+
         logger.info("HealthChecker initialized")
 
+    def _sample_resources(self) -> Tuple[float, Any, Any]:
+        """Sample CPU, memory and disk usage, reusing a recent sample.
+
+        CPU usage is measured without blocking, as the average since the
+        previous sample, so frequent health checks neither wait nor queue
+        behind each other.
+
+        Returns:
+            Tuple of (cpu_percent, virtual_memory, disk_usage)
+        """
+        with self._sample_lock:
+            now = time.monotonic()
+            if self._sample is None or now - self._sample_time >= self.SAMPLE_TTL_SECONDS:
+                self._sample = (
+                    psutil.cpu_percent(interval=None),
+                    psutil.virtual_memory(),
+                    psutil.disk_usage('/')
+                )
+                self._sample_time = now
+            return self._sample
+
     def check_health(self, include_details: bool = True) -> HealthCheckResult:
         """Perform comprehensive health check.
 
+        Resource usage comes from the shared short-lived sample (see
+        _sample_resources), so frequent probes stay cheap while still
+        reporting the real status.
+
         Args:
             include_details: Whether to include detailed metrics
 
@@ -74,9 +144,7 @@ class HealthChecker:
 
         try:
             # Check system resources
-            cpu_usage = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            cpu_usage, memory, disk = self._sample_resources()
 
             # Determine overall health status
             status = HealthStatus.HEALTHY
@@ -108,9 +176,6 @@ class HealthChecker:
                     status = HealthStatus.DEGRADED
                 issues.append(f"High disk usage: {disk.percent:.1f}%")
 
-            # Calculate uptime
-            uptime_seconds = time.time() - self.start_time
-
             # Build result message
             if status == HealthStatus.HEALTHY:
                 message = "All systems operational"
@@ -122,6 +187,7 @@ class HealthChecker:
             # Build details dictionary
             details = {}
             if include_details:
+                uptime_seconds = time.time() - self.start_time
                 details = {
                     "uptime_seconds": uptime_seconds,
                     "uptime_human": self._format_uptime(uptime_seconds),
@@ -201,9 +267,7 @@ class HealthChecker:
         uptime_seconds = time.time() - self.start_time
 
         try:
-            cpu_usage = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            cpu_usage, memory, disk = self._sample_resources()
 
             return {
                 "uptime_seconds": uptime_seconds,
@@ -239,22 +303,7 @@ class HealthChecker:
         Returns:
             Formatted uptime string
         """
-        days = int(seconds // 86400)
-        hours = int((seconds % 86400) // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-
-        parts = []
-        if days > 0:
-            parts.append(f"{days}d")
-        if hours > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0:
-            parts.append(f"{minutes}m")
-        if secs > 0 or not parts:
-            parts.append(f"{secs}s")
-
-        return " ".join(parts)
+        return _format_uptime_seconds(int(seconds))
 
     def __repr__(self) -> str:
         """String representation."""
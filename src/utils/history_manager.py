@@ -1,10 +1,11 @@
 """History management for generated images."""
 
-from typing import List, Optional, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 from PIL import Image
-import io
 
 from src.core.models import GeneratedImage
 
@@ -15,13 +16,25 @@ class HistoryEntry:
 
     Attributes:
         generated_image: The GeneratedImage object
-        pil_image: PIL Image for display
-        index: Position in history (0 = oldest)
+        index: Sequence number of the entry (0 = first image added). It is
+            not renumbered when older entries are dropped from the history.
     """
     generated_image: GeneratedImage
-    pil_image: Image.Image
     index: int
 
+    @property
+    def pil_image(self) -> Image.Image:
+        """PIL Image for display.
+
+        Opened from the stored image on each access rather than kept on the
+        entry, so decoded pixels are not held in memory for the whole
+        history.
+
+        Returns:
+            PIL Image of the generated image
+        """
+        return self.generated_image.to_pil()
+
     def get_display_info(self) -> str:
         """Get formatted display information.
 
@@ -72,7 +85,9 @@ class ImageHistoryManager:
             max_history: Maximum number of images to keep in history
         """
         self.max_history = max_history
-        self.history: List[HistoryEntry] = []
+        # Oldest entries are dropped automatically once max_history is reached
+        self.history: Deque[HistoryEntry] = deque(maxlen=max_history)
+        self._next_index = 0
 
     def add(self, generated_image: GeneratedImage) -> HistoryEntry:
         """Add a generated image to history.
@@ -83,35 +98,27 @@ class ImageHistoryManager:
         Returns:
             The created HistoryEntry
         """
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(generated_image.image_data))
-
-        # Create history entry
+        # Drop any decoded image a backend kept; it is re-opened from the
+        # encoded data only when displayed
         entry = HistoryEntry(
-            generated_image=generated_image,
-            pil_image=pil_image,
-            index=len(self.history)
+            generated_image=generated_image.model_copy(update={"pil_image": None}),
+            index=self._next_index
         )
+        self._next_index += 1
 
-        # Add to history
+        # Add to history, dropping the oldest entry if full
         self.history.append(entry)
 
-        # Trim if exceeds max
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
-            # Re-index
-            for i, entry in enumerate(self.history):
-                entry.index = i
-
         return entry
 
     def get_all(self) -> List[HistoryEntry]:
         """Get all history entries.
 
         Returns:
-            List of all HistoryEntry objects
+            New list of all HistoryEntry objects, oldest first. It is a
+            snapshot: later additions do not change it.
         """
-        return self.history.copy()
+        return list(self.history)
 
     def get_latest(self, n: int = 1) -> List[HistoryEntry]:
         """Get the N most recent entries.
@@ -122,13 +129,18 @@ class ImageHistoryManager:
         Returns:
             List of most recent HistoryEntry objects
         """
-        return self.history[-n:] if self.history else []
+        if n > 0:
+            # Walk back from the newest entry instead of copying the whole history
+            latest = list(islice(reversed(self.history), n))
+            latest.reverse()
+            return latest
+        return list(self.history)[-n:]
 
     def get_by_index(self, index: int) -> Optional[HistoryEntry]:
         """Get a specific history entry by index.
 
         Args:
-            index: Index of the entry
+            index: Position of the entry in history (0 = oldest kept)
 
         Returns:
             HistoryEntry if found, None otherwise
@@ -140,6 +152,7 @@ class ImageHistoryManager:
     def clear(self) -> None:
         """Clear all history."""
         self.history.clear()
+        self._next_index = 0
 
     def get_images_for_gallery(self) -> List[tuple[Image.Image, str]]:
         """Get images formatted for Gradio Gallery.
@@ -2,7 +2,7 @@
 
 import logging
 import re
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -155,6 +155,13 @@ class PromptLibrary:
         "watermark", "signature", "text", "cropped",
     ]
 
+    # Lookup indexes over TEMPLATES, built once below the class
+    _BY_NAME: Dict[str, PromptTemplate] = {}
+    _BY_CATEGORY: Dict[str, List[PromptTemplate]] = {}
+    # (lowercased name, description and tags, template) pairs. Fields are
+    # joined with NUL so a query cannot match across two of them.
+    _SEARCH_TEXT: List[Tuple[str, PromptTemplate]] = []
+
     @classmethod
     def get_template(cls, name: str) -> Optional[PromptTemplate]:
         """Get template by name.
@@ -165,10 +172,7 @@ class PromptLibrary:
         Returns:
             PromptTemplate if found, None otherwise
         """
-        for template in cls.TEMPLATES:
-            if template.name == name:
-                return template
-        return None
+        return cls._BY_NAME.get(name)
 
     @classmethod
     def get_templates_by_category(cls, category: str) -> List[PromptTemplate]:
@@ -180,7 +184,7 @@ class PromptLibrary:
         Returns:
             List of templates in the category
         """
-        return [t for t in cls.TEMPLATES if t.category == category]
+        return list(cls._BY_CATEGORY.get(category, ()))
 
     @classmethod
     def search_templates(cls, query: str) -> List[PromptTemplate]:
@@ -193,24 +197,29 @@ class PromptLibrary:
             List of matching templates
         """
         query_lower = query.lower()
-        results = []
-
-        for template in cls.TEMPLATES:
-            if (query_lower in template.name.lower() or
-                query_lower in template.description.lower() or
-                any(query_lower in tag.lower() for tag in template.tags)):
-                results.append(template)
-
-        return results
+        return [
+            template for text, template in cls._SEARCH_TEXT
+            if query_lower in text
+        ]
 
     @classmethod
     def get_all_categories(cls) -> List[str]:
         """Get all available categories.
 
         Returns:
-            List of category names
+            List of category names, in order of first appearance
         """
-        return list(set(t.category for t in cls.TEMPLATES))
+        return list(cls._BY_CATEGORY)
+
+
+for _template in PromptLibrary.TEMPLATES:
+    PromptLibrary._BY_NAME.setdefault(_template.name, _template)
+    PromptLibrary._BY_CATEGORY.setdefault(_template.category, []).append(_template)
+    PromptLibrary._SEARCH_TEXT.append((
+        "\0".join([_template.name, _template.description, *_template.tags]).lower(),
+        _template
+    ))
+del _template
 
 
 class PromptEnhancer:
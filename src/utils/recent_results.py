@@ -0,0 +1,110 @@
+"""Short-lived deduplication of repeated UI submissions."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RecentResultCache(Generic[T]):
+    """Shares one result between identical submissions made close together.
+
+    A submission whose key matches one that is still running waits for that
+    run and returns its result, so a double click started while the first
+    click is generating does not generate twice. Results are also kept for
+    ttl seconds after they finish, so a repeat arriving just after the first
+    one completed returns immediately.
+
+    Example:
+        recent = RecentResultCache(ttl=2.0)
+        image, message = recent.get_or_run(key, lambda: generate(...))
+    """
+
+    def __init__(self, ttl: float = 2.0, max_size: int = 32):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a finished result is reused
+            max_size: Maximum number of finished results kept
+
+        Raises:
+            ValueError: If ttl is negative or max_size is not positive
+        """
+        if ttl < 0:
+            raise ValueError("ttl cannot be negative")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._results: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_run(
+        self,
+        key: Hashable,
+        run: Callable[[], T],
+        cacheable: Optional[Callable[[T], bool]] = None
+    ) -> T:
+        """Return the result for key, running run() only when needed.
+
+        run() is skipped if an identical submission is in flight or
+        finished within ttl.
+
+        Args:
+            key: Normalized submission parameters
+            run: Function producing the result
+            cacheable: Optional predicate; results it rejects (e.g. error
+                messages) are shared with submissions already waiting but
+                not kept for later ones
+
+        Returns:
+            The result of run(), possibly from an earlier identical submission
+
+        Raises:
+            Exception: Whatever run() raised, in every waiting submission
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                created_at, result = entry
+                if time.monotonic() - created_at <= self.ttl:
+                    logger.info("Returning recent result for repeated submission")
+                    return result
+                del self._results[key]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            logger.info("Waiting for identical submission already in progress")
+            return future.result()
+
+        try:
+            result = run()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            if cacheable is None or cacheable(result):
+                self._results[key] = (time.monotonic(), result)
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_size:
+                    self._results.popitem(last=False)
+        future.set_result(result)
+        return result
@@ -1,12 +1,14 @@
 """Image-to-video generation utility using Stable Video Diffusion via Replicate API."""
 
 import logging
-import base64
 from typing import Optional
 import replicate
 from replicate.exceptions import ReplicateError
 import requests
 
+from src.utils.download import download_bytes
+from src.utils.image_utils import image_upload
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,7 +50,7 @@ class VideoGenerator:
         cond_aug: float = 0.02,
         decoding_t: int = 7,
         num_frames: int = 14
-    ) -> bytes:
+    ) -> bytearray:
         """Generate a video from a still image using Stable Video Diffusion.
 
         This method takes a still image and generates a short video with natural motion.
@@ -65,7 +67,7 @@ class VideoGenerator:
             num_frames: Number of frames to generate (14 or 25)
 
         Returns:
-            Video as bytes (MP4 format)
+            Video (MP4 format), in a mutable buffer to avoid a copy
 
         Raises:
             ValueError: If parameters are out of range
@@ -96,25 +98,15 @@ class VideoGenerator:
                 f"frames={num_frames}"
             )
 
-            # Convert to base64 data URI
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
-
-            # Detect image format
-            if image_data.startswith(b'\x89PNG'):
-                mime_type = 'image/png'
-            elif image_data.startswith(b'\xff\xd8'):
-                mime_type = 'image/jpeg'
-            else:
-                mime_type = 'image/png'  # default
-
-            data_uri = f"data:{mime_type};base64,{image_base64}"
+            # Uploaded by the Replicate client instead of inlined as base64
+            input_image = image_upload(image_data, "input")
 
             # Run SVD model
             logger.debug("Calling Replicate SVD API")
             output = self.client.run(
                 self.SVD_MODEL,
                 input={
-                    "input_image": data_uri,
+                    "input_image": input_image,
                     "fps": fps,
                     "motion_bucket_id": motion_bucket_id,
                     "cond_aug": cond_aug,
@@ -127,9 +119,7 @@ class VideoGenerator:
             video_url = str(output)
             logger.debug(f"Downloading video from {video_url}")
 
-            response = requests.get(video_url, timeout=60)
-            response.raise_for_status()
-            video_data = response.content
+            video_data = download_bytes(video_url, timeout=60)
 
             logger.info(f"Successfully generated video ({len(video_data)} bytes)")
             return video_data
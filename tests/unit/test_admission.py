@@ -0,0 +1,118 @@
+"""Unit tests for generation admission control."""
+
+import pytest
+import threading
+
+from src.utils.admission import AdmissionController, adaptive_num_steps
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    def test_invalid_parameters(self):
+        """Test that invalid limits are rejected."""
+        with pytest.raises(ValueError, match="max_inflight"):
+            AdmissionController(max_inflight=0)
+
+        with pytest.raises(ValueError, match="max_queued"):
+            AdmissionController(max_inflight=4, max_queued=2)
+
+    def test_enter_and_leave_track_depth(self):
+        """Test that the queue depth counts admitted requests."""
+        admission = AdmissionController(max_inflight=2, max_queued=4)
+
+        assert admission.enter() == 1
+        assert admission.enter() == 2
+        assert admission.queue_depth == 2
+
+        admission.leave()
+        admission.leave()
+        assert admission.queue_depth == 0
+
+    def test_rejects_when_queue_is_full(self):
+        """Test that requests beyond max_queued are rejected without waiting."""
+        admission = AdmissionController(max_inflight=1, max_queued=2)
+        waiter_admitted = threading.Event()
+        waiter_depth = []
+
+        assert admission.enter() == 1
+
+        def waiter():
+            waiter_admitted.set()
+            waiter_depth.append(admission.enter())
+            admission.leave()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        waiter_admitted.wait(timeout=2)
+        # Wait until the waiter is counted while blocked on the only slot
+        for _ in range(200):
+            if admission.queue_depth == 2:
+                break
+            threading.Event().wait(0.005)
+
+        assert admission.queue_depth == 2
+        assert admission.enter() is None
+        assert admission.queue_depth == 2
+
+        admission.leave()
+        thread.join(timeout=2)
+
+        assert waiter_depth == [2]
+        assert admission.queue_depth == 0
+
+    def test_limits_running_requests(self):
+        """Test that at most max_inflight admitted requests run at once."""
+        admission = AdmissionController(max_inflight=2, max_queued=8)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def worker():
+            nonlocal running, peak
+            admission.enter()
+            try:
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                threading.Event().wait(0.02)
+                with lock:
+                    running -= 1
+            finally:
+                admission.leave()
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert peak <= 2
+        assert admission.queue_depth == 0
+
+
+class TestAdaptiveNumSteps:
+    """Tests for adaptive_num_steps."""
+
+    @pytest.mark.parametrize("queue_depth,expected", [
+        (1, 30),
+        (2, 8),
+        (4, 8),
+        (5, 4),
+        (16, 4),
+    ])
+    def test_thresholds(self, queue_depth, expected):
+        """Test the step caps for idle, moderate and heavy load."""
+        assert adaptive_num_steps(30, queue_depth) == expected
+
+    def test_never_raises_steps(self):
+        """Test that small step counts are kept under load."""
+        assert adaptive_num_steps(2, 3) == 2
+        assert adaptive_num_steps(3, 10) == 3
+
+    def test_depth_from_admission_controller(self):
+        """Test that waiting requests raise the depth used for step reduction."""
+        admission = AdmissionController(max_inflight=8, max_queued=8)
+        depths = [admission.enter() for _ in range(5)]
+
+        assert [adaptive_num_steps(30, depth) for depth in depths] == [30, 8, 8, 8, 4]
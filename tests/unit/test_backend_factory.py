@@ -25,6 +25,22 @@ class TestBackendFactory:
         PluginManager.reset_instance()
         BackendFactory._plugin_manager = None
 
+    def test_plugin_manager_initialized_once_concurrently(self):
+        """Test that concurrent first calls register built-in plugins once."""
+        import threading
+
+        with patch('src.core.backend_factory.register_builtin_plugins') as mock_register:
+            threads = [
+                threading.Thread(target=BackendFactory._get_plugin_manager)
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        mock_register.assert_called_once()
+
     def test_get_supported_backends(self):
         """Test getting list of supported backends."""
         backends = BackendFactory.get_supported_backends()
@@ -131,6 +147,21 @@ class TestBackendFactory:
         result = BackendFactory.create_backend("local", api_key=None)
         assert isinstance(result, LocalBackend)
 
+    @patch('src.backends.local.detect_accelerator', return_value="cpu")
+    def test_local_backend_requiring_gpu_fails_without_one(self, mock_detect):
+        """Test that require_gpu keeps the local plugin disabled on CPU-only hosts."""
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                BackendFactory.create_backend("local", plugin_config={"require_gpu": True})
+
+    @patch('src.backends.local.detect_accelerator', return_value="cuda")
+    def test_local_backend_requiring_gpu_with_one(self, mock_detect):
+        """Test that require_gpu allows the local backend when a GPU is present."""
+        result = BackendFactory.create_backend("local", plugin_config={"require_gpu": True})
+
+        assert isinstance(result, LocalBackend)
+        mock_detect.assert_called_once()
+
     def test_create_cloud_backend_requires_api_key(self):
         """Test that cloud backends still require API keys."""
         with pytest.raises(ValueError, match="API key is required"):
@@ -138,3 +169,18 @@ class TestBackendFactory:
 
         with pytest.raises(ValueError, match="API key is required"):
             BackendFactory.create_backend("replicate", api_key=None)
+
+    def test_builtin_plugins_import_backends_lazily(self):
+        """Test that registering built-in plugins does not import backend modules."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys; import src.core.builtin_plugins; "
+            "print(any(m.startswith('src.backends.') for m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "False"
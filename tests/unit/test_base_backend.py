@@ -83,6 +83,36 @@ class TestBaseBackend:
         assert "model1" in models
         assert "model2" in models
 
+    def test_generate_images_default(self):
+        """Test that generate_images calls generate_image per request."""
+        backend = ConcreteBackend(api_key="test_key")
+        requests = [GenerationRequest(prompt="a"), GenerationRequest(prompt="b")]
+
+        results = backend.generate_images(requests)
+
+        assert [r.prompt for r in results] == ["a", "b"]
+
+    def test_resume_from_latents_default(self):
+        """Test that the default resume ignores latents and generates normally."""
+        backend = ConcreteBackend(api_key="test_key")
+
+        result = backend.resume_from_latents(GenerationRequest(prompt="a"), object(), 2)
+
+        assert result.prompt == "a"
+
+    def test_warm_up_default_is_noop(self):
+        """Test that the default warm_up does nothing."""
+        backend = ConcreteBackend(api_key="test_key")
+        assert backend.warm_up() is None
+
+    def test_require_png_output(self):
+        """Test that non-PNG output formats are rejected."""
+        backend = ConcreteBackend(api_key="test_key")
+
+        backend._require_png_output(GenerationRequest(prompt="test"))
+        with pytest.raises(ValueError, match="output_format WEBP"):
+            backend._require_png_output(GenerationRequest(prompt="test", output_format="WEBP"))
+
     def test_repr(self):
         """Test string representation."""
         backend = ConcreteBackend(api_key="test_key")
@@ -0,0 +1,154 @@
+"""Unit tests for the dynamic request batcher."""
+
+import pytest
+import threading
+from unittest.mock import Mock
+
+from src.core.batcher import RequestBatcher
+from src.core.models import GenerationRequest, GeneratedImage
+
+
+def _make_result(request: GenerationRequest) -> GeneratedImage:
+    """Build a fake GeneratedImage for a request."""
+    return GeneratedImage(image_data=b"fake", prompt=request.prompt, backend="test")
+
+
+def _submit_concurrently(batcher, requests):
+    """Submit requests from separate threads and collect results in order."""
+    results = [None] * len(requests)
+    errors = [None] * len(requests)
+
+    def worker(i, request):
+        try:
+            results[i] = batcher.submit(request)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [
+        threading.Thread(target=worker, args=(i, r)) for i, r in enumerate(requests)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    return results, errors
+
+
+class TestRequestBatcher:
+    """Tests for RequestBatcher."""
+
+    def test_invalid_parameters(self):
+        """Test that invalid batch settings are rejected."""
+        with pytest.raises(ValueError, match="max_batch_size"):
+            RequestBatcher(Mock(), max_batch_size=0)
+
+        with pytest.raises(ValueError, match="max_wait_ms"):
+            RequestBatcher(Mock(), max_wait_ms=-1)
+
+    def test_single_request(self):
+        """Test that a lone request is processed after the window closes."""
+        handler = Mock(side_effect=_make_result)
+        batcher = RequestBatcher(handler, max_wait_ms=5)
+
+        result = batcher.submit(GenerationRequest(prompt="a cat"))
+
+        assert result.prompt == "a cat"
+        handler.assert_called_once()
+
+    def test_identical_requests_are_coalesced(self):
+        """Test that identical concurrent requests share one handler call."""
+        handler = Mock(side_effect=_make_result)
+        batcher = RequestBatcher(handler, max_batch_size=8, max_wait_ms=200)
+        requests = [GenerationRequest(prompt="same prompt", seed=1) for _ in range(4)]
+
+        results, errors = _submit_concurrently(batcher, requests)
+
+        assert errors == [None] * 4
+        assert all(r.prompt == "same prompt" for r in results)
+        assert handler.call_count == 1
+
+    def test_unseeded_requests_are_not_coalesced(self):
+        """Test that identical unseeded requests each get their own image."""
+        handler = Mock(side_effect=_make_result)
+        batcher = RequestBatcher(handler, max_batch_size=8, max_wait_ms=200)
+        requests = [GenerationRequest(prompt="same prompt") for _ in range(3)]
+
+        results, errors = _submit_concurrently(batcher, requests)
+
+        assert errors == [None] * 3
+        assert handler.call_count == 3
+        assert len({id(r) for r in results}) == 3
+
+    def test_distinct_requests_run_separately(self):
+        """Test that distinct requests each get their own handler call."""
+        handler = Mock(side_effect=_make_result)
+        batcher = RequestBatcher(handler, max_batch_size=8, max_wait_ms=50)
+        requests = [GenerationRequest(prompt=f"prompt {i}") for i in range(3)]
+
+        results, errors = _submit_concurrently(batcher, requests)
+
+        assert errors == [None] * 3
+        assert [r.prompt for r in results] == ["prompt 0", "prompt 1", "prompt 2"]
+        assert handler.call_count == 3
+
+    def test_calls_run_on_bounded_pool(self):
+        """Test that distinct requests run on at most max_batch_size threads."""
+        names = set()
+
+        def generate(request):
+            names.add(threading.current_thread().name)
+            return _make_result(request)
+
+        handler = Mock(side_effect=generate)
+        batcher = RequestBatcher(handler, max_batch_size=2, max_wait_ms=50)
+        requests = [GenerationRequest(prompt=f"prompt {i}") for i in range(6)]
+
+        results, errors = _submit_concurrently(batcher, requests)
+
+        assert errors == [None] * 6
+        assert handler.call_count == 6
+        assert len(names) <= 2
+        assert all(name.startswith("request-batcher-call") for name in names)
+
+    def test_exception_propagates_to_caller(self):
+        """Test that handler errors are raised in the submitting thread."""
+        handler = Mock(side_effect=RuntimeError("API down"))
+        batcher = RequestBatcher(handler, max_wait_ms=5)
+
+        with pytest.raises(RuntimeError, match="API down"):
+            batcher.submit(GenerationRequest(prompt="test"))
+
+    def test_worker_restarts_after_idle(self):
+        """Test that the worker exits when idle and restarts on demand."""
+        handler = Mock(side_effect=_make_result)
+        batcher = RequestBatcher(handler, max_wait_ms=5)
+        batcher.IDLE_TIMEOUT_SECONDS = 0.05
+
+        batcher.submit(GenerationRequest(prompt="first"))
+        worker = batcher._worker
+        worker.join(timeout=2)
+
+        assert not worker.is_alive()
+        assert batcher._worker is None
+        assert batcher._executor is None
+
+        result = batcher.submit(GenerationRequest(prompt="second"))
+        assert result.prompt == "second"
+
+    def test_batch_handler_receives_distinct_requests(self):
+        """Test that distinct requests go to the batch handler in one call."""
+        handler = Mock(side_effect=_make_result)
+        batch_handler = Mock(side_effect=lambda reqs: [_make_result(r) for r in reqs])
+        batcher = RequestBatcher(
+            handler, max_batch_size=8, max_wait_ms=200, batch_handler=batch_handler
+        )
+        requests = [GenerationRequest(prompt=p, seed=1) for p in ["a", "b", "a"]]
+
+        results, errors = _submit_concurrently(batcher, requests)
+
+        assert errors == [None] * 3
+        assert [r.prompt for r in results] == ["a", "b", "a"]
+        batch_handler.assert_called_once()
+        assert sorted(r.prompt for r in batch_handler.call_args[0][0]) == ["a", "b"]
+        handler.assert_not_called()
@@ -21,6 +21,8 @@ class TestSettings:
             assert settings.log_level == "INFO"
             assert settings.max_retries == 3
             assert settings.timeout == 60
+            assert settings.max_inflight_requests == 4
+            assert settings.max_queued_requests == 16
             assert settings.run_integration_tests is False
 
     def test_custom_values(self):
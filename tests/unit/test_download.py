@@ -0,0 +1,56 @@
+"""Unit tests for streaming downloads."""
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from src.utils.download import _REQUESTS_SESSION, download_bytes
+
+
+def _mock_response(chunks, content_length=None):
+    """Build a streaming response mock yielding the given chunks."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = {} if content_length is None else {"Content-Length": str(content_length)}
+    response.iter_content.return_value = chunks
+    return response
+
+
+class TestDownloadBytes:
+    """Tests for download_bytes function."""
+
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    def test_streams_into_buffer(self, mock_get):
+        """Test that chunks are assembled and the request is streamed."""
+        mock_get.return_value = _mock_response([b"abc", b"def"], content_length=6)
+
+        result = download_bytes("https://example.com/video.mp4", timeout=5)
+
+        assert result == bytearray(b"abcdef")
+        mock_get.assert_called_once_with("https://example.com/video.mp4", timeout=5, stream=True)
+
+    @pytest.mark.parametrize("content_length", [None, 2, 100])
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    def test_content_length_mismatch(self, mock_get, content_length):
+        """Test that a missing or wrong Content-Length does not corrupt the data."""
+        mock_get.return_value = _mock_response([b"abc", b"def"], content_length=content_length)
+
+        assert download_bytes("https://example.com/video.mp4") == b"abcdef"
+
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    def test_http_error_raised(self, mock_get):
+        """Test that error statuses are raised."""
+        response = _mock_response([])
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
+        mock_get.return_value = response
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            download_bytes("https://example.com/missing.mp4")
+
+    def test_session_is_pooled(self):
+        """Test that downloads share a pooled session that retries connections."""
+        adapter = _REQUESTS_SESSION.get_adapter("https://replicate.delivery/video.mp4")
+
+        assert adapter._pool_maxsize == 10
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
@@ -2,6 +2,8 @@
 
 import pytest
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from unittest.mock import Mock, patch, MagicMock
 from replicate.exceptions import ReplicateError
@@ -28,10 +30,12 @@ def mock_replicate_client():
 @pytest.fixture
 def mock_requests_get():
     """Mock requests.get for downloading videos."""
-    with patch('src.utils.face_animator.requests.get') as mock_get:
-        mock_response = Mock()
-        mock_response.content = b'animated_video_data'
-        mock_response.raise_for_status = Mock()
+    with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
+        video = b'animated_video_data'
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Length": str(len(video))}
+        mock_response.iter_content.return_value = [video[:4], video[4:]]
         mock_get.return_value = mock_response
         yield mock_get
 
@@ -46,6 +50,12 @@ class TestFaceAnimator:
         assert animator.client is not None
         mock_replicate_client.assert_called_once_with(api_token="test_api_key")
 
+    def test_has_no_instance_dict(self, mock_replicate_client):
+        """Test that FaceAnimator stores its state in slots."""
+        animator = FaceAnimator("test_api_key")
+
+        assert not hasattr(animator, "__dict__")
+
     def test_initialization_empty_api_key(self):
         """Test initialization fails with empty API key."""
         with pytest.raises(ValueError, match="API key is required"):
@@ -192,7 +202,7 @@ class TestFaceAnimator:
         mock_client_instance.run.return_value = "https://example.com/animated.mp4"
         mock_replicate_client.return_value = mock_client_instance
 
-        with patch('src.utils.face_animator.requests.get') as mock_get:
+        with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
             mock_get.side_effect = Exception("Download failed")
 
             animator = FaceAnimator("test_api_key")
@@ -222,7 +232,26 @@ class TestFaceAnimator:
         assert result == b'animated_video_data'
         # Verify JPEG format was detected
         call_args = mock_client_instance.run.call_args
-        assert "image/jpeg" in call_args[1]["input"]["source_image"]
+        assert call_args[1]["input"]["source_image"].name == "portrait.jpg"
+
+    def test_portrait_sent_as_file_upload(
+        self,
+        mock_replicate_client,
+        mock_requests_get,
+        sample_portrait_bytes
+    ):
+        """Test that the portrait is passed as a file instead of a data URI."""
+        mock_client_instance = MagicMock()
+        mock_client_instance.run.return_value = "https://example.com/animated.mp4"
+        mock_replicate_client.return_value = mock_client_instance
+
+        animator = FaceAnimator("test_api_key")
+        animator.animate_face(sample_portrait_bytes)
+
+        source_image = mock_client_instance.run.call_args[1]["input"]["source_image"]
+        assert isinstance(source_image, io.BytesIO)
+        assert source_image.name == "portrait.png"
+        assert source_image.getvalue() == sample_portrait_bytes
 
     def test_animate_face_with_custom_parameters(
         self,
@@ -254,6 +283,85 @@ class TestFaceAnimator:
         assert call_args[1]["input"]["still"] is False
         assert call_args[1]["input"]["preprocess"] == "crop"
 
+    def _animate_while_running(self, animator, first_kwargs, second_kwargs, portrait):
+        """Start one animation and issue a second while the first is still running."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def run(*args, **kwargs):
+            started.set()
+            release.wait(1)
+            return "https://example.com/animated.mp4"
+
+        animator.client.run.side_effect = run
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(animator.animate_face, portrait, **first_kwargs)
+            started.wait(1)
+            threading.Timer(0.05, release.set).start()
+            second = animator.animate_face(portrait, **second_kwargs)
+            return first.result(), second
+
+    def test_concurrent_identical_requests_share_prediction(
+        self,
+        mock_replicate_client,
+        mock_requests_get,
+        sample_portrait_bytes
+    ):
+        """Test that an identical request made mid-flight reuses the running prediction."""
+        animator = FaceAnimator("test_api_key")
+
+        first, second = self._animate_while_running(
+            animator, {"video_length": 3}, {"video_length": 3}, sample_portrait_bytes
+        )
+
+        assert first == second == b'animated_video_data'
+        assert first is not second
+        animator.client.run.assert_called_once()
+        assert animator._inflight == {}
+
+    def test_concurrent_different_requests_not_shared(
+        self,
+        mock_replicate_client,
+        mock_requests_get,
+        sample_portrait_bytes
+    ):
+        """Test that overlapping requests with different parameters both run."""
+        animator = FaceAnimator("test_api_key")
+
+        self._animate_while_running(
+            animator, {"expression_scale": 1.0}, {"expression_scale": 1.5},
+            sample_portrait_bytes
+        )
+
+        assert animator.client.run.call_count == 2
+
+    def test_concurrent_identical_request_receives_error(
+        self,
+        mock_replicate_client,
+        sample_portrait_bytes
+    ):
+        """Test that waiting callers get the error of the shared prediction."""
+        animator = FaceAnimator("test_api_key")
+        started = threading.Event()
+        release = threading.Event()
+
+        def run(*args, **kwargs):
+            started.set()
+            release.wait(1)
+            raise ReplicateError("Model error")
+
+        animator.client.run.side_effect = run
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(animator.animate_face, sample_portrait_bytes)
+            started.wait(1)
+            threading.Timer(0.05, release.set).start()
+            with pytest.raises(RuntimeError, match="Face animation failed"):
+                animator.animate_face(sample_portrait_bytes)
+            with pytest.raises(RuntimeError, match="Face animation failed"):
+                first.result()
+
+        animator.client.run.assert_called_once()
+
 
 class TestGlobalFaceAnimator:
     """Test global face animator singleton."""
@@ -263,16 +371,26 @@ class TestGlobalFaceAnimator:
         reset_face_animator()
 
         animator1 = get_face_animator("api_key_1")
-        animator2 = get_face_animator("api_key_2")
+        animator2 = get_face_animator("api_key_1")
 
         # Should return same instance
         assert animator1 is animator2
 
+    def test_get_face_animator_per_api_key(self, mock_replicate_client):
+        """Test that a different API key gets its own animator."""
+        reset_face_animator()
+
+        animator1 = get_face_animator("api_key_1")
+        animator2 = get_face_animator("api_key_2")
+
+        assert animator1 is not animator2
+        assert animator2.api_key == "api_key_2"
+
     def test_reset_face_animator(self, mock_replicate_client):
         """Test resetting global face animator instance."""
         animator1 = get_face_animator("api_key_1")
         reset_face_animator()
-        animator2 = get_face_animator("api_key_2")
+        animator2 = get_face_animator("api_key_1")
 
         # Should be different instances after reset
         assert animator1 is not animator2
@@ -27,11 +27,13 @@ def mock_replicate_client():
 
 @pytest.fixture
 def mock_requests_get():
-    """Mock requests.get for downloading images."""
-    with patch('src.utils.face_restoration.requests.get') as mock_get:
-        mock_response = Mock()
-        mock_response.content = b'enhanced_image_data'
-        mock_response.raise_for_status = Mock()
+    """Mock the download session for downloading images."""
+    with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
+        image = b'enhanced_image_data'
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Length": str(len(image))}
+        mock_response.iter_content.return_value = [image]
         mock_get.return_value = mock_response
         yield mock_get
 
@@ -164,7 +166,7 @@ class TestFaceRestoration:
         mock_client_instance.run.return_value = "https://example.com/enhanced.png"
         mock_replicate_client.return_value = mock_client_instance
 
-        with patch('src.utils.face_restoration.requests.get') as mock_get:
+        with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
             mock_get.side_effect = Exception("Download failed")
 
             restorer = FaceRestoration("test_api_key")
@@ -194,7 +196,26 @@ class TestFaceRestoration:
         assert result == b'enhanced_image_data'
         # Verify JPEG format was detected
         call_args = mock_client_instance.run.call_args
-        assert "image/jpeg" in call_args[1]["input"]["img"]
+        assert call_args[1]["input"]["img"].name == "input.jpg"
+
+    def test_image_sent_as_file_upload(
+        self,
+        mock_replicate_client,
+        mock_requests_get,
+        sample_image_bytes
+    ):
+        """Test that the image is passed as a file instead of a data URI."""
+        mock_client_instance = MagicMock()
+        mock_client_instance.run.return_value = "https://example.com/enhanced.png"
+        mock_replicate_client.return_value = mock_client_instance
+
+        restorer = FaceRestoration("test_api_key")
+        restorer.enhance_faces(sample_image_bytes)
+
+        img = mock_client_instance.run.call_args[1]["input"]["img"]
+        assert isinstance(img, io.BytesIO)
+        assert img.name == "input.png"
+        assert img.getvalue() == sample_image_bytes
 
     def test_enhance_faces_with_custom_weight(
         self,
@@ -225,6 +246,51 @@ class TestFaceRestoration:
         with pytest.raises(ValueError, match="Weight must be between 0 and 1"):
             restorer.enhance_faces(sample_image_bytes, weight=-0.1)
 
+    def test_enhance_faces_batch_preserves_order(self, mock_replicate_client):
+        """Test that batch results line up with their input images."""
+        images = [b"\x89PNG-" + str(i).encode() for i in range(5)]
+
+        def run(model, input):
+            return "https://example.com/" + input["img"].getvalue()[5:].decode()
+
+        def get(url, **kwargs):
+            body = ("enhanced" + url.rsplit("/", 1)[1]).encode()
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.headers = {"Content-Length": str(len(body))}
+            response.iter_content.return_value = [body]
+            return response
+
+        mock_replicate_client.return_value.run.side_effect = run
+        restorer = FaceRestoration("test_api_key")
+
+        with patch('src.utils.download._REQUESTS_SESSION.get', side_effect=get):
+            results = restorer.enhance_faces_batch(images, max_concurrency=3, weight=0.3)
+
+        assert results == [f"enhanced{i}".encode() for i in range(5)]
+        assert mock_replicate_client.return_value.run.call_count == 5
+        assert mock_replicate_client.return_value.run.call_args[1]["input"]["weight"] == 0.3
+
+    def test_enhance_faces_batch_error(self, mock_replicate_client, mock_requests_get, sample_image_bytes):
+        """Test that a failure for any image is raised."""
+        mock_replicate_client.return_value.run.side_effect = [
+            "https://example.com/enhanced.png",
+            ReplicateError("Model error"),
+        ]
+        restorer = FaceRestoration("test_api_key")
+
+        with pytest.raises(RuntimeError, match="Face enhancement failed"):
+            restorer.enhance_faces_batch([sample_image_bytes, sample_image_bytes], max_concurrency=1)
+
+    def test_enhance_faces_batch_invalid_concurrency(self, mock_replicate_client):
+        """Test batch validation and the empty batch."""
+        restorer = FaceRestoration("test_api_key")
+
+        with pytest.raises(ValueError, match="max_concurrency"):
+            restorer.enhance_faces_batch([b"image"], max_concurrency=0)
+
+        assert restorer.enhance_faces_batch([]) == []
+
 
 class TestGlobalFaceRestoration:
     """Test global face restoration singleton."""
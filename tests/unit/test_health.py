@@ -198,6 +198,53 @@ class TestHealthChecker:
 
         assert result.details == {}
 
+    @patch('psutil.cpu_percent')
+    @patch('psutil.virtual_memory')
+    @patch('psutil.disk_usage')
+    def test_check_health_without_details_reports_status(
+        self,
+        mock_disk,
+        mock_memory,
+        mock_cpu
+    ):
+        """Test that a probe without details still reflects resource usage."""
+        mock_cpu.return_value = 20.0
+        mock_memory.return_value = Mock(percent=97.0, available=100000000)
+        mock_disk.return_value = Mock(percent=40.0, free=500000000000)
+
+        checker = HealthChecker()
+        result = checker.check_health(include_details=False)
+
+        assert result.status == HealthStatus.UNHEALTHY
+        assert "memory" in result.message
+        assert result.details == {}
+
+    @patch('psutil.cpu_percent')
+    @patch('psutil.virtual_memory')
+    @patch('psutil.disk_usage')
+    def test_resource_sample_reused_within_ttl(
+        self,
+        mock_disk,
+        mock_memory,
+        mock_cpu
+    ):
+        """Test that checks within the TTL share one non-blocking sample."""
+        mock_cpu.return_value = 20.0
+        mock_memory.return_value = Mock(percent=30.0, available=8000000000, total=16000000000)
+        mock_disk.return_value = Mock(percent=40.0, free=500000000000, total=1000000000000)
+
+        checker = HealthChecker()
+        checker.check_health()
+        checker.get_metrics()
+
+        assert mock_memory.call_count == 1
+        mock_cpu.assert_called_with(interval=None)
+
+        checker.SAMPLE_TTL_SECONDS = 0
+        checker.check_health()
+
+        assert mock_memory.call_count == 2
+
     @patch('psutil.cpu_percent', side_effect=Exception("System error"))
     def test_check_health_error(self, mock_cpu):
         """Test health check handles errors gracefully."""
@@ -340,6 +387,13 @@ class TestHealthChecker:
         assert "1d" in checker._format_uptime(86400)
         assert "2d 3h" in checker._format_uptime(183600)
 
+    def test_format_uptime_fractional_seconds(self):
+        """Test that fractional uptimes in the same second share one result."""
+        checker = HealthChecker()
+
+        assert checker._format_uptime(0.4) == "0s"
+        assert checker._format_uptime(90.2) is checker._format_uptime(90.9)
+
     def test_repr(self):
         """Test string representation."""
         checker = HealthChecker()
@@ -35,7 +35,6 @@ class TestHistoryEntry:
 
         entry = HistoryEntry(
             generated_image=generated,
-            pil_image=test_image,
             index=0
         )
 
@@ -65,7 +64,6 @@ class TestHistoryEntry:
 
         entry = HistoryEntry(
             generated_image=generated,
-            pil_image=test_image,
             index=5
         )
 
@@ -92,7 +90,6 @@ class TestHistoryEntry:
 
         entry = HistoryEntry(
             generated_image=generated,
-            pil_image=test_image,
             index=3
         )
 
@@ -143,6 +140,40 @@ class TestImageHistoryManager:
         assert entry.index == 0
         assert entry.generated_image == generated
         assert isinstance(entry.pil_image, Image.Image)
+        assert entry.pil_image.size == (100, 100)
+
+    def test_add_does_not_keep_decoded_image(self):
+        """Test that entries hold only the encoded image until displayed."""
+        manager = ImageHistoryManager()
+
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (100, 100), color='red').save(img_bytes, format='PNG')
+        generated = GeneratedImage(image_data=img_bytes.getvalue(), prompt="Test", backend="Test")
+
+        entry = manager.add(generated)
+
+        assert "pil_image" not in vars(entry)
+        assert entry.pil_image is not entry.pil_image  # opened on each access
+
+    def test_add_drops_decoded_image_from_backend(self):
+        """Test that a decoded image kept by a backend is not retained."""
+        manager = ImageHistoryManager()
+
+        image = Image.new('RGB', (100, 100), color='red')
+        img_bytes = io.BytesIO()
+        image.save(img_bytes, format='PNG')
+        generated = GeneratedImage(
+            image_data=img_bytes.getvalue(),
+            prompt="Test",
+            backend="Test",
+            pil_image=image
+        )
+
+        entry = manager.add(generated)
+
+        assert entry.generated_image.pil_image is None
+        assert generated.pil_image is image  # caller's result is unchanged
+        assert entry.pil_image.size == (100, 100)
 
     def test_add_multiple_images(self):
         """Test adding multiple images."""
@@ -190,10 +221,13 @@ class TestImageHistoryManager:
         assert manager.history[1].generated_image.prompt == "Test 3"
         assert manager.history[2].generated_image.prompt == "Test 4"
 
-        # Indices should be re-indexed
-        assert manager.history[0].index == 0
-        assert manager.history[1].index == 1
-        assert manager.history[2].index == 2
+        # Entries keep their sequence numbers
+        assert manager.history[0].index == 2
+        assert manager.history[1].index == 3
+        assert manager.history[2].index == 4
+
+        # Lookup is by position
+        assert manager.get_by_index(0) is manager.history[0]
 
     def test_get_all(self):
         """Test getting all history entries."""
@@ -266,6 +300,16 @@ class TestImageHistoryManager:
         assert latest[1].generated_image.prompt == "Test 3"
         assert latest[2].generated_image.prompt == "Test 4"
 
+    def test_get_latest_more_than_available(self):
+        """Test that asking for more entries than exist returns all of them."""
+        manager = ImageHistoryManager()
+        for i in range(2):
+            manager.add(GeneratedImage(image_data=b"img", prompt=f"Test {i}", backend="HuggingFace"))
+
+        latest = manager.get_latest(n=5)
+
+        assert [entry.generated_image.prompt for entry in latest] == ["Test 0", "Test 1"]
+
     def test_get_latest_empty_history(self):
         """Test getting latest from empty history."""
         manager = ImageHistoryManager()
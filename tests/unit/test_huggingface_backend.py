@@ -75,7 +75,10 @@ class TestHuggingFaceBackend:
         assert isinstance(result, GeneratedImage)
         assert result.prompt == "A beautiful sunset"
         assert result.backend == "HuggingFace"
-        assert len(result.image_data) > 0
+        assert result.image_path.exists()
+        assert len(result.get_bytes()) > 0
+        # The public field stays valid for file-backed results
+        assert result.image_data == result.image_path.read_bytes()
         assert result.metadata["model"] == backend.model
         assert result.metadata["guidance_scale"] == 7.5
         assert result.metadata["num_inference_steps"] == 50
@@ -87,6 +90,56 @@ class TestHuggingFaceBackend:
         assert call_kwargs["negative_prompt"] == "blurry"
         assert call_kwargs["guidance_scale"] == 7.5
 
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_to_pil_skips_decode(self, mock_client_class):
+        """Test that to_pil returns the image from the API without decoding the PNG."""
+        from PIL import Image
+
+        fake_image = Image.new('RGB', (64, 64), color='blue')
+        mock_client_class.return_value.text_to_image.return_value = fake_image
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        result = backend.generate_image(GenerationRequest(prompt="test"))
+
+        with patch('src.core.models.Image.open') as mock_open:
+            assert result.to_pil() is fake_image
+        mock_open.assert_not_called()
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_batching_disabled_by_default(self, mock_client_class):
+        """Test that requests call the API directly unless batching is enabled."""
+        from PIL import Image
+
+        mock_client_class.return_value.text_to_image.return_value = Image.new('RGB', (8, 8))
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        result = backend.generate_image(GenerationRequest(prompt="test"))
+
+        assert backend.batcher is None
+        assert result.prompt == "test"
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_batching_opt_in(self, mock_client_class):
+        """Test that a batch window routes requests through the batcher."""
+        backend = HuggingFaceBackend(api_key="test_token", batch_window_ms=20)
+        request = GenerationRequest(prompt="test")
+
+        with patch.object(backend.batcher, 'submit', return_value="batched") as mock_submit:
+            assert backend.generate_image(request) == "batched"
+
+        assert backend.batcher.max_wait_ms == 20
+        mock_submit.assert_called_once_with(request)
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_generate_image_rejects_non_png_format(self, mock_client_class):
+        """Test that JPEG/WEBP requests fail instead of returning PNG."""
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        with pytest.raises(ValueError, match="output_format JPEG"):
+            backend.generate_image(GenerationRequest(prompt="test", output_format="JPEG"))
+
+        mock_client_class.return_value.text_to_image.assert_not_called()
+
     @patch('src.backends.huggingface.InferenceClient')
     def test_generate_image_401_error(self, mock_client_class):
         """Test handling of 401 authentication error."""
@@ -160,31 +213,49 @@ class TestHuggingFaceBackend:
         with pytest.raises(RuntimeError, match="Failed to generate image"):
             backend.generate_image(request)
 
-    @patch('src.backends.huggingface.model_info')
+    @patch('src.backends.huggingface.HfApi')
     @patch('src.backends.huggingface.InferenceClient')
-    def test_health_check_success(self, mock_client_class, mock_model_info):
+    def test_health_check_success(self, mock_client_class, mock_hf_api_class):
         """Test successful health check."""
         mock_client_class.return_value = Mock()
-        mock_model_info.return_value = {"modelId": "test-model"}
+        mock_hf_api = mock_hf_api_class.return_value
+        mock_hf_api.model_info.return_value = {"modelId": "test-model"}
 
         backend = HuggingFaceBackend(api_key="test_token")
         result = backend.health_check()
 
         assert result is True
-        mock_model_info.assert_called_once_with(backend.model, token=backend.api_key)
+        mock_hf_api_class.assert_called_once_with(token=backend.api_key)
+        mock_hf_api.model_info.assert_called_once_with(backend.model)
 
-    @patch('src.backends.huggingface.model_info')
+    @patch('src.backends.huggingface.HfApi')
     @patch('src.backends.huggingface.InferenceClient')
-    def test_health_check_failure(self, mock_client_class, mock_model_info):
+    def test_health_check_failure(self, mock_client_class, mock_hf_api_class):
         """Test failed health check."""
         mock_client_class.return_value = Mock()
-        mock_model_info.side_effect = Exception("Connection error")
+        mock_hf_api_class.return_value.model_info.side_effect = Exception("Connection error")
 
         backend = HuggingFaceBackend(api_key="test_token")
         result = backend.health_check()
 
         assert result is False
 
+    @patch('src.backends.huggingface.HfApi')
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_health_check_is_cached(self, mock_client_class, mock_hf_api_class):
+        """Test that repeated health checks within the TTL reuse the result."""
+        mock_hf_api = mock_hf_api_class.return_value
+
+        backend = HuggingFaceBackend(api_key="test_token")
+        assert backend.health_check() is True
+        assert backend.health_check() is True
+        assert mock_hf_api.model_info.call_count == 1
+
+        # Switching model invalidates the cached result
+        backend.set_model("runwayml/stable-diffusion-v1-5")
+        backend.health_check()
+        assert mock_hf_api.model_info.call_count == 2
+
     @patch('src.backends.huggingface.InferenceClient')
     def test_set_model(self, mock_client_class):
         """Test changing the model."""
@@ -209,3 +280,69 @@ class TestHuggingFaceBackend:
 
         assert "HuggingFaceBackend" in repr_str
         assert "HuggingFace" in repr_str
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_warm_up_runs_in_background(self, mock_client_class):
+        """Test that warm_up does not block and calls the API off-thread."""
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        with patch('src.backends.huggingface.threading.Thread') as mock_thread_class:
+            backend.warm_up()
+
+        mock_thread_class.assert_called_once()
+        assert mock_thread_class.call_args[1]["daemon"] is True
+        mock_thread_class.return_value.start.assert_called_once()
+        mock_client_class.return_value.text_to_image.assert_not_called()
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_warm_up_request(self, mock_client_class):
+        """Test the warm-up request and that its errors are swallowed."""
+        mock_client = mock_client_class.return_value
+        mock_client.text_to_image.side_effect = Exception("cold start timeout")
+
+        backend = HuggingFaceBackend(api_key="test_token")
+        backend._warm_up()
+
+        call_kwargs = mock_client.text_to_image.call_args[1]
+        assert call_kwargs["model"] == backend.model
+        assert call_kwargs["num_inference_steps"] == 1
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_image_file_removed_with_result(self, mock_client_class):
+        """Test that the temp PNG is deleted once the result is released."""
+        import gc
+        from PIL import Image
+
+        mock_client_class.return_value.text_to_image.return_value = Image.new('RGB', (64, 64))
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        result = backend._generate_single(GenerationRequest(prompt="test"))
+        image_path = result.image_path
+        assert image_path.exists()
+
+        del result
+        gc.collect()
+
+        assert not image_path.exists()
+
+    @patch('src.backends.huggingface.InferenceClient')
+    def test_image_file_kept_while_copies_exist(self, mock_client_class):
+        """Test that model_copy copies keep the temp PNG alive."""
+        import gc
+        from PIL import Image
+
+        mock_client_class.return_value.text_to_image.return_value = Image.new('RGB', (64, 64))
+        backend = HuggingFaceBackend(api_key="test_token")
+
+        result = backend._generate_single(GenerationRequest(prompt="test"))
+        copy = result.model_copy(update={"prompt": "copy"})
+        image_path = result.image_path
+
+        del result
+        gc.collect()
+        assert image_path.exists()
+        assert copy.to_pil().size == (64, 64)
+
+        del copy
+        gc.collect()
+        assert not image_path.exists()
@@ -5,10 +5,45 @@ from unittest.mock import Mock, patch
 from PIL import Image
 import io
 
+from src.core.base_backend import BaseBackend
 from src.core.image_generator import ImageGenerator
 from src.core.models import GenerationRequest, GeneratedImage
 
 
+@pytest.fixture(autouse=True)
+def no_retry_sleep():
+    """Skip real backoff delays between retries."""
+    with patch('src.core.image_generator.time.sleep'):
+        yield
+
+
+def _raise(error):
+    raise error
+
+
+class _SequentialBackend(BaseBackend):
+    """Backend using the default one-request-at-a-time generate_images."""
+
+    def __init__(self, name):
+        super().__init__()
+        self._name = name
+        self.generate = Mock()
+
+    def generate_image(self, request):
+        return self.generate(request)
+
+    def health_check(self):
+        return True
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def supported_models(self):
+        return []
+
+
 class TestImageGenerator:
     """Tests for ImageGenerator."""
 
@@ -134,6 +169,38 @@ class TestImageGenerator:
         # Fallback should not be called
         fallback.generate_image.assert_not_called()
 
+    @patch('src.core.image_generator.time.sleep')
+    def test_retry_backoff_with_jitter(self, mock_sleep):
+        """Test that transient failures are retried with jittered backoff."""
+        primary = Mock()
+        primary.name = "Primary"
+        fake_result = GeneratedImage(image_data=b"fake", prompt="test", backend="Primary")
+        primary.generate_image.side_effect = [RuntimeError("busy"), RuntimeError("busy"), fake_result]
+
+        generator = ImageGenerator(primary)
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result == fake_result
+        assert primary.generate_image.call_count == 3
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert 2 <= delays[0] < 3
+        assert 4 <= delays[1] < 5
+
+    @patch('src.core.image_generator.time.sleep')
+    def test_connection_error_not_retried(self, mock_sleep):
+        """Test that authentication errors are raised without retrying."""
+        primary = Mock()
+        primary.name = "Primary"
+        primary.generate_image.side_effect = ConnectionError("bad token")
+
+        generator = ImageGenerator(primary)
+
+        with pytest.raises(ConnectionError):
+            generator.generate_image(GenerationRequest(prompt="test"))
+
+        primary.generate_image.assert_called_once()
+        mock_sleep.assert_not_called()
+
     def test_health_check_all(self):
         """Test health checking all backends."""
         primary = Mock()
@@ -153,6 +220,28 @@ class TestImageGenerator:
             "Fallback": False
         }
 
+    def test_health_check_all_runs_concurrently(self):
+        """Test that backends are probed in parallel."""
+        import threading
+
+        barrier = threading.Barrier(2, timeout=2)
+
+        def probe():
+            barrier.wait()  # Deadlocks (and times out) if probes run serially
+            return True
+
+        primary = Mock()
+        primary.name = "Primary"
+        primary.health_check.side_effect = probe
+
+        fallback = Mock()
+        fallback.name = "Fallback"
+        fallback.health_check.side_effect = probe
+
+        generator = ImageGenerator(primary, [fallback])
+
+        assert generator.health_check_all() == {"Primary": True, "Fallback": True}
+
     def test_get_backend_names(self):
         """Test getting backend names."""
         primary = Mock()
@@ -173,6 +262,25 @@ class TestImageGenerator:
             "fallbacks": ["Fallback1", "Fallback2"]
         }
 
+    def test_backend_names_follow_swapped_backends(self):
+        """Test that cached names are refreshed when backends are replaced."""
+        primary = Mock()
+        primary.name = "Primary"
+        generator = ImageGenerator(primary)
+
+        temp = Mock()
+        temp.name = "Temp"
+        fallback = Mock()
+        fallback.name = "Fallback"
+        generator.primary_backend = temp
+        generator.fallback_backends = [fallback]
+
+        assert generator.primary_backend is temp
+        assert generator.get_backend_names() == {
+            "primary": "Temp",
+            "fallbacks": ["Fallback"]
+        }
+
     def test_multiple_fallbacks(self):
         """Test with multiple fallback backends."""
         primary = Mock()
@@ -202,3 +310,420 @@ class TestImageGenerator:
         primary.generate_image.assert_called()
         fallback1.generate_image.assert_called()
         fallback2.generate_image.assert_called()
+
+
+class TestImageGeneratorSemanticCache:
+    """Tests for ImageGenerator with a semantic cache."""
+
+    def test_cache_hit_skips_backend(self):
+        """Test that an equivalent prompt is served without a backend call."""
+        from src.core.semantic_cache import SemanticCache
+
+        primary = Mock()
+        primary.name = "Primary"
+        primary.generate_image.return_value = GeneratedImage(
+            image_data=b"fake_image", prompt="A red cat", backend="Primary"
+        )
+
+        generator = ImageGenerator(primary, semantic_cache=SemanticCache())
+        generator.generate_image(GenerationRequest(prompt="A red cat", seed=7))
+        result = generator.generate_image(GenerationRequest(prompt="a red cat.", seed=7))
+
+        primary.generate_image.assert_called_once()
+        assert result.image_data == b"fake_image"
+        assert result.metadata["cache_hit"] is True
+        assert result.metadata["source_prompt"] == "A red cat"
+
+    def test_resume_from_cached_latents(self):
+        """Test that a similar prompt resumes from the primary's cached latents."""
+        from src.core.semantic_cache import SemanticCache
+
+        primary = Mock()
+        primary.name = "Primary"
+        cached = GeneratedImage(image_data=b"cat", prompt="A red cat", backend="Primary")
+        cached.latents = {2: "latents"}
+        primary.generate_image.return_value = cached
+        primary.resume_from_latents.return_value = GeneratedImage(
+            image_data=b"dog", prompt="A red dog", backend="Primary"
+        )
+
+        cache = SemanticCache(embed_fn=lambda text: [1.0, 0.0] if "cat" in text else [0.94, 0.34])
+        generator = ImageGenerator(primary, semantic_cache=cache)
+        generator.generate_image(GenerationRequest(prompt="A red cat", seed=7))
+        result = generator.generate_image(GenerationRequest(prompt="A red dog", seed=7))
+
+        assert result.image_data == b"dog"
+        primary.generate_image.assert_called_once()
+        args = primary.resume_from_latents.call_args[0]
+        assert args[1:] == ("latents", 2)
+
+
+class TestImageGeneratorBatching:
+    """Tests for batched generation in ImageGenerator."""
+
+    def _make_primary(self):
+        primary = Mock()
+        primary.name = "Primary"
+        primary.generate_image.side_effect = lambda r: GeneratedImage(
+            image_data=b"fake", prompt=r.prompt, backend="Primary"
+        )
+        primary.generate_images.side_effect = lambda reqs: [
+            GeneratedImage(image_data=b"fake", prompt=r.prompt, backend="Primary")
+            for r in reqs
+        ]
+        return primary
+
+    def test_generate_images_single_backend_call(self):
+        """Test that all requests go to the primary backend in one call."""
+        primary = self._make_primary()
+        generator = ImageGenerator(primary)
+        requests = [GenerationRequest(prompt=p) for p in ["a", "b", "c"]]
+
+        results = generator.generate_images(requests)
+
+        assert [r.prompt for r in results] == ["a", "b", "c"]
+        primary.generate_images.assert_called_once_with(requests)
+
+    def test_generate_images_skips_cache_hits(self):
+        """Test that cached requests are not sent to the backend."""
+        from src.core.semantic_cache import SemanticCache
+
+        primary = self._make_primary()
+        generator = ImageGenerator(primary, semantic_cache=SemanticCache())
+        generator.generate_images([GenerationRequest(prompt="a", seed=1)])
+
+        results = generator.generate_images([
+            GenerationRequest(prompt="a", seed=1),
+            GenerationRequest(prompt="b", seed=1),
+            GenerationRequest(prompt="c", seed=1),
+        ])
+
+        assert results[0].metadata["cache_hit"] is True
+        assert [r.prompt for r in primary.generate_images.call_args[0][0]] == ["b", "c"]
+
+    def test_generate_images_falls_back_per_request(self):
+        """Test that a failed batch is retried request by request."""
+        primary = self._make_primary()
+        primary.generate_images.side_effect = RuntimeError("out of memory")
+        generator = ImageGenerator(primary)
+
+        results = generator.generate_images([GenerationRequest(prompt=p) for p in ["a", "b"]])
+
+        assert [r.prompt for r in results] == ["a", "b"]
+        assert primary.generate_image.call_count == 2
+
+    def test_generate_images_per_request_on_sequential_backend(self):
+        """Test that one failure neither regenerates nor discards other images."""
+        primary = _SequentialBackend("Primary")
+        primary.generate.side_effect = lambda r: (
+            _raise(RuntimeError("NSFW")) if r.prompt == "b" else
+            GeneratedImage(image_data=b"fake", prompt=r.prompt, backend="Primary")
+        )
+        generator = ImageGenerator(primary)
+        progress = []
+
+        results = generator.generate_images(
+            [GenerationRequest(prompt=p) for p in ["a", "b", "c"]],
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        assert [r and r.prompt for r in results] == ["a", None, "c"]
+        # "b" is retried on its own; "a" and "c" are generated once each
+        prompts = [call.args[0].prompt for call in primary.generate.call_args_list]
+        assert prompts.count("a") == 1
+        assert prompts.count("c") == 1
+        assert prompts.count("b") == generator.RETRY_ATTEMPTS
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    def test_generate_images_falls_back_for_failed_request_only(self):
+        """Test that only the failed request goes to the fallback backend."""
+        primary = _SequentialBackend("Primary")
+        primary.generate.side_effect = lambda r: (
+            _raise(RuntimeError("API down")) if r.prompt == "b" else
+            GeneratedImage(image_data=b"fake", prompt=r.prompt, backend="Primary")
+        )
+        fallback = _SequentialBackend("Fallback")
+        fallback.generate.side_effect = lambda r: GeneratedImage(
+            image_data=b"fake", prompt=r.prompt, backend="Fallback"
+        )
+        generator = ImageGenerator(primary, [fallback], route_by_latency=False)
+
+        results = generator.generate_images([GenerationRequest(prompt=p) for p in ["a", "b"]])
+
+        assert [r.backend for r in results] == ["Primary", "Fallback"]
+        assert fallback.generate.call_count == 1
+
+    def test_generate_images_auth_error_raises(self):
+        """Test that an authentication error on the primary aborts the batch."""
+        primary = _SequentialBackend("Primary")
+        primary.generate.side_effect = ConnectionError("Invalid token")
+        generator = ImageGenerator(primary)
+
+        with pytest.raises(ConnectionError):
+            generator.generate_images([GenerationRequest(prompt=p) for p in ["a", "b"]])
+
+        assert primary.generate.call_count == 1
+
+    def test_batch_window_coalesces_concurrent_requests(self):
+        """Test that concurrent generate_image calls share one batched call."""
+        import threading
+
+        primary = self._make_primary()
+        generator = ImageGenerator(primary, batch_window_ms=200)
+        results = {}
+
+        def worker(prompt):
+            results[prompt] = generator.generate_image(GenerationRequest(prompt=prompt))
+
+        threads = [threading.Thread(target=worker, args=(p,)) for p in ["a", "b"]]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert results["a"].prompt == "a"
+        assert results["b"].prompt == "b"
+        primary.generate_images.assert_called_once()
+        primary.generate_image.assert_not_called()
+
+
+class TestImageGeneratorRouting:
+    """Tests for latency routing and circuit breaking."""
+
+    def _make_backend(self, name):
+        backend = Mock()
+        backend.name = name
+        backend.generate_image.side_effect = lambda r: GeneratedImage(
+            image_data=b"fake", prompt=r.prompt, backend=name
+        )
+        return backend
+
+    def test_routes_to_lowest_latency_backend(self):
+        """Test that a measured faster fallback is tried first."""
+        primary = self._make_backend("Primary")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback])
+
+        generator._record_success(primary, 5.0)
+        generator._record_success(fallback, 1.0)
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result.backend == "Fallback"
+        primary.generate_image.assert_not_called()
+
+    def test_unmeasured_backends_keep_configured_order(self):
+        """Test that the primary is tried first until a fallback is measured."""
+        primary = self._make_backend("Primary")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback])
+
+        assert generator._route([primary, fallback]) == [primary, fallback]
+
+    def test_recovered_primary_is_tried_before_measured_fallback(self):
+        """Test that a primary that failed before ever succeeding is retried first."""
+        primary = self._make_backend("Primary")
+        primary.generate_image.side_effect = RuntimeError("API down")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback])
+
+        for _ in range(generator.CIRCUIT_FAILURE_THRESHOLD):
+            assert generator.generate_image(GenerationRequest(prompt="test")).backend == "Fallback"
+
+        # The primary recovers and its circuit cooldown ends
+        primary.generate_image.side_effect = lambda r: GeneratedImage(
+            image_data=b"fake", prompt=r.prompt, backend="Primary"
+        )
+        generator._stats_for(primary).opened_at -= generator.CIRCUIT_COOLDOWN_SECONDS
+
+        assert generator.generate_image(GenerationRequest(prompt="test")).backend == "Primary"
+        assert generator._stats_for(primary).latency_ewma is not None
+
+    def test_slower_backends_are_probed_periodically(self):
+        """Test that a slower backend is still tried first every probe interval."""
+        primary = self._make_backend("Primary")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback])
+
+        generator._record_success(primary, 5.0)
+        generator._record_success(fallback, 1.0)
+        orders = [
+            generator._route([primary, fallback])
+            for _ in range(2 * generator.LATENCY_PROBE_INTERVAL)
+        ]
+
+        assert sum(order[0] is primary for order in orders) == 2
+        assert orders[generator.LATENCY_PROBE_INTERVAL - 1] == [primary, fallback]
+        assert orders[0] == [fallback, primary]
+
+    def test_latency_routing_disabled(self):
+        """Test that the configured order is kept when routing is off."""
+        primary = self._make_backend("Primary")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], route_by_latency=False)
+
+        generator._record_success(primary, 5.0)
+        generator._record_success(fallback, 1.0)
+
+        assert generator._route([primary, fallback]) == [primary, fallback]
+
+    def test_latency_ewma(self):
+        """Test that latency is tracked as an exponentially weighted average."""
+        primary = self._make_backend("Primary")
+        generator = ImageGenerator(primary)
+
+        generator._record_success(primary, 10.0)
+        generator._record_success(primary, 0.0)
+
+        assert generator._stats_for(primary).latency_ewma == pytest.approx(8.0)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test that a failing backend is skipped until the cooldown ends."""
+        primary = self._make_backend("Primary")
+        primary.generate_image.side_effect = RuntimeError("API down")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], route_by_latency=False)
+
+        for _ in range(generator.CIRCUIT_FAILURE_THRESHOLD):
+            generator.generate_image(GenerationRequest(prompt="test"))
+        calls = primary.generate_image.call_count
+
+        generator.generate_image(GenerationRequest(prompt="test"))
+        assert primary.generate_image.call_count == calls
+
+        # Half-open after the cooldown: the primary gets a trial request
+        generator._stats_for(primary).opened_at -= generator.CIRCUIT_COOLDOWN_SECONDS
+        primary.generate_image.side_effect = None
+        primary.generate_image.return_value = GeneratedImage(
+            image_data=b"fake", prompt="test", backend="Primary"
+        )
+
+        assert generator.generate_image(GenerationRequest(prompt="test")).backend == "Primary"
+        assert generator._stats_for(primary).opened_at is None
+
+
+class TestImageGeneratorHedging:
+    """Tests for hedged requests across backends."""
+
+    def _make_backend(self, name, delay=0.0):
+        import threading
+
+        def generate(request):
+            # time.sleep is patched out by the no_retry_sleep fixture
+            threading.Event().wait(delay)
+            return GeneratedImage(image_data=b"fake", prompt=request.prompt, backend=name)
+
+        backend = Mock()
+        backend.name = name
+        backend.generate_image.side_effect = generate
+        return backend
+
+    def test_slow_primary_is_hedged(self):
+        """Test that a fast fallback wins when the primary is slow."""
+        primary = self._make_backend("Primary", delay=0.5)
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], hedge_delay_ms=20)
+
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result.backend == "Fallback"
+        fallback.generate_image.assert_called_once()
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test that no backup request is sent when the primary is fast."""
+        primary = self._make_backend("Primary")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], hedge_delay_ms=500)
+
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result.backend == "Primary"
+        fallback.generate_image.assert_not_called()
+
+    def test_hedged_primary_auth_error_raises(self):
+        """Test that authentication errors still short-circuit with hedging."""
+        primary = self._make_backend("Primary")
+        primary.generate_image.side_effect = ConnectionError("bad token")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], hedge_delay_ms=500)
+
+        with pytest.raises(ConnectionError, match="bad token"):
+            generator.generate_image(GenerationRequest(prompt="test"))
+
+        fallback.generate_image.assert_not_called()
+
+    def test_failed_primary_falls_back_with_hedging(self):
+        """Test that a fast primary failure falls through to the fallback."""
+        primary = self._make_backend("Primary")
+        primary.generate_image.side_effect = RuntimeError("API down")
+        fallback = self._make_backend("Fallback")
+        generator = ImageGenerator(primary, [fallback], hedge_delay_ms=500)
+
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result.backend == "Fallback"
+
+    def test_failed_hedge_starts_next_backend_immediately(self):
+        """Test that a failing backup is replaced without another hedge delay."""
+        import time
+
+        primary = self._make_backend("Primary", delay=1.0)
+        fallback1 = self._make_backend("Fallback1")
+        fallback1.generate_image.side_effect = RuntimeError("API down")
+        fallback2 = self._make_backend("Fallback2")
+        generator = ImageGenerator(primary, [fallback1, fallback2], hedge_delay_ms=300)
+
+        start = time.monotonic()
+        result = generator.generate_image(GenerationRequest(prompt="test"))
+
+        assert result.backend == "Fallback2"
+        assert time.monotonic() - start < 0.55
+
+    def test_all_hedged_backends_fail(self):
+        """Test that the usual error is raised when every raced backend fails."""
+        primary = self._make_backend("Primary")
+        primary.generate_image.side_effect = RuntimeError("API down")
+        fallback = self._make_backend("Fallback")
+        fallback.generate_image.side_effect = RuntimeError("API down")
+        generator = ImageGenerator(primary, [fallback], hedge_delay_ms=50)
+
+        with pytest.raises(RuntimeError, match="All backends failed"):
+            generator.generate_image(GenerationRequest(prompt="test"))
+
+
+class TestImageGeneratorSharedCache:
+    """Tests for ImageGenerator with a Redis image cache."""
+
+    def _make_backend(self, name):
+        backend = Mock()
+        backend.name = name
+        backend.generate_image.side_effect = lambda r: GeneratedImage(
+            image_data=b"fake", prompt=r.prompt, backend=name
+        )
+        return backend
+
+    def test_redis_cache_hit_skips_backend(self):
+        """Test that a shared-cache hit is returned without a backend call."""
+        primary = self._make_backend("Primary")
+        image_cache = Mock()
+        image_cache.get.return_value = GeneratedImage(
+            image_data=b"cached", prompt="test", backend="Primary"
+        )
+        generator = ImageGenerator(primary, image_cache=image_cache)
+
+        result = generator.generate_image(GenerationRequest(prompt="test", seed=1))
+
+        assert result.image_data == b"cached"
+        primary.generate_image.assert_not_called()
+        image_cache.set.assert_not_called()
+
+    def test_redis_cache_stores_new_images(self):
+        """Test that generated images are written to the shared cache."""
+        primary = self._make_backend("Primary")
+        image_cache = Mock()
+        image_cache.get.return_value = None
+        generator = ImageGenerator(primary, image_cache=image_cache)
+        request = GenerationRequest(prompt="test", seed=1)
+
+        result = generator.generate_image(request)
+
+        image_cache.set.assert_called_once_with(request, result)
@@ -4,16 +4,24 @@ import pytest
 from unittest.mock import Mock, patch
 from PIL import Image
 import io
+import json
 from datetime import datetime
 
 from src.utils.image_utils import (
     ImageFormat,
     add_metadata_to_image,
+    encode_png,
+    encode_image,
+    encode_image_buffer,
+    image_upload,
+    save_png_tempfile,
+    sniff_mime_type,
     create_downloadable_image,
     extract_metadata_from_image,
     get_image_info
 )
 from src.core.models import GeneratedImage
+from src.utils import image_utils
 
 
 class TestImageFormat:
@@ -26,6 +34,145 @@ class TestImageFormat:
         assert ImageFormat.WEBP == "WEBP"
 
 
+class TestEncodePng:
+    """Tests for encode_png function."""
+
+    def test_encode_png_roundtrip(self):
+        """Test that encoded bytes decode back to the same pixels."""
+        image = Image.new('RGB', (64, 32), color=(10, 20, 30))
+
+        result = encode_png(image)
+
+        assert isinstance(result, bytes)
+        assert result.startswith(b'\x89PNG')
+
+        decoded = Image.open(io.BytesIO(result))
+        assert decoded.size == (64, 32)
+        assert decoded.getpixel((0, 0)) == (10, 20, 30)
+
+    def test_encode_png_rgba(self):
+        """Test that alpha channel is preserved."""
+        image = Image.new('RGBA', (16, 16), color=(255, 0, 0, 128))
+
+        decoded = Image.open(io.BytesIO(encode_png(image)))
+
+        assert decoded.mode == 'RGBA'
+        assert decoded.getpixel((0, 0)) == (255, 0, 0, 128)
+
+
+class TestEncodeImage:
+    """Tests for encode_image function."""
+
+    @pytest.mark.parametrize("format", [ImageFormat.PNG, ImageFormat.JPEG, ImageFormat.WEBP])
+    def test_encode_image_formats(self, format):
+        """Test encoding to each supported format."""
+        image = Image.new('RGB', (32, 32), color='green')
+
+        decoded = Image.open(io.BytesIO(encode_image(image, format)))
+
+        assert decoded.format == format
+        assert decoded.size == (32, 32)
+
+    def test_encode_image_jpeg_drops_alpha(self):
+        """Test that RGBA images are converted for JPEG."""
+        image = Image.new('RGBA', (16, 16), color=(255, 0, 0, 128))
+
+        decoded = Image.open(io.BytesIO(encode_image(image, ImageFormat.JPEG)))
+
+        assert decoded.mode == 'RGB'
+
+    def test_encode_image_invalid_format(self):
+        """Test that unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported image format"):
+            encode_image(Image.new('RGB', (8, 8)), "BMP")
+
+    def test_encode_image_buffer_matches_encode_image(self):
+        """Test that the zero-copy variant returns the same encoded data."""
+        image = Image.new('RGB', (32, 32), color='green')
+
+        view = encode_image_buffer(image, ImageFormat.PNG)
+
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view.tobytes() == encode_image(image, ImageFormat.PNG)
+
+
+class TestImageUpload:
+    """Tests for image_upload function."""
+
+    @pytest.mark.parametrize("format,name", [
+        (ImageFormat.PNG, "portrait.png"),
+        (ImageFormat.JPEG, "portrait.jpg"),
+        (ImageFormat.WEBP, "portrait.webp"),
+    ])
+    def test_named_after_format(self, format, name):
+        """Test that the file name extension matches the image format."""
+        data = encode_image(Image.new('RGB', (8, 8)), format)
+
+        upload = image_upload(data, "portrait")
+
+        assert upload.name == name
+        assert upload.read() == data
+
+    def test_unknown_format_named_png(self):
+        """Test that unrecognized bytes default to a .png name."""
+        assert image_upload(b"unknown").name == "image.png"
+
+
+class TestSniffMimeType:
+    """Tests for sniff_mime_type function."""
+
+    @pytest.mark.parametrize("format,mime_type", [
+        ("PNG", "image/png"),
+        ("JPEG", "image/jpeg"),
+        ("WEBP", "image/webp"),
+        ("GIF", "image/gif"),
+    ])
+    def test_sniff_known_formats(self, format, mime_type):
+        """Test detection of supported upload formats."""
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (8, 8)).save(img_bytes, format=format)
+
+        assert sniff_mime_type(img_bytes.getvalue()) == mime_type
+
+    def test_sniff_unknown_format(self):
+        """Test that unknown data returns None."""
+        assert sniff_mime_type(b"BM\x00\x00") is None
+        assert sniff_mime_type(b"") is None
+
+    def test_sniff_other_riff_containers(self):
+        """Test that RIFF files other than WebP are not reported as images."""
+        assert sniff_mime_type(b"RIFF\x24\x00\x00\x00WAVEfmt ") is None
+        assert sniff_mime_type(b"RIFF\x24\x00\x00\x00AVI LIST") is None
+        assert sniff_mime_type(b"RIFX\x24\x00\x00\x00WEBPVP8 ") is None
+        assert sniff_mime_type(b"RIFF\x24\x00\x00\x00WEBPVP8 ") == "image/webp"
+
+    def test_sniff_buffer_types(self):
+        """Test that bytearray and memoryview data are detected too."""
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (8, 8)).save(img_bytes, format="PNG")
+
+        assert sniff_mime_type(bytearray(img_bytes.getvalue())) == "image/png"
+        assert sniff_mime_type(img_bytes.getbuffer()) == "image/png"
+
+
+class TestSavePngTempfile:
+    """Tests for save_png_tempfile function."""
+
+    def test_save_png_tempfile(self):
+        """Test that the image is written to a PNG file on disk."""
+        image = Image.new('RGB', (64, 32), color=(10, 20, 30))
+
+        path = save_png_tempfile(image)
+        try:
+            assert path.suffix == '.png'
+            with Image.open(path) as decoded:
+                assert decoded.size == (64, 32)
+                assert decoded.getpixel((0, 0)) == (10, 20, 30)
+        finally:
+            path.unlink()
+
+
 class TestAddMetadataToImage:
     """Tests for add_metadata_to_image function."""
 
@@ -48,6 +195,46 @@ class TestAddMetadataToImage:
         result_image = Image.open(io.BytesIO(result))
         assert result_image.format == "PNG"
 
+    def test_add_metadata_png_text_chunks(self):
+        """Test that only common fields get their own chunk next to the JSON."""
+        image = Image.new('RGB', (8, 8), color='red')
+        metadata = {"prompt": "test prompt", "backend": "HuggingFace", "seed": 42, "model": None}
+
+        result = add_metadata_to_image(image, metadata, ImageFormat.PNG)
+
+        info = Image.open(io.BytesIO(result)).info
+        assert info["prompt"] == "test prompt"
+        assert info["backend"] == "HuggingFace"
+        assert "seed" not in info
+        assert json.loads(info["metadata_json"]) == metadata
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_add_metadata_png_json_fallbacks(self, use_orjson):
+        """Test metadata JSON with and without orjson, including non-JSON values."""
+        image = Image.new('RGB', (8, 8), color='red')
+        timestamp = datetime(2025, 1, 1, 12, 0, 0)
+
+        with patch('src.utils.image_utils.orjson', image_utils.orjson if use_orjson else None):
+            dumped = [
+                add_metadata_to_image(image, metadata, ImageFormat.PNG)
+                for metadata in ({"timestamp": timestamp}, {1: "int key"})
+            ]
+
+        info = [Image.open(io.BytesIO(result)).info for result in dumped]
+        assert json.loads(info[0]["metadata_json"]) == {"timestamp": str(timestamp)}
+        assert json.loads(info[1]["metadata_json"]) == {"1": "int key"}
+
+    def test_add_metadata_png_compress_level(self):
+        """Test that the PNG compression level is passed to the encoder."""
+        image = Image.new('RGB', (100, 100), color='red')
+
+        with patch.object(Image.Image, 'save') as mock_save:
+            add_metadata_to_image(image, {"prompt": "test"}, ImageFormat.PNG)
+            add_metadata_to_image(image, {"prompt": "test"}, ImageFormat.PNG, compress_level=9)
+
+        assert mock_save.call_args_list[0].kwargs["compress_level"] == 1
+        assert mock_save.call_args_list[1].kwargs["compress_level"] == 9
+
     def test_add_metadata_jpeg(self):
         """Test adding metadata to JPEG image."""
         image = Image.new('RGB', (100, 100), color='blue')
@@ -86,6 +273,29 @@ class TestAddMetadataToImage:
         result_image = Image.open(io.BytesIO(result))
         assert result_image.mode == "RGB"
 
+    def test_transparent_pixels_composited_on_white(self):
+        """Test that transparent pixels become white in JPEG output."""
+        image = Image.new('RGBA', (16, 16), color=(0, 0, 0, 0))
+
+        result = add_metadata_to_image(image, {}, ImageFormat.JPEG)
+
+        r, g, b = Image.open(io.BytesIO(result)).getpixel((8, 8))
+        assert min(r, g, b) > 245
+
+    def test_palette_to_jpeg_conversion(self):
+        """Test that palette images, with and without transparency, save as JPEG."""
+        opaque = Image.new('RGB', (16, 16), color='blue').convert('P')
+        transparent = opaque.copy()
+        transparent.info['transparency'] = opaque.getpixel((0, 0))
+
+        for image in (opaque, transparent):
+            result = add_metadata_to_image(image, {}, ImageFormat.JPEG)
+            assert Image.open(io.BytesIO(result)).mode == "RGB"
+
+        # The only palette entry is transparent, so the result is white
+        r, g, b = Image.open(io.BytesIO(result)).getpixel((8, 8))
+        assert min(r, g, b) > 245
+
 
 class TestCreateDownloadableImage:
     """Tests for create_downloadable_image function."""
@@ -172,6 +382,19 @@ class TestCreateDownloadableImage:
         assert "*" not in filename
         assert "?" not in filename
 
+    def test_filename_keeps_non_ascii_letters(self):
+        """Test that non-ASCII letters are kept and other symbols replaced."""
+        generated = GeneratedImage(
+            image_data=b"",
+            prompt="Café 猫/🐱",
+            backend="HuggingFace",
+            pil_image=Image.new('RGB', (8, 8))
+        )
+
+        _, filename = create_downloadable_image(generated, ImageFormat.PNG)
+
+        assert filename.endswith("_Café_猫__.png")
+
     def test_prompt_truncation(self):
         """Test that long prompts are truncated in filename."""
         test_image = Image.new('RGB', (100, 100), color='red')
@@ -225,6 +448,50 @@ class TestExtractMetadataFromImage:
         # Should return None or empty dict
         assert extracted is None or len(extracted) == 0
 
+    def test_extract_png_metadata_without_decoding(self):
+        """Test that PNG metadata is read from the header without loading pixels."""
+        image = Image.new('RGB', (100, 100), color='red')
+        img_bytes = add_metadata_to_image(image, {"prompt": "test prompt"}, ImageFormat.PNG)
+
+        with patch('PIL.PngImagePlugin.PngImageFile.load') as mock_load:
+            extracted = extract_metadata_from_image(img_bytes)
+
+        assert extracted["prompt"] == "test prompt"
+        mock_load.assert_not_called()
+
+    def test_extract_png_text_after_image_data(self):
+        """Test that text chunks stored after the pixel data are still found."""
+        import struct
+        import zlib
+
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (16, 16)).save(img_bytes, format='PNG')
+        data = img_bytes.getvalue()
+
+        # Insert a tEXt chunk between IDAT and IEND
+        text = b"prompt\0late prompt"
+        chunk = (
+            struct.pack(">I", len(text)) + b"tEXt" + text
+            + struct.pack(">I", zlib.crc32(b"tEXt" + text))
+        )
+        iend = data.rindex(b"IEND") - 4
+        data = data[:iend] + chunk + data[iend:]
+
+        assert extract_metadata_from_image(data) == {"prompt": "late prompt"}
+
+    def test_extract_jpeg_exif(self):
+        """Test extracting EXIF tags, including the Exif sub-IFD, from a JPEG."""
+        exif = Image.Exif()
+        exif[0x0131] = "generator"  # Software
+        exif.get_ifd(0x8769)[0x9003] = "2025:01:01 12:00:00"  # DateTimeOriginal
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (16, 16)).save(img_bytes, format='JPEG', exif=exif)
+
+        extracted = extract_metadata_from_image(img_bytes.getvalue())
+
+        assert extracted["Software"] == "generator"
+        assert extracted["DateTimeOriginal"] == "2025:01:01 12:00:00"
+
     def test_extract_invalid_image(self):
         """Test extracting from invalid image data."""
         invalid_data = b"not an image"
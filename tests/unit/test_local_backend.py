@@ -2,7 +2,7 @@
 
 import pytest
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, mock_open
 import io
 from PIL import Image
 
@@ -12,7 +12,11 @@ sys.modules['diffusers'] = MagicMock()
 sys.modules['transformers'] = MagicMock()
 sys.modules['accelerate'] = MagicMock()
 
-from src.backends.local import LocalBackend
+# Simulate a CPU-only host without native BF16 support by default
+sys.modules['torch'].cuda.is_available.return_value = False
+sys.modules['torch'].cpu._is_avx512_bf16_supported.return_value = False
+
+from src.backends.local import LocalBackend, detect_accelerator
 from src.core.models import GenerationRequest, GeneratedImage
 
 
@@ -73,6 +77,453 @@ class TestLocalBackend:
         mock_pipeline_class.from_pretrained.assert_called_once()
         mock_pipeline.to.assert_called_with("cpu")
 
+    def test_select_device_cpu_float32(self):
+        """Test that plain CPUs keep float32."""
+        import torch
+        backend = LocalBackend()
+
+        assert backend._select_device_and_dtype() == ("cpu", torch.float32)
+
+    def test_select_device_cpu_bfloat16(self):
+        """Test that CPUs with AVX-512 BF16 use bfloat16."""
+        import torch
+        backend = LocalBackend()
+
+        with patch.object(torch.cpu, '_is_avx512_bf16_supported', return_value=True):
+            assert backend._select_device_and_dtype() == ("cpu", torch.bfloat16)
+
+    def test_select_device_cpuinfo_fallback(self):
+        """Test that /proc/cpuinfo is used when torch has no BF16 probe."""
+        import torch
+        backend = LocalBackend()
+        cpuinfo = "processor\t: 0\nflags\t\t: fpu sse2 avx512f amx_bf16\n"
+
+        with patch.object(torch.cpu, '_is_avx512_bf16_supported', None), \
+                patch('builtins.open', mock_open(read_data=cpuinfo)):
+            assert backend._select_device_and_dtype() == ("cpu", torch.bfloat16)
+
+    def test_select_device_cuda(self):
+        """Test that CUDA hosts use float16 on the GPU."""
+        import torch
+        backend = LocalBackend()
+
+        with patch.object(torch.cuda, 'is_available', return_value=True):
+            assert backend._select_device_and_dtype() == ("cuda", torch.float16)
+
+    def test_detect_accelerator(self):
+        """Test that only CUDA counts as a GPU, matching device selection."""
+        import torch
+
+        backend = LocalBackend()
+
+        with patch.object(torch.cuda, 'is_available', return_value=False), \
+                patch.object(torch.backends.mps, 'is_available', return_value=True):
+            assert detect_accelerator() == "cpu"
+            assert backend._select_device_and_dtype()[0] == "cpu"
+        with patch.object(torch.cuda, 'is_available', return_value=True):
+            assert detect_accelerator() == "cuda"
+            assert backend._select_device_and_dtype()[0] == "cuda"
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_load_pipeline_half_precision_variant(self, mock_pipeline_class):
+        """Test that reduced precision loads the fp16 weight variant."""
+        import torch
+        backend = LocalBackend()
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+
+        with patch.object(torch.cuda, 'is_available', return_value=True):
+            backend._load_pipeline()
+
+        call_kwargs = mock_pipeline_class.from_pretrained.call_args[1]
+        assert call_kwargs["torch_dtype"] == torch.float16
+        assert call_kwargs["variant"] == "fp16"
+        assert call_kwargs["use_safetensors"] is True
+        assert call_kwargs["low_cpu_mem_usage"] is True
+        mock_pipeline.to.assert_called_with("cuda")
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_load_pipeline_compiles_unet_and_vae(self, mock_pipeline_class):
+        """Test that the UNet and VAE decoder are compiled and warmed up."""
+        import torch
+        backend = LocalBackend(compile_mode="max-autotune")
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        compiled = MagicMock()
+
+        with patch.object(torch, '__version__', "2.3.1+cpu", create=True), \
+                patch.object(torch, 'compile', return_value=compiled) as mock_compile:
+            backend._load_pipeline()
+
+        assert mock_compile.call_count == 2
+        assert mock_compile.call_args[1]["mode"] == "max-autotune"
+        assert backend.pipeline.unet is compiled
+        assert backend.pipeline.vae.decoder is compiled
+        # Warm-up generation with the default request's shape and guidance,
+        # so classifier-free guidance (a doubled UNet batch) is compiled too
+        defaults = GenerationRequest(prompt="test")
+        warmup_kwargs = mock_pipeline.call_args[1]
+        assert warmup_kwargs["width"] == defaults.width
+        assert warmup_kwargs["height"] == defaults.height
+        assert warmup_kwargs["guidance_scale"] == defaults.guidance_scale > 1
+        assert warmup_kwargs["num_inference_steps"] == 1
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_load_pipeline_compile_failure_keeps_eager_modules(self, mock_pipeline_class):
+        """Test that a failed warm-up restores the eager UNet and VAE decoder."""
+        import torch
+        backend = LocalBackend()
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.side_effect = RuntimeError("inductor failed")
+        eager_unet = mock_pipeline.unet
+        eager_decoder = mock_pipeline.vae.decoder
+
+        with patch.object(torch, '__version__', "2.1.0", create=True), \
+                patch.object(torch, 'compile', return_value=MagicMock()):
+            backend._load_pipeline()
+
+        assert backend.pipeline.unet is eager_unet
+        assert backend.pipeline.vae.decoder is eager_decoder
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_load_pipeline_compile_disabled(self, mock_pipeline_class):
+        """Test that compile_model=False leaves the pipeline eager."""
+        import torch
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+
+        with patch.object(torch, '__version__', "2.3.1", create=True), \
+                patch.object(torch, 'compile') as mock_compile:
+            backend._load_pipeline()
+
+        mock_compile.assert_not_called()
+
+    @patch('src.backends.local.psutil.virtual_memory')
+    def test_needs_attention_slicing(self, mock_memory):
+        """Test that slicing is only used for large generations on low RAM."""
+        backend = LocalBackend()
+        mock_memory.return_value.available = 8 * 1024 ** 3
+
+        assert backend._needs_attention_slicing(GenerationRequest(prompt="test")) is False
+        assert backend._needs_attention_slicing(
+            GenerationRequest(prompt="test", width=1024, height=1024)
+        ) is True
+
+        mock_memory.return_value.available = 32 * 1024 ** 3
+        assert backend._needs_attention_slicing(
+            GenerationRequest(prompt="test", width=1024, height=1024)
+        ) is False
+
+    def test_configure_attention_slicing_only_on_change(self):
+        """Test that the pipeline is only reconfigured when slicing changes."""
+        backend = LocalBackend()
+        mock_pipeline = MagicMock()
+        request = GenerationRequest(prompt="test")
+
+        with patch.object(backend, '_needs_attention_slicing', return_value=True):
+            backend._configure_attention_slicing(mock_pipeline, request)
+            backend._configure_attention_slicing(mock_pipeline, request)
+        mock_pipeline.enable_attention_slicing.assert_called_once_with("max")
+
+        with patch.object(backend, '_needs_attention_slicing', return_value=False):
+            backend._configure_attention_slicing(mock_pipeline, request)
+            backend._configure_attention_slicing(mock_pipeline, request)
+        mock_pipeline.disable_attention_slicing.assert_called_once()
+
+    def test_optimize_memory_layout(self):
+        """Test channels-last layout and that only SDXL enables VAE tiling."""
+        import torch
+        mock_pipeline = MagicMock()
+
+        LocalBackend()._optimize_memory_layout(mock_pipeline)
+
+        mock_pipeline.unet.to.assert_called_once_with(memory_format=torch.channels_last)
+        mock_pipeline.vae.to.assert_called_once_with(memory_format=torch.channels_last)
+        mock_pipeline.enable_vae_tiling.assert_not_called()
+
+        LocalBackend(model="stabilityai/sdxl-turbo")._optimize_memory_layout(mock_pipeline)
+        mock_pipeline.enable_vae_tiling.assert_called_once()
+
+    @patch('diffusers.AutoPipelineForImage2Image')
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_img2img_pipeline_shares_components(self, mock_txt2img_class, mock_img2img_class):
+        """Test that the img2img pipeline is built from the text-to-image one."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_txt2img_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+
+        backend._load_img2img_pipeline()
+
+        mock_img2img_class.from_pipe.assert_called_once_with(mock_pipeline)
+        mock_img2img_class.from_pretrained.assert_not_called()
+        assert backend.pipeline is mock_pipeline
+        assert backend.img2img_pipeline is mock_img2img_class.from_pipe.return_value
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_generate_images_batches_compatible_requests(self, mock_pipeline_class):
+        """Test that compatible requests share one pipeline call, in order."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.return_value.images = [
+            Image.new('RGB', (64, 64), color='red'),
+            Image.new('RGB', (64, 64), color='blue'),
+        ]
+
+        requests = [
+            GenerationRequest(prompt="first"),
+            GenerationRequest(prompt="odd one out", width=768),
+            GenerationRequest(prompt="second"),
+        ]
+        with patch.object(backend, 'generate_image') as mock_single:
+            results = backend.generate_images(requests)
+
+        # The 768-wide request runs alone, the other two are batched
+        mock_single.assert_called_once_with(requests[1])
+        assert mock_pipeline.call_args[1]["prompt"] == ["first", "second"]
+        assert results[0].prompt == "first"
+        assert results[1] is mock_single.return_value
+        assert results[2].prompt == "second"
+        assert results[2].to_pil().getpixel((0, 0)) == (0, 0, 255)
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_mixed_seed_batch_seeds_every_generator(self, mock_pipeline_class):
+        """Test that unseeded requests in a seeded batch get a random seed."""
+        import torch
+
+        backend = LocalBackend(compile_model=False)
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.return_value.images = [Image.new('RGB', (64, 64))] * 2
+
+        seeded, unseeded = MagicMock(), MagicMock()
+        with patch.object(torch, 'Generator', side_effect=[seeded, unseeded]):
+            backend.generate_images([
+                GenerationRequest(prompt="first", seed=7),
+                GenerationRequest(prompt="second"),
+            ])
+
+        assert mock_pipeline.call_args[1]["generator"] == [seeded, unseeded]
+        seeded.manual_seed.assert_called_once_with(7)
+        seeded.seed.assert_not_called()
+        unseeded.seed.assert_called_once_with()
+        unseeded.manual_seed.assert_not_called()
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_invalid_request_rejected_before_load(self, mock_pipeline_class):
+        """Test that invalid sizes fail without loading the model."""
+        backend = LocalBackend()
+
+        with pytest.raises(ValueError, match="multiples of 8"):
+            backend.generate_image(GenerationRequest(prompt="test", width=500))
+        with pytest.raises(ValueError, match="num_inference_steps"):
+            backend.generate_image(GenerationRequest(prompt="test", num_inference_steps=100))
+
+        mock_pipeline_class.from_pretrained.assert_not_called()
+
+    def test_validate_request_caps_turbo_steps(self):
+        """Test that turbo models are capped at their distilled step count."""
+        backend = LocalBackend()
+
+        request = backend._validate_request(GenerationRequest(prompt="test", num_inference_steps=30))
+
+        assert request.num_inference_steps == LocalBackend.TURBO_MAX_STEPS
+        assert request.prompt == "test"
+
+    def test_prompt_embeddings_cached(self):
+        """Test that repeated prompts reuse the text-encoder output."""
+        backend = LocalBackend()
+        mock_pipeline = MagicMock()
+        mock_pipeline.encode_prompt.return_value = ("embeds", "negative_embeds")
+        request = GenerationRequest(prompt="a cat", negative_prompt="blurry")
+
+        first = backend._prompt_embeddings(mock_pipeline, request)
+        second = backend._prompt_embeddings(mock_pipeline, request)
+
+        assert first == {"prompt_embeds": "embeds", "negative_prompt_embeds": "negative_embeds"}
+        assert second is first
+        mock_pipeline.encode_prompt.assert_called_once()
+
+        backend._prompt_embeddings(mock_pipeline, GenerationRequest(prompt="a dog"))
+        assert mock_pipeline.encode_prompt.call_count == 2
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_generate_image_uses_prompt_embeddings(self, mock_pipeline_class):
+        """Test that cached embeddings replace the prompt strings."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.encode_prompt.return_value = ("embeds", "negative_embeds")
+        mock_pipeline.return_value.images = [Image.new('RGB', (64, 64))]
+
+        backend.generate_image(GenerationRequest(prompt="a cat", negative_prompt="blurry"))
+
+        call_kwargs = mock_pipeline.call_args[1]
+        assert call_kwargs["prompt_embeds"] == "embeds"
+        assert "prompt" not in call_kwargs
+        assert "negative_prompt" not in call_kwargs
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_seeded_generation_captures_latents(self, mock_pipeline_class):
+        """Test that early latents are kept for seeded text-to-image requests."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+
+        def run_steps(**kwargs):
+            assert kwargs["callback_on_step_end_tensor_inputs"] == ["latents"]
+            for step in range(kwargs["num_inference_steps"]):
+                kwargs["callback_on_step_end"](mock_pipeline, step, 0, {"latents": MagicMock()})
+            return MagicMock(images=[Image.new('RGB', (64, 64))])
+
+        mock_pipeline.side_effect = run_steps
+
+        result = backend.generate_image(GenerationRequest(prompt="a cat", seed=1))
+
+        # 4 turbo steps: latents after 1 and 2 steps (up to 50%) are kept
+        assert sorted(result.latents) == [1, 2]
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_resume_from_latents(self, mock_pipeline_class):
+        """Test that resuming runs only the rest of the schedule."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.scheduler.timesteps = [999, 749, 499, 249]
+        mock_pipeline.scheduler.init_noise_sigma = 2.0
+        mock_pipeline.return_value.images = [Image.new('RGB', (64, 64))]
+
+        result = backend.resume_from_latents(
+            GenerationRequest(prompt="a cat", seed=1), 4.0, start_step=2
+        )
+
+        call_kwargs = mock_pipeline.call_args[1]
+        assert call_kwargs["timesteps"] == [499, 249]
+        assert call_kwargs["latents"] == 2.0
+        assert "callback_on_step_end" not in call_kwargs
+        assert result.metadata["resumed_from_step"] == 2
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_resume_unsupported_scheduler_runs_all_steps(self, mock_pipeline_class):
+        """Test that schedulers without custom timesteps fall back to a full run."""
+        backend = LocalBackend(compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.scheduler.timesteps = [999, 749, 499, 249]
+        mock_pipeline.scheduler.set_timesteps.side_effect = [None, TypeError("timesteps")]
+        mock_pipeline.return_value.images = [Image.new('RGB', (64, 64))]
+
+        result = backend.resume_from_latents(
+            GenerationRequest(prompt="a cat", seed=1), 4.0, start_step=2
+        )
+
+        assert "timesteps" not in mock_pipeline.call_args[1]
+        assert "resumed_from_step" not in result.metadata
+
+    def test_invalid_quantization(self):
+        """Test that unknown quantization modes are rejected."""
+        with pytest.raises(ValueError, match="not supported"):
+            LocalBackend(quantization="int4")
+
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_load_pipeline_int8(self, mock_pipeline_class):
+        """Test that INT8 mode quantizes the UNet on VNNI CPUs."""
+        import torch
+        backend = LocalBackend(quantization="int8", compile_model=False)
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        quantized_unet = MagicMock()
+
+        with patch('src.backends.local._cpu_has_vnni', return_value=True), \
+                patch.object(torch.ao.quantization, 'quantize_dynamic',
+                             return_value=quantized_unet) as mock_quantize:
+            backend._load_pipeline()
+
+        mock_quantize.assert_called_once()
+        assert backend.pipeline.unet is quantized_unet
+        assert backend.dtype == torch.float32
+        mock_pipeline.to.assert_called_with("cpu")
+
+    def test_quantize_int8_skipped_without_vnni(self):
+        """Test that INT8 quantization is skipped on CPUs without VNNI."""
+        import torch
+        backend = LocalBackend(quantization="int8")
+        mock_pipeline = MagicMock()
+        unet = mock_pipeline.unet
+
+        with patch('src.backends.local._cpu_has_vnni', return_value=False), \
+                patch.object(torch.ao.quantization, 'quantize_dynamic') as mock_quantize:
+            backend._quantize_int8(mock_pipeline)
+
+        mock_quantize.assert_not_called()
+        assert mock_pipeline.unet is unet
+
+    def test_load_pipeline_openvino(self):
+        """Test that OpenVINO mode loads an optimum-intel pipeline."""
+        backend = LocalBackend(quantization="openvino")
+        mock_optimum = MagicMock()
+        ov_pipeline = MagicMock()
+        mock_optimum.OVPipelineForText2Image.from_pretrained.return_value = ov_pipeline
+
+        with patch.dict(sys.modules, {'optimum': MagicMock(), 'optimum.intel': mock_optimum}):
+            backend._load_pipeline()
+
+        assert backend.pipeline is ov_pipeline
+        call_kwargs = mock_optimum.OVPipelineForText2Image.from_pretrained.call_args[1]
+        assert call_kwargs["export"] is True
+        assert call_kwargs["compile"] is True
+
+    def test_optimize_with_ipex(self):
+        """Test that IPEX optimizes the UNet and VAE decoder on CPU."""
+        backend = LocalBackend()
+        mock_pipeline = MagicMock()
+        mock_ipex = MagicMock()
+        optimized = MagicMock()
+        mock_ipex.optimize.return_value = optimized
+
+        with patch.dict(sys.modules, {'intel_extension_for_pytorch': mock_ipex}):
+            backend._optimize_with_ipex(mock_pipeline)
+
+        assert mock_ipex.optimize.call_count == 2
+        assert mock_pipeline.unet is optimized
+        assert mock_pipeline.vae.decoder is optimized
+
+    def test_optimize_with_ipex_skipped_on_cuda(self):
+        """Test that IPEX is not applied to GPU pipelines."""
+        backend = LocalBackend()
+        backend.device = "cuda"
+        mock_ipex = MagicMock()
+
+        with patch.dict(sys.modules, {'intel_extension_for_pytorch': mock_ipex}):
+            backend._optimize_with_ipex(MagicMock())
+
+        mock_ipex.optimize.assert_not_called()
+
     @patch('diffusers.AutoPipelineForText2Image')
     def test_load_pipeline_only_once(self, mock_pipeline_class):
         """Test that pipeline is only loaded once."""
@@ -90,6 +541,59 @@ class TestLocalBackend:
         # Verify from_pretrained was only called once
         assert mock_pipeline_class.from_pretrained.call_count == 1
 
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_concurrent_cold_start_loads_once(self, mock_pipeline_class):
+        """Test that overlapping first requests load the model once and run one at a time."""
+        import threading
+
+        backend = LocalBackend(compile_model=False)
+        loading = threading.Event()
+        release = threading.Event()
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        mock_pipeline = MagicMock()
+
+        def slow_load(*args, **kwargs):
+            loading.set()
+            release.wait(timeout=2)
+            return mock_pipeline
+
+        def run_pipeline(**kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.02)
+            with lock:
+                running -= 1
+            return MagicMock(images=[Image.new('RGB', (64, 64))])
+
+        mock_pipeline_class.from_pretrained.side_effect = slow_load
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.side_effect = run_pipeline
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                backend.generate_image(GenerationRequest(prompt="test", guidance_scale=1.0))
+            ))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        loading.wait(timeout=2)
+        threading.Event().wait(0.05)  # Let the second caller reach the load
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(results) == 2
+        assert mock_pipeline_class.from_pretrained.call_count == 1
+        assert mock_pipeline.call_count == 2
+        assert peak == 1
+
     @patch('diffusers.AutoPipelineForText2Image')
     def test_load_pipeline_missing_dependencies(self, mock_pipeline_class):
         """Test error when dependencies are missing."""
@@ -147,6 +651,21 @@ class TestLocalBackend:
         assert call_kwargs["width"] == 512
         assert call_kwargs["height"] == 512
 
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_generate_image_output_format(self, mock_pipeline_class):
+        """Test that the requested output format is used for image_data."""
+        backend = LocalBackend()
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_pipeline.return_value.images = [Image.new('RGB', (64, 64), color='red')]
+
+        result = backend.generate_image(GenerationRequest(prompt="test", output_format="WEBP"))
+
+        assert Image.open(io.BytesIO(result.image_data)).format == "WEBP"
+        assert result.metadata["format"] == "WEBP"
+
     @patch('torch.Generator')
     @patch('diffusers.AutoPipelineForText2Image')
     def test_generate_image_with_negative_prompt(self, mock_pipeline_class, mock_generator_class):
@@ -218,6 +737,25 @@ class TestLocalBackend:
         # Verify generator was created with seed
         mock_generator_class.return_value.manual_seed.assert_called_with(42)
 
+    @patch('torch.Generator')
+    @patch('diffusers.AutoPipelineForText2Image')
+    def test_seeded_generator_reused(self, mock_pipeline_class, mock_generator_class):
+        """Test that one generator per thread is reused across seeded requests."""
+        backend = LocalBackend()
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_class.from_pretrained.return_value = mock_pipeline
+        mock_pipeline.to.return_value = mock_pipeline
+        mock_result = MagicMock()
+        mock_result.images = [Image.new('RGB', (512, 512), color='green')]
+        mock_pipeline.return_value = mock_result
+
+        backend.generate_image(GenerationRequest(prompt="first", seed=1))
+        backend.generate_image(GenerationRequest(prompt="second", seed=2))
+
+        mock_generator_class.assert_called_once_with(device="cpu")
+        mock_generator_class.return_value.manual_seed.assert_called_with(2)
+
     @patch('diffusers.AutoPipelineForText2Image')
     def test_generate_image_failure(self, mock_pipeline_class):
         """Test error handling when generation fails."""
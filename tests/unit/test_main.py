@@ -70,7 +70,7 @@ class TestMainLogic:
         # Verify the flow worked
         assert result.prompt == "A beautiful sunset"
         assert result.backend == "HuggingFace"
-        assert len(result.image_data) > 0
+        assert len(result.get_bytes()) > 0
 
     def test_error_handling_flow(self):
         """Test error handling in the application."""
@@ -3,8 +3,9 @@
 import pytest
 from datetime import datetime
 from pydantic import ValidationError
+from PIL import Image
 
-from src.core.models import GenerationRequest, GeneratedImage
+from src.core.models import GenerationRequest, GeneratedImage, build_request, prompt_key
 
 
 class TestGenerationRequest:
@@ -114,6 +115,76 @@ class TestGenerationRequest:
             GenerationRequest(prompt="test", height=2048)
 
 
+    def test_output_format(self):
+        """Test output_format default and validation."""
+        assert GenerationRequest(prompt="test").output_format == "PNG"
+        assert GenerationRequest(prompt="test", output_format="WEBP").output_format == "WEBP"
+
+        with pytest.raises(ValidationError):
+            GenerationRequest(prompt="test", output_format="BMP")
+
+    def test_request_is_frozen(self):
+        """Test that requests cannot be mutated after validation."""
+        request = GenerationRequest(prompt="A cat")
+
+        with pytest.raises(ValidationError):
+            request.prompt = "A dog"
+
+    def test_unknown_fields_rejected(self):
+        """Test that unexpected fields are rejected."""
+        with pytest.raises(ValidationError):
+            GenerationRequest(prompt="A cat", steps=10)
+
+    def test_cache_key(self):
+        """Test that identical requests share a cache key and hash."""
+        a = GenerationRequest(prompt="A cat", seed=1)
+        b = GenerationRequest(prompt="A cat", seed=1)
+        c = GenerationRequest(prompt="A cat", seed=2)
+
+        assert a.cache_key == b.cache_key
+        assert a.cache_key != c.cache_key
+        assert hash(a) == hash(b)
+        assert a.cache_key is a.cache_key  # computed once
+
+    def test_build_request_reuses_instances(self):
+        """Test that build_request returns one validated instance per parameter set."""
+        first = build_request("A cat", seed=1)
+        second = build_request("A cat", seed=1)
+
+        assert first is second
+        assert first == GenerationRequest(prompt="A cat", seed=1)
+        assert build_request("A cat", seed=2) is not first
+
+    def test_build_request_validates(self):
+        """Test that build_request rejects invalid parameters."""
+        with pytest.raises(ValidationError):
+            build_request("")
+
+    def test_prompt_key_normalizes_prompt(self):
+        """Test that case and whitespace differences share a prompt_key."""
+        a = prompt_key(GenerationRequest(prompt="A  Red Cat", seed=1))
+        b = prompt_key(GenerationRequest(prompt="a red cat ", seed=1))
+
+        assert a == b
+        assert len(a) == 16
+
+    def test_prompt_key_includes_parameters(self):
+        """Test that every other parameter changes the prompt_key."""
+        base = prompt_key(GenerationRequest(prompt="A cat", seed=1))
+
+        assert prompt_key(GenerationRequest(prompt="A cat", seed=2)) != base
+        assert prompt_key(GenerationRequest(prompt="A cat")) != base
+        assert prompt_key(GenerationRequest(prompt="A cat", seed=1, width=768)) != base
+        assert prompt_key(GenerationRequest(prompt="A cat", seed=1, negative_prompt="dog")) != base
+
+
+    def test_prompt_key_handles_any_seed(self):
+        """Test that large and negative seeds hash without colliding with None."""
+        seeds = [None, -1, 0, 2**63, 2**64, -(2**70)]
+        keys = {prompt_key(GenerationRequest(prompt="A cat", seed=seed)) for seed in seeds}
+
+        assert len(keys) == len(seeds)
+
 class TestGeneratedImage:
     """Tests for GeneratedImage model."""
 
@@ -177,6 +248,19 @@ class TestGeneratedImage:
 
         assert result.timestamp == custom_time
 
+    def test_timestamp_stored_as_nanoseconds(self):
+        """Test that the timestamp is kept as epoch nanoseconds."""
+        result = GeneratedImage(
+            image_data=b"test",
+            prompt="test",
+            backend="test",
+            timestamp="2025-01-01T12:00:00.123456"
+        )
+
+        assert result.timestamp_ns % 1_000_000_000 == 123_456_000
+        assert result.timestamp == datetime(2025, 1, 1, 12, 0, 0, 123456)
+        assert "timestamp" not in result.model_dump()
+
     def test_required_fields(self):
         """Test that all required fields must be provided."""
         # Missing image_data
@@ -199,3 +283,78 @@ class TestGeneratedImage:
                 image_data=b"test",
                 prompt="test"
             )
+
+    def test_to_pil_uses_in_memory_image(self):
+        """Test that to_pil returns the backend's image without decoding."""
+        pil_image = Image.new('RGB', (8, 8), color='red')
+
+        result = GeneratedImage(
+            image_data=b"not a real png",
+            prompt="test",
+            backend="test",
+            pil_image=pil_image
+        )
+
+        assert result.to_pil() is pil_image
+        assert "pil_image" not in result.model_dump()
+
+    def test_to_pil_decodes_image_data(self, sample_image_bytes):
+        """Test that to_pil falls back to decoding image_data."""
+        result = GeneratedImage(
+            image_data=sample_image_bytes,
+            prompt="test",
+            backend="test"
+        )
+
+        image = result.to_pil()
+        assert image.size == (512, 512)
+
+    def test_memoryview_image_data(self, sample_image_bytes):
+        """Test that memoryview image data is kept as-is and decodes normally."""
+        view = memoryview(sample_image_bytes)
+
+        result = GeneratedImage(image_data=view, prompt="test", backend="test")
+
+        assert result.image_data is view
+        assert result.get_bytes() == sample_image_bytes
+        assert result.to_pil().size == (512, 512)
+
+    def test_image_path_used_when_bytes_empty(self, tmp_path):
+        """Test that get_bytes and to_pil read from image_path."""
+        image_path = tmp_path / "image.png"
+        Image.new('RGB', (8, 4), color='blue').save(image_path)
+
+        result = GeneratedImage(
+            image_data=b"",
+            prompt="test",
+            backend="test",
+            image_path=image_path
+        )
+
+        assert result.get_bytes() == image_path.read_bytes()
+        assert result.image_data == image_path.read_bytes()
+        assert result.model_dump()["image_data"] == image_path.read_bytes()
+        assert result.to_pil().size == (8, 4)
+
+    def test_image_path_read_once(self, tmp_path):
+        """Test that image_path is read from disk only on first access."""
+        from pathlib import Path
+        from unittest.mock import patch
+
+        image_path = tmp_path / "image.png"
+        Image.new('RGB', (8, 4), color='blue').save(image_path)
+        expected = image_path.read_bytes()
+
+        result = GeneratedImage(
+            image_data=b"",
+            prompt="test",
+            backend="test",
+            image_path=image_path
+        )
+
+        with patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as mock_read:
+            assert result.get_bytes() == expected
+            assert result.model_dump()["image_data"] == expected
+            assert result.to_pil().size == (8, 4)
+
+        assert mock_read.call_count == 1
@@ -1,6 +1,7 @@
 """Unit tests for plugin base classes."""
 
 import pytest
+from dataclasses import FrozenInstanceError
 from typing import Type
 from src.core.plugin import (
     BasePlugin,
@@ -31,7 +32,7 @@ class TestPluginMetadata:
         assert metadata.author == "Test Author"
         assert metadata.description == "A test plugin"
         assert metadata.plugin_type == PluginType.BACKEND
-        assert metadata.dependencies == []
+        assert metadata.dependencies == ()
         assert metadata.requires_api_key is False
 
     def test_metadata_with_dependencies(self):
@@ -47,9 +48,26 @@ class TestPluginMetadata:
             requires_api_key=True
         )
 
-        assert metadata.dependencies == ["requests", "pillow"]
+        assert metadata.dependencies == ("requests", "pillow")
         assert metadata.requires_api_key is True
 
+    def test_metadata_is_frozen_and_hashable(self):
+        """Test that metadata is immutable, slotted and usable as a dict key."""
+        metadata = PluginMetadata(
+            name="testplugin",
+            display_name="Test Plugin",
+            version="1.0.0",
+            author="Test",
+            description="Test",
+            plugin_type=PluginType.BACKEND,
+            dependencies=["requests"]
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            metadata.version = "2.0.0"
+        assert not hasattr(metadata, "__dict__")
+        assert {metadata: "loaded"}[metadata] == "loaded"
+
     def test_invalid_name_uppercase(self):
         """Test that uppercase names are rejected."""
         with pytest.raises(ValueError, match="lowercase"):
@@ -229,6 +247,31 @@ class TestBasePlugin:
         assert all_installed is False
         assert "nonexistent_package_12345" in missing
 
+    def test_validate_dependencies_does_not_import(self):
+        """Test that dependency checks locate packages without importing them."""
+        import sys
+        from src.core.plugin import _is_installed
+
+        _is_installed.cache_clear()
+        was_loaded = "wave" in sys.modules
+
+        assert _is_installed("wave") is True
+        assert ("wave" in sys.modules) == was_loaded
+        assert _is_installed("nonexistent_package_12345.sub") is False
+
+    def test_invalidate_dependency_cache(self, tmp_path, monkeypatch):
+        """Test that packages installed after a failed check are found once invalidated."""
+        from src.core.plugin import _is_installed, invalidate_dependency_cache
+
+        monkeypatch.syspath_prepend(str(tmp_path))
+        assert _is_installed("late_installed_pkg_12345") is False
+
+        (tmp_path / "late_installed_pkg_12345.py").write_text("")
+        assert _is_installed("late_installed_pkg_12345") is False  # cached
+
+        invalidate_dependency_cache()
+        assert _is_installed("late_installed_pkg_12345") is True
+
     def test_plugin_repr(self):
         """Test plugin string representation."""
         plugin = MockPlugin()
@@ -2,6 +2,7 @@
 
 import pytest
 from pathlib import Path
+from typing import Optional
 from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import shutil
@@ -40,6 +41,28 @@ class TestPluginManager:
 
         assert manager1 is manager2
 
+    def test_singleton_instance_thread_safe(self):
+        """Test that concurrent first calls construct a single PluginManager."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        barrier = threading.Barrier(8)
+        original_init = PluginManager.__init__
+
+        def slow_init(manager, plugins_dir=None):
+            threading.Event().wait(0.01)
+            original_init(manager, plugins_dir)
+
+        def get_instance():
+            barrier.wait()
+            return PluginManager.get_instance(self.plugins_dir)
+
+        with patch.object(PluginManager, "__init__", slow_init):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                managers = list(pool.map(lambda _: get_instance(), range(8)))
+
+        assert all(manager is managers[0] for manager in managers)
+
     def test_reset_instance(self):
         """Test resetting singleton instance."""
         manager1 = PluginManager.get_instance(self.plugins_dir)
@@ -83,6 +106,17 @@ class TestPluginManager:
         available = manager.list_available_plugins()
         assert "mock" in available
 
+    def test_register_builtin_plugins(self):
+        """Test registering the built-in plugin registry in one call."""
+        from src.core.builtin_plugins import BUILTIN_PLUGINS, register_builtin_plugins
+
+        manager = PluginManager(self.plugins_dir)
+        register_builtin_plugins(manager)
+
+        assert set(manager.list_available_plugins()) == {"huggingface", "replicate", "local"}
+        with pytest.raises(TypeError):
+            BUILTIN_PLUGINS["other"] = BUILTIN_PLUGINS["local"]
+
     def test_discover_plugins_empty_directory(self):
         """Test discovering plugins in empty directory."""
         manager = PluginManager(self.plugins_dir)
@@ -101,6 +135,115 @@ class TestPluginManager:
         assert discovered == []
         assert non_existent.exists()  # Should create directory
 
+    def _write_plugin(self, name: str, marker: Optional[Path] = None) -> Path:
+        """Write a minimal plugin package and return its __plugin__.py path.
+
+        If marker is given, the plugin appends a line to it each time its
+        file is executed.
+        """
+        package = self.plugins_dir / name
+        package.mkdir()
+        plugin_file = package / "__plugin__.py"
+        plugin_file.write_text(
+            "from src.core.plugin import BasePlugin, PluginMetadata, PluginType\n"
+            "\n"
+            + (f"with open({str(marker)!r}, 'a') as f:\n    f.write('x\\n')\n\n" if marker else "")
+            + "class Plugin(BasePlugin):\n"
+            "    @property\n"
+            "    def metadata(self):\n"
+            f"        return PluginMetadata(name={name!r}, display_name='X', version='1',\n"
+            "                              author='T', description='T',\n"
+            "                              plugin_type=PluginType.EXTENSION)\n"
+            "\n"
+            "    def initialize(self):\n"
+            "        return True\n"
+            "\n"
+            "    def cleanup(self):\n"
+            "        pass\n"
+        )
+        return plugin_file
+
+    @staticmethod
+    def _executions(marker: Path) -> int:
+        """Count how often a plugin written with a marker was executed."""
+        return len(marker.read_text().splitlines()) if marker.exists() else 0
+
+    def test_discover_plugins_skips_non_packages(self):
+        """Test that files and packages without __plugin__.py are ignored."""
+        self._write_plugin("goodplugin")
+        (self.plugins_dir / "notes.txt").write_text("not a plugin")
+        (self.plugins_dir / "emptydir").mkdir()
+        manager = PluginManager(self.plugins_dir)
+
+        assert manager.discover_plugins() == ["goodplugin"]
+        assert "goodplugin" in manager.list_available_plugins()
+
+    def test_discover_plugins_defers_execution(self):
+        """Test that plugin files only run when the plugin is loaded."""
+        marker = self.plugins_dir / "executed.log"
+        self._write_plugin("lazyplugin", marker)
+        manager = PluginManager(self.plugins_dir)
+
+        assert manager.discover_plugins() == ["lazyplugin"]
+        assert "lazyplugin" in manager.available_plugins()
+        assert self._executions(marker) == 0
+
+        assert manager.load_plugin("lazyplugin")
+        assert self._executions(marker) == 1
+        assert manager.get_plugin("lazyplugin").metadata.name == "lazyplugin"
+
+    def test_discover_plugins_reuses_unchanged_plugins(self):
+        """Test that rediscovery only re-imports plugin files that changed."""
+        import os
+
+        marker = self.plugins_dir / "executed.log"
+        plugin_file = self._write_plugin("cachedplugin", marker)
+        manager = PluginManager(self.plugins_dir)
+        manager.discover_plugins()
+        manager.load_plugin("cachedplugin")
+
+        assert manager.discover_plugins() == ["cachedplugin"]
+        assert "cachedplugin" in manager._plugin_classes
+
+        stat = plugin_file.stat()
+        os.utime(plugin_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert manager.discover_plugins() == ["cachedplugin"]
+        assert "cachedplugin" in manager._deferred_plugins
+        assert "cachedplugin" not in manager._plugin_classes
+        assert self._executions(marker) == 1
+
+    def test_new_manager_reuses_loaded_plugin_module(self):
+        """Test that an unchanged plugin module in sys.modules is not re-executed."""
+        import sys
+
+        marker = self.plugins_dir / "executed.log"
+        self._write_plugin("sharedplugin", marker)
+        PluginManager(self.plugins_dir).discover_plugins()
+        module = sys.modules["plugins.sharedplugin"]
+
+        manager = PluginManager(self.plugins_dir)
+        plugin_file = self.plugins_dir / "sharedplugin" / "__plugin__.py"
+        assert manager._load_plugin_class("sharedplugin", plugin_file) is module.Plugin
+        assert manager.discover_plugins() == ["sharedplugin"]
+        assert manager.load_plugin("sharedplugin")
+
+        assert sys.modules["plugins.sharedplugin"] is module
+        assert self._executions(marker) == 1
+
+    def test_failed_plugin_module_not_left_in_sys_modules(self):
+        """Test that a plugin file raising on import is removed from sys.modules."""
+        import sys
+
+        package = self.plugins_dir / "brokenplugin"
+        package.mkdir()
+        (package / "__plugin__.py").write_text("raise RuntimeError('boom')\n")
+        manager = PluginManager(self.plugins_dir)
+
+        assert manager.discover_plugins() == ["brokenplugin"]
+        assert manager.load_plugin("brokenplugin") is False
+        assert "plugins.brokenplugin" not in sys.modules
+        assert "brokenplugin" not in manager.available_plugins()
+
     def test_load_builtin_plugin(self):
         """Test loading a built-in plugin."""
         manager = PluginManager(self.plugins_dir)
@@ -134,6 +277,21 @@ class TestPluginManager:
         assert manager.is_plugin_loaded("mock")
         assert manager.is_plugin_enabled("mock")
 
+    def test_get_all_plugins_read_only_view(self):
+        """Test that get_all_plugins returns a live, read-only mapping."""
+        manager = PluginManager(self.plugins_dir)
+        plugins = manager.get_all_plugins()
+
+        manager.register_builtin_plugin("mock", Mock(return_value=Mock(
+            validate_dependencies=Mock(return_value=(True, []))
+        )))
+        manager.load_plugin("mock", auto_enable=False)
+
+        assert list(plugins) == ["mock"]
+        assert manager.get_all_plugins() is plugins
+        with pytest.raises(TypeError):
+            plugins["other"] = Mock()
+
     def test_load_plugin_not_found(self):
         """Test loading a plugin that doesn't exist."""
         manager = PluginManager(self.plugins_dir)
@@ -366,6 +524,10 @@ class TestPluginManager:
         assert len(backend_plugins) == 1
         assert backend_plugins[0].metadata.name == "backend1"
 
+        manager.unload_plugin("backend1")
+        assert manager.get_plugins_by_type(PluginType.BACKEND) == []
+        assert len(manager.get_plugins_by_type(PluginType.EXTENSION)) == 1
+
     def test_get_backend_plugins(self):
         """Test getting backend plugins specifically."""
         manager = PluginManager(self.plugins_dir)
@@ -426,6 +588,37 @@ class TestPluginManager:
 
         assert "mock" in available
 
+    def test_available_plugins_cache_invalidated(self):
+        """Test that the cached plugin set is rebuilt after registration."""
+        manager = PluginManager(self.plugins_dir)
+
+        before = manager.available_plugins()
+        assert manager.available_plugins() is before  # cached
+
+        manager.register_builtin_plugin("another", Mock())
+
+        assert "another" in manager.available_plugins()
+        assert "another" not in before
+
+    def test_list_available_plugins_sorted_copy(self):
+        """Test that listed plugin names are sorted and safe to modify."""
+        manager = PluginManager(self.plugins_dir)
+        manager.register_builtin_plugins({"zeta": Mock(), "alpha": Mock()})
+
+        names = manager.list_available_plugins()
+        assert names == ["alpha", "zeta"]
+
+        names.append("bogus")
+        assert manager.list_available_plugins() == ["alpha", "zeta"]
+
+    def test_plugin_manager_has_no_instance_dict(self):
+        """Test that PluginManager stores its state in slots."""
+        manager = PluginManager(self.plugins_dir)
+
+        assert not hasattr(manager, "__dict__")
+        with pytest.raises(AttributeError):
+            manager.unexpected = True
+
     def test_plugin_manager_repr(self):
         """Test PluginManager string representation."""
         manager = PluginManager(self.plugins_dir)
@@ -87,6 +87,25 @@ class TestPromptLibrary:
 
         assert len(results) > 0
 
+    @pytest.mark.parametrize("query", ["PORTRAIT", "light", "e", "", "no such template"])
+    def test_search_templates_matches_fields(self, query):
+        """Test that search matches any field case-insensitively, in template order."""
+        q = query.lower()
+        expected = [
+            t for t in PromptLibrary.TEMPLATES
+            if q in t.name.lower() or q in t.description.lower()
+            or any(q in tag.lower() for tag in t.tags)
+        ]
+
+        assert PromptLibrary.search_templates(query) == expected
+
+    def test_search_does_not_match_across_fields(self):
+        """Test that a query spanning the end of one field and the next fails."""
+        template = PromptLibrary.TEMPLATES[0]
+        query = f"{template.name[-2:]}{template.description[:2]}"
+
+        assert template not in PromptLibrary.search_templates(query)
+
     def test_get_all_categories(self):
         """Test getting all categories."""
         categories = PromptLibrary.get_all_categories()
@@ -94,6 +113,24 @@ class TestPromptLibrary:
         assert len(categories) > 0
         assert "people" in categories or "nature" in categories
 
+    def test_indexes_match_templates(self):
+        """Test that name and category lookups agree with TEMPLATES."""
+        for template in PromptLibrary.TEMPLATES:
+            assert PromptLibrary.get_template(template.name) is template
+            assert template in PromptLibrary.get_templates_by_category(template.category)
+
+        categories = PromptLibrary.get_all_categories()
+        assert sorted(categories) == sorted({t.category for t in PromptLibrary.TEMPLATES})
+
+    def test_category_lists_are_copies(self):
+        """Test that mutating a returned list does not change the library."""
+        PromptLibrary.get_templates_by_category("people").clear()
+        PromptLibrary.get_all_categories().clear()
+
+        assert PromptLibrary.get_templates_by_category("people")
+        assert "people" in PromptLibrary.get_all_categories()
+        assert PromptLibrary.get_templates_by_category("unknown") == []
+
     def test_style_modifiers_exist(self):
         """Test that style modifiers are defined."""
         assert len(PromptLibrary.STYLE_MODIFIERS) > 0
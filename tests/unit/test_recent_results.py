@@ -0,0 +1,117 @@
+"""Unit tests for repeated-submission deduplication."""
+
+import pytest
+import threading
+from unittest.mock import Mock, patch
+
+from src.utils.recent_results import RecentResultCache
+
+
+class TestRecentResultCache:
+    """Tests for RecentResultCache."""
+
+    def test_invalid_parameters(self):
+        """Test that invalid settings are rejected."""
+        with pytest.raises(ValueError, match="ttl"):
+            RecentResultCache(ttl=-1)
+
+        with pytest.raises(ValueError, match="max_size"):
+            RecentResultCache(max_size=0)
+
+    def test_overlapping_calls_share_one_run(self):
+        """Test that a repeat submitted while the first is running waits for it."""
+        recent = RecentResultCache(ttl=2.0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def run():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=2)
+            return "image"
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(recent.get_or_run("key", run)))
+        first.start()
+        started.wait(timeout=2)
+
+        second = threading.Thread(target=lambda: results.append(recent.get_or_run("key", run)))
+        second.start()
+        threading.Event().wait(0.05)  # Let the second call reach the wait
+        release.set()
+        first.join(timeout=2)
+        second.join(timeout=2)
+
+        assert results == ["image", "image"]
+        assert len(calls) == 1
+
+    def test_recent_result_reused_until_ttl(self):
+        """Test that finished results are reused only within the TTL."""
+        recent = RecentResultCache(ttl=2.0)
+        run = Mock(side_effect=["first", "second"])
+
+        with patch('src.utils.recent_results.time.monotonic', return_value=100.0):
+            assert recent.get_or_run("key", run) == "first"
+        with patch('src.utils.recent_results.time.monotonic', return_value=101.0):
+            assert recent.get_or_run("key", run) == "first"
+        with patch('src.utils.recent_results.time.monotonic', return_value=103.0):
+            assert recent.get_or_run("key", run) == "second"
+
+        assert run.call_count == 2
+
+    def test_uncacheable_result_not_kept(self):
+        """Test that rejected results are not reused by later submissions."""
+        recent = RecentResultCache(ttl=2.0)
+        run = Mock(side_effect=[(None, "error"), ("image", "ok")])
+
+        def cacheable(result):
+            return result[0] is not None
+
+        assert recent.get_or_run("key", run, cacheable) == (None, "error")
+        assert recent.get_or_run("key", run, cacheable) == ("image", "ok")
+        assert recent.get_or_run("key", run, cacheable) == ("image", "ok")
+        assert run.call_count == 2
+
+    def test_exception_reaches_waiters_and_is_not_kept(self):
+        """Test that a failure is raised for waiting repeats and later ones retry."""
+        recent = RecentResultCache(ttl=2.0)
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing_run():
+            started.set()
+            release.wait(timeout=2)
+            raise RuntimeError("backend down")
+
+        errors = []
+
+        def submit():
+            try:
+                recent.get_or_run("key", failing_run)
+            except RuntimeError as e:
+                errors.append(e)
+
+        first = threading.Thread(target=submit)
+        first.start()
+        started.wait(timeout=2)
+        second = threading.Thread(target=submit)
+        second.start()
+        threading.Event().wait(0.05)
+        release.set()
+        first.join(timeout=2)
+        second.join(timeout=2)
+
+        assert len(errors) == 2
+        assert recent.get_or_run("key", lambda: "image") == "image"
+
+    def test_max_size_evicts_oldest(self):
+        """Test that only the most recent max_size results are kept."""
+        recent = RecentResultCache(ttl=60.0, max_size=2)
+        for key in ("a", "b", "c"):
+            recent.get_or_run(key, lambda key=key: key)
+
+        run = Mock(return_value="new")
+        assert recent.get_or_run("a", run) == "new"
+        assert recent.get_or_run("c", run) == "c"
+        run.assert_called_once()
@@ -0,0 +1,93 @@
+"""Unit tests for the Redis image cache."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.core.models import GenerationRequest, GeneratedImage
+from src.core.redis_cache import RedisImageCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client calls used by the cache."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expiry = {}
+
+    def hgetall(self, key):
+        return self.hashes.get(key, {})
+
+    def pipeline(self):
+        pipe = MagicMock()
+        pipe.hset.side_effect = lambda key, mapping: self.hashes.__setitem__(key, {
+            k.encode(): v if isinstance(v, bytes) else str(v).encode() for k, v in mapping.items()
+        })
+        pipe.expire.side_effect = lambda key, ttl: self.expiry.__setitem__(key, ttl)
+        return pipe
+
+
+def _make_result(prompt: str) -> GeneratedImage:
+    """Build a fake GeneratedImage for a prompt."""
+    return GeneratedImage(
+        image_data=b"fake", prompt=prompt, backend="test", metadata={"model": "m"}
+    )
+
+
+class TestRedisImageCache:
+    """Tests for RedisImageCache."""
+
+    def test_invalid_ttl(self):
+        """Test that a non-positive TTL is rejected."""
+        with pytest.raises(ValueError, match="ttl_seconds"):
+            RedisImageCache(FakeRedis(), ttl_seconds=0)
+
+    def test_roundtrip(self):
+        """Test that stored images are returned with cache metadata and a TTL."""
+        client = FakeRedis()
+        cache = RedisImageCache(client, ttl_seconds=60)
+        request = GenerationRequest(prompt="A red cat", seed=1)
+
+        stored = _make_result("A red cat")
+        cache.set(request, stored)
+        hit = cache.get(GenerationRequest(prompt="  a RED   cat ", seed=1))
+
+        assert hit.image_data == b"fake"
+        assert hit.timestamp == stored.timestamp
+        assert hit.backend == "test"
+        assert hit.metadata == {"model": "m", "cache_hit": True, "source_prompt": "A red cat"}
+        assert client.expiry == {cache.key_for(request): 60}
+
+    def test_key_includes_parameters(self):
+        """Test that requests with different settings use different keys."""
+        a = RedisImageCache.key_for(GenerationRequest(prompt="A cat", seed=1))
+        b = RedisImageCache.key_for(GenerationRequest(prompt="A cat", seed=2))
+
+        assert a.startswith("img:")
+        assert a != b
+
+    def test_unseeded_requests_not_cached(self):
+        """Test that random-seed requests bypass the cache."""
+        client = FakeRedis()
+        cache = RedisImageCache(client)
+
+        cache.set(GenerationRequest(prompt="A cat"), _make_result("A cat"))
+
+        assert client.hashes == {}
+        assert cache.get(GenerationRequest(prompt="A cat")) is None
+
+    def test_redis_errors_are_misses(self):
+        """Test that an unavailable server never fails a generation."""
+        client = MagicMock()
+        client.hgetall.side_effect = ConnectionError("refused")
+        client.pipeline.side_effect = ConnectionError("refused")
+        cache = RedisImageCache(client)
+        request = GenerationRequest(prompt="A cat", seed=1)
+
+        cache.set(request, _make_result("A cat"))
+        assert cache.get(request) is None
+
+    def test_from_url_requires_redis(self):
+        """Test that a missing redis package raises a helpful ImportError."""
+        with patch.dict('sys.modules', {'redis': None}):
+            with pytest.raises(ImportError, match="pip install redis"):
+                RedisImageCache.from_url("redis://localhost")
@@ -10,6 +10,14 @@ from src.core.models import GenerationRequest, GeneratedImage
 from replicate.exceptions import ReplicateError
 
 
+def _mock_download(content: bytes) -> MagicMock:
+    """Build a mock streamed download response yielding content."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [content[:10], content[10:]]
+    return response
+
+
 class TestReplicateBackend:
     """Tests for ReplicateBackend."""
 
@@ -52,7 +60,7 @@ class TestReplicateBackend:
             assert len(models) > 0
             assert "black-forest-labs/flux-schnell" in models
 
-    @patch('requests.get')
+    @patch('src.utils.download._REQUESTS_SESSION.get')
     @patch('src.backends.replicate.replicate.Client')
     def test_generate_image_success(self, mock_client_class, mock_requests_get):
         """Test successful image generation."""
@@ -68,10 +76,7 @@ class TestReplicateBackend:
         mock_client_class.return_value = mock_client
 
         # Mock requests.get
-        mock_response = Mock()
-        mock_response.content = fake_image_bytes
-        mock_response.raise_for_status = Mock()
-        mock_requests_get.return_value = mock_response
+        mock_requests_get.return_value = _mock_download(fake_image_bytes)
 
         # Create backend and generate
         backend = ReplicateBackend(api_key="test_token")
@@ -83,12 +88,22 @@ class TestReplicateBackend:
         assert isinstance(result, GeneratedImage)
         assert result.prompt == "A beautiful sunset"
         assert result.backend == "Replicate"
-        assert len(result.image_data) > 0
+        assert result.image_data == fake_image_bytes
         assert result.metadata["model"] == backend.model
 
         mock_client.run.assert_called_once()
         mock_requests_get.assert_called_once()
 
+    @patch('src.backends.replicate.replicate.Client')
+    def test_generate_image_rejects_non_png_format(self, mock_client_class):
+        """Test that JPEG/WEBP requests fail instead of returning another format."""
+        backend = ReplicateBackend(api_key="test_token")
+
+        with pytest.raises(ValueError, match="output_format WEBP"):
+            backend.generate_image(GenerationRequest(prompt="test", output_format="WEBP"))
+
+        mock_client_class.return_value.run.assert_not_called()
+
     @patch('src.backends.replicate.replicate.Client')
     def test_generate_image_authentication_error(self, mock_client_class):
         """Test handling of authentication errors."""
@@ -128,7 +143,7 @@ class TestReplicateBackend:
         with pytest.raises(RuntimeError, match="Replicate API error"):
             backend.generate_image(request)
 
-    @patch('requests.get')
+    @patch('src.utils.download._REQUESTS_SESSION.get')
     @patch('src.backends.replicate.replicate.Client')
     def test_generate_image_download_failure(self, mock_client_class, mock_requests_get):
         """Test handling of image download failures."""
@@ -149,7 +164,7 @@ class TestReplicateBackend:
     @patch('src.backends.replicate.replicate.Client')
     def test_generate_image_list_output(self, mock_client_class):
         """Test handling of list output from Replicate."""
-        with patch('requests.get') as mock_get:
+        with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
             # Mock Replicate returning a list
             mock_client = Mock()
             mock_client.run.return_value = ["https://example.com/image1.png"]
@@ -160,10 +175,7 @@ class TestReplicateBackend:
             img_bytes = io.BytesIO()
             fake_image.save(img_bytes, format='PNG')
 
-            mock_response = Mock()
-            mock_response.content = img_bytes.getvalue()
-            mock_response.raise_for_status = Mock()
-            mock_get.return_value = mock_response
+            mock_get.return_value = _mock_download(img_bytes.getvalue())
 
             backend = ReplicateBackend(api_key="test_token")
             request = GenerationRequest(prompt="test")
@@ -171,33 +183,85 @@ class TestReplicateBackend:
             result = backend.generate_image(request)
 
             assert result.backend == "Replicate"
-            mock_get.assert_called_with("https://example.com/image1.png", timeout=30)
+            mock_get.assert_called_with("https://example.com/image1.png", timeout=(5, 30), stream=True)
+
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    @patch('src.backends.replicate.replicate.Client')
+    def test_img2img_small_image_sent_unchanged(self, mock_client_class, mock_requests_get):
+        """Test that small init images are sent without re-encoding."""
+        img_byte_arr = io.BytesIO()
+        Image.new('RGB', (64, 64), color='blue').save(img_byte_arr, format='JPEG')
+        init_bytes = img_byte_arr.getvalue()
+
+        mock_client = mock_client_class.return_value
+        mock_client.run.return_value = "https://example.com/image.png"
+        mock_requests_get.return_value = _mock_download(b"result")
+
+        backend = ReplicateBackend(api_key="test_token")
+        backend.generate_image(GenerationRequest(prompt="test", init_image=init_bytes))
+
+        uploaded = mock_client.run.call_args[1]["input"]["image"]
+        assert uploaded.getvalue() == init_bytes
+        assert uploaded.name == "init_image.jpg"
+
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    @patch('src.backends.replicate.replicate.Client')
+    def test_img2img_gif_sent_as_png(self, mock_client_class, mock_requests_get):
+        """Test that GIF init images are re-encoded as PNG."""
+        img_byte_arr = io.BytesIO()
+        Image.new('RGB', (64, 64), color='blue').save(img_byte_arr, format='GIF')
+
+        mock_client = mock_client_class.return_value
+        mock_client.run.return_value = "https://example.com/image.png"
+        mock_requests_get.return_value = _mock_download(b"result")
+
+        backend = ReplicateBackend(api_key="test_token")
+        backend.generate_image(GenerationRequest(prompt="test", init_image=img_byte_arr.getvalue()))
+
+        uploaded = mock_client.run.call_args[1]["input"]["image"]
+        assert uploaded.name == "init_image.png"
+        assert Image.open(uploaded).format == "PNG"
+
+    @patch('src.utils.download._REQUESTS_SESSION.get')
+    @patch('src.backends.replicate.replicate.Client')
+    def test_img2img_large_image_resized(self, mock_client_class, mock_requests_get):
+        """Test that oversized init images are resized and re-encoded."""
+        img_byte_arr = io.BytesIO()
+        Image.new('RGB', (2048, 1024), color='blue').save(img_byte_arr, format='PNG')
+
+        mock_client = mock_client_class.return_value
+        mock_client.run.return_value = "https://example.com/image.png"
+        mock_requests_get.return_value = _mock_download(b"result")
+
+        backend = ReplicateBackend(api_key="test_token", model="stability-ai/sdxl")
+        backend.generate_image(
+            GenerationRequest(prompt="test", init_image=img_byte_arr.getvalue())
+        )
+
+        input_params = mock_client.run.call_args[1]["input"]
+        uploaded = input_params["image"]
+        assert uploaded.name == "init_image.png"
+        assert Image.open(uploaded).size == (1024, 512)
+        assert (input_params["width"], input_params["height"]) == (1024, 512)
 
     @patch('src.backends.replicate.replicate.Client')
     def test_health_check_success(self, mock_client_class):
         """Test successful health check."""
         mock_client = Mock()
-        mock_models = Mock()
-        # Create a mock model object
-        mock_model = Mock()
-        mock_model.name = "test-model"
-        # Return an iterator that will yield the mock model
-        mock_models.list.return_value = iter([mock_model])
-        mock_client.models = mock_models
+        mock_client.accounts.current.return_value = Mock(username="test-user")
         mock_client_class.return_value = mock_client
 
         backend = ReplicateBackend(api_key="test_token")
         result = backend.health_check()
 
         assert result is True
+        mock_client.accounts.current.assert_called_once()
 
     @patch('src.backends.replicate.replicate.Client')
     def test_health_check_failure(self, mock_client_class):
         """Test failed health check."""
         mock_client = Mock()
-        mock_models = Mock()
-        mock_models.list.side_effect = Exception("Connection error")
-        mock_client.models = mock_models
+        mock_client.accounts.current.side_effect = Exception("Connection error")
         mock_client_class.return_value = mock_client
 
         backend = ReplicateBackend(api_key="test_token")
@@ -205,6 +269,23 @@ class TestReplicateBackend:
 
         assert result is False
 
+    @patch('src.backends.replicate.replicate.Client')
+    def test_health_check_caches_success_only(self, mock_client_class):
+        """Test that successes are cached for the TTL and failures are not."""
+        mock_client = mock_client_class.return_value
+        backend = ReplicateBackend(api_key="test_token")
+
+        assert backend.health_check() is True
+        assert backend.health_check() is True
+        assert mock_client.accounts.current.call_count == 1
+
+        # Once the TTL expires the API is probed again
+        backend._last_healthy_at -= ReplicateBackend.HEALTH_CHECK_TTL
+        mock_client.accounts.current.side_effect = Exception("down")
+        assert backend.health_check() is False
+        assert backend.health_check() is False
+        assert mock_client.accounts.current.call_count == 3
+
     @patch('src.backends.replicate.replicate.Client')
     def test_set_model(self, mock_client_class):
         """Test changing the model."""
@@ -218,3 +299,5 @@ class TestReplicateBackend:
 
         assert backend.model == new_model
         assert backend.model != original_model
+        assert backend._is_sdxl is True
+        assert backend._is_flux is False
@@ -0,0 +1,139 @@
+"""Unit tests for the semantic prompt cache."""
+
+import pytest
+from unittest.mock import Mock
+
+from src.core.models import GenerationRequest, GeneratedImage
+from src.core.semantic_cache import (
+    SemanticCache,
+    hashed_embedding,
+    select_resume_fraction,
+)
+
+
+def _make_result(prompt: str) -> GeneratedImage:
+    """Build a fake GeneratedImage for a prompt."""
+    return GeneratedImage(
+        image_data=b"fake", prompt=prompt, backend="test", metadata={"model": "m"}
+    )
+
+
+class TestHashedEmbedding:
+    """Tests for the default prompt embedding."""
+
+    def test_ignores_case_and_punctuation(self):
+        """Test that formatting-only differences embed identically."""
+        assert hashed_embedding("A red cat, sitting.") == hashed_embedding("a red  cat sitting")
+
+    def test_unit_length(self):
+        """Test that embeddings are normalized."""
+        vector = hashed_embedding("a red cat")
+        assert sum(v * v for v in vector) == pytest.approx(1.0)
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_invalid_parameters(self):
+        """Test that invalid cache settings are rejected."""
+        with pytest.raises(ValueError, match="threshold"):
+            SemanticCache(threshold=0)
+
+        with pytest.raises(ValueError, match="max_entries"):
+            SemanticCache(max_entries=0)
+
+    def test_hit_for_equivalent_prompt(self):
+        """Test that a near-identical prompt is served from the cache."""
+        cache = SemanticCache()
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+
+        hit = cache.lookup(GenerationRequest(prompt="a red cat!", seed=1))
+
+        assert hit is not None
+        assert hit.prompt == "a red cat!"
+        assert hit.metadata["cache_hit"] is True
+        assert hit.metadata["source_prompt"] == "A red cat"
+        assert hit.metadata["model"] == "m"
+
+    def test_exact_match_skips_embedding(self):
+        """Test that a normalized exact match is found without embedding the prompt."""
+        embed_fn = Mock(return_value=[1.0, 0.0])
+        cache = SemanticCache(embed_fn=embed_fn)
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+        embed_fn.reset_mock()
+
+        hit = cache.lookup(GenerationRequest(prompt="a  RED cat", seed=1))
+
+        assert hit.metadata["similarity"] == 1.0
+        embed_fn.assert_not_called()
+
+    def test_miss_for_different_prompt(self):
+        """Test that unrelated prompts are not served."""
+        cache = SemanticCache()
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+
+        assert cache.lookup(GenerationRequest(prompt="A blue ocean", seed=1)) is None
+
+    def test_settings_must_match(self):
+        """Test that seed and size are part of the cache key."""
+        cache = SemanticCache()
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+
+        assert cache.lookup(GenerationRequest(prompt="A red cat", seed=2)) is None
+        assert cache.lookup(GenerationRequest(prompt="A red cat", seed=1, width=768)) is None
+
+    def test_unseeded_requests_not_cached(self):
+        """Test that random-seed requests bypass the cache."""
+        cache = SemanticCache()
+        cache.add(GenerationRequest(prompt="A red cat"), _make_result("A red cat"))
+
+        assert len(cache) == 0
+        assert cache.lookup(GenerationRequest(prompt="A red cat")) is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SemanticCache(max_entries=2)
+        for prompt in ["A red cat", "A blue ocean", "A green forest"]:
+            cache.add(GenerationRequest(prompt=prompt, seed=1), _make_result(prompt))
+
+        assert len(cache) == 2
+        assert cache.lookup(GenerationRequest(prompt="A red cat", seed=1)) is None
+        assert cache.lookup(GenerationRequest(prompt="A green forest", seed=1)) is not None
+
+    def test_custom_embedding_function(self):
+        """Test that a custom embedding function is used for similarity."""
+        cache = SemanticCache(embed_fn=lambda text: [1.0, 0.0])
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+
+        hit = cache.lookup(GenerationRequest(prompt="A kitten", seed=1))
+        assert hit.metadata["source_prompt"] == "A red cat"
+
+    def test_lookup_latents_for_similar_prompt(self):
+        """Test that a similar prompt reuses latents scaled by similarity."""
+        cache = SemanticCache(embed_fn=lambda text: [1.0, 0.0] if "cat" in text else [0.91, 0.41])
+        image = _make_result("A red cat")
+        image.latents = {1: "l1", 2: "l2", 5: "l5"}
+        cache.add(GenerationRequest(prompt="A red cat", seed=1, num_inference_steps=10), image)
+
+        request = GenerationRequest(prompt="A red dog", seed=1, num_inference_steps=10)
+        match = cache.lookup_latents(request)
+
+        assert cache.lookup(request) is None
+        # Similarity ~0.91 reuses up to 40% of 10 steps
+        assert match.start_step == 2
+        assert match.latents == "l2"
+        assert match.source_prompt == "A red cat"
+        assert match.backend == "test"
+
+    def test_lookup_latents_requires_captured_latents(self):
+        """Test that entries without latents are not used for resuming."""
+        cache = SemanticCache(embed_fn=lambda text: [1.0, 0.0] if "cat" in text else [0.91, 0.41])
+        cache.add(GenerationRequest(prompt="A red cat", seed=1), _make_result("A red cat"))
+
+        assert cache.lookup_latents(GenerationRequest(prompt="A red dog", seed=1)) is None
+
+    def test_select_resume_fraction(self):
+        """Test that more similar prompts reuse more steps."""
+        assert select_resume_fraction(0.94) == 0.5
+        assert select_resume_fraction(0.85) == 0.2
+        assert select_resume_fraction(0.5) == 0.0
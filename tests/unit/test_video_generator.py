@@ -28,10 +28,12 @@ def mock_replicate_client():
 @pytest.fixture
 def mock_requests_get():
     """Mock requests.get for downloading videos."""
-    with patch('src.utils.video_generator.requests.get') as mock_get:
-        mock_response = Mock()
-        mock_response.content = b'video_data'
-        mock_response.raise_for_status = Mock()
+    with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
+        video = b'video_data'
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Length": str(len(video))}
+        mock_response.iter_content.return_value = [video[:4], video[4:]]
         mock_get.return_value = mock_response
         yield mock_get
 
@@ -194,7 +196,7 @@ class TestVideoGenerator:
         mock_client_instance.run.return_value = "https://example.com/video.mp4"
         mock_replicate_client.return_value = mock_client_instance
 
-        with patch('src.utils.video_generator.requests.get') as mock_get:
+        with patch('src.utils.download._REQUESTS_SESSION.get') as mock_get:
             mock_get.side_effect = Exception("Download failed")
 
             generator = VideoGenerator("test_api_key")
@@ -224,7 +226,7 @@ class TestVideoGenerator:
         assert result == b'video_data'
         # Verify JPEG format was detected
         call_args = mock_client_instance.run.call_args
-        assert "image/jpeg" in call_args[1]["input"]["input_image"]
+        assert call_args[1]["input"]["input_image"].name == "input.jpg"
 
     def test_generate_video_25_frames(
         self,